@@ -0,0 +1,132 @@
+"""Synthetic datasets for the benchmarks.
+
+``synthetic_dataset`` builds a frame of any shape from a dtype mix, a null
+density and a cardinality, deterministically from ``seed``. Columns are
+generated one at a time from value pools, so wide or long frames cost only
+their own memory.
+"""
+from dataclasses import asdict, dataclass, field
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# Column kinds and the analyzer each one is routed to
+DTYPE_KINDS = ('float', 'integer', 'categorical', 'text', 'boolean', 'datetime')
+
+DEFAULT_DTYPE_MIX = {'float': 0.4, 'integer': 0.2, 'categorical': 0.2, 'text': 0.05, 'boolean': 0.1,
+                     'datetime': 0.05}
+
+WORDS = np.array("data value model report column sample metric signal record event user order price "
+                 "region status amount score index batch stream".split(), dtype=object)
+
+
+@dataclass
+class DatasetSpec:
+    """Shape and content of one synthetic dataset"""
+    rows: int
+    columns: int
+    dtype_mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_DTYPE_MIX))
+    null_density: float = 0.0
+    cardinality: int = 100
+    seed: int = 0
+
+    @property
+    def name(self) -> str:
+        mix = '+'.join(f"{kind}{weight:g}" for kind, weight in sorted(self.dtype_mix.items()) if weight)
+        return (f"r{self.rows}_c{self.columns}_n{self.null_density:g}_k{self.cardinality}_{mix}"
+                f"_s{self.seed}")
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def column_kinds(columns: int, dtype_mix: Dict[str, float]) -> list:
+    """Kind of each column: counts proportional to the mix (largest remainders), interleaved.
+
+    When there are enough columns, every kind with a positive weight gets at
+    least one, so each analyzer is exercised.
+    """
+    unknown = set(dtype_mix) - set(DTYPE_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown dtype kinds {sorted(unknown)}; choose from {DTYPE_KINDS}")
+    total = sum(dtype_mix.values())
+    if total <= 0:
+        raise ValueError("The dtype mix needs a positive weight")
+    exact = {kind: columns * weight / total for kind, weight in dtype_mix.items()}
+    counts = {kind: int(value) for kind, value in exact.items()}
+    by_remainder = sorted(exact, key=lambda kind: exact[kind] - counts[kind], reverse=True)
+    for kind in by_remainder[:columns - sum(counts.values())]:
+        counts[kind] += 1
+    wanted = [kind for kind, weight in dtype_mix.items() if weight > 0]
+    if columns >= len(wanted):
+        for kind in wanted:
+            if counts[kind] == 0:
+                counts[max(counts, key=counts.get)] -= 1
+                counts[kind] = 1
+    # Round-robin so every prefix of the frame has a similar mix
+    kinds = []
+    while len(kinds) < columns:
+        for kind in DTYPE_KINDS:
+            if counts.get(kind, 0) > 0:
+                kinds.append(kind)
+                counts[kind] -= 1
+    return kinds
+
+
+def synthetic_dataset(spec: DatasetSpec) -> pd.DataFrame:
+    """DataFrame described by ``spec``.
+
+    ``cardinality`` bounds the distinct values of integer, categorical and
+    datetime columns; floats and text are mostly distinct. ``null_density``
+    is the share of missing cells in every column type that can hold them
+    (booleans become object columns then, as read from a CSV with gaps).
+    """
+    rng = np.random.default_rng(spec.seed)
+    cardinality = max(int(spec.cardinality), 1)
+    data = {}
+    for i, kind in enumerate(column_kinds(spec.columns, spec.dtype_mix)):
+        data[f"{kind}_{i}"] = _column(kind, spec.rows, cardinality, spec.null_density, rng)
+    return pd.DataFrame(data)
+
+
+def _column(kind: str, rows: int, cardinality: int, null_density: float, rng: np.random.Generator):
+    missing = rng.random(rows) < null_density if null_density > 0 else None
+    if kind == 'float':
+        values = rng.lognormal(mean=3.0, sigma=1.0, size=rows)
+        if missing is not None:
+            values[missing] = np.nan
+        return values
+    if kind == 'integer':
+        values = rng.integers(0, cardinality, size=rows)
+        if missing is not None:
+            # As pandas reads an integer column with gaps
+            values = values.astype(np.float64)
+            values[missing] = np.nan
+        return values
+    if kind == 'datetime':
+        start = np.datetime64('2020-01-01T00:00:00', 's')
+        values = start + rng.integers(0, cardinality, size=rows) * np.timedelta64(3600, 's')
+        if missing is not None:
+            values = values.astype('datetime64[ns]')
+            values[missing] = np.datetime64('NaT')
+        return values
+    if kind == 'boolean':
+        values = rng.random(rows) < 0.3
+        if missing is not None:
+            values = values.astype(object)
+            values[missing] = None
+        return values
+
+    if kind == 'categorical':
+        pool = np.array([f"cat_{j}" for j in range(cardinality)], dtype=object)
+        values = pool[rng.zipf(1.5, size=rows) % cardinality]
+    else:
+        # Long sentences from a large pool, so the column is routed to the text analyzer
+        pool_size = max(min(rows, 50_000), 1)
+        words = WORDS[rng.integers(0, len(WORDS), size=(pool_size, 8))]
+        pool = np.array([f"{' '.join(sentence)} #{j}" for j, sentence in enumerate(words)], dtype=object)
+        values = pool[rng.integers(0, pool_size, size=rows)]
+    if missing is not None:
+        values[missing] = None
+    return values
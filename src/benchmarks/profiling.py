@@ -0,0 +1,62 @@
+"""Timing, memory measurement and baseline comparison for the benchmarks"""
+import gc
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def measure(run: Callable[[Any], Any], setup: Optional[Callable[[], Any]] = None, repeat: int = 3,
+            memory: bool = True) -> Dict[str, float]:
+    """Wall time of ``run(setup())`` over ``repeat`` runs, and its peak allocation in one more.
+
+    ``setup`` is called afresh before every run and is not timed, so each
+    run starts from cold caches. Memory is measured in a separate run with
+    ``tracemalloc`` (which NumPy and pandas report to) because tracing
+    slows allocation-heavy code down.
+    """
+    times = []
+    for _ in range(max(repeat, 1)):
+        argument = setup() if setup is not None else None
+        gc.collect()
+        start = time.perf_counter()
+        run(argument)
+        times.append(time.perf_counter() - start)
+    result = {'seconds': min(times), 'median_seconds': statistics.median(times), 'runs': len(times)}
+    if memory:
+        argument = setup() if setup is not None else None
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run(argument)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result['peak_mb'] = peak / 1024 / 1024
+    return result
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float = 0.25,
+            min_seconds: float = 0.005, min_mb: float = 1.0) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """(regressions, cases missing from the baseline) of ``results`` against ``baseline``.
+
+    A case regresses when its best time or peak memory exceeds the
+    baseline's by more than ``tolerance`` (a fraction) and by more than the
+    absolute noise floor ``min_seconds`` / ``min_mb``.
+    """
+    previous = {(entry['dataset'], entry['case']): entry for entry in baseline}
+    regressions, unmatched = [], []
+    for entry in results:
+        old = previous.get((entry['dataset'], entry['case']))
+        if old is None:
+            unmatched.append(f"{entry['dataset']} {entry['case']}")
+            continue
+        for metric, floor in (('seconds', min_seconds), ('peak_mb', min_mb)):
+            if metric not in entry or metric not in old:
+                continue
+            new_value, old_value = entry[metric], old[metric]
+            if new_value > old_value * (1 + tolerance) and new_value - old_value > floor:
+                regressions.append({'dataset': entry['dataset'], 'case': entry['case'], 'metric': metric,
+                                    'baseline': old_value, 'current': new_value,
+                                    'ratio': new_value / old_value if old_value else float('inf')})
+    return regressions, unmatched
@@ -0,0 +1,96 @@
+"""Cold-start time of ``main.py --auto-report`` on a small file.
+
+Every run is a fresh interpreter with the profile cache and column stores
+disabled, which is what a cron job pays per file. The time of a bare
+``import pandas`` is reported alongside as the floor no run can beat, and
+``--importtime`` lists the slowest imports of one run to find what crept
+into startup.
+
+    python benchmarks/startup.py --runs 10 --max-seconds 1.0
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(SRC_DIR, 'main.py')
+
+
+def write_sample_csv(path: str, rows: int = 1000) -> None:
+    """Small mixed-type CSV without importing pandas in the benchmark process"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("id,amount,category,flag,joined\n")
+        for i in range(rows):
+            amount = '' if i % 17 == 0 else f"{(i * 37) % 1000 / 7:.2f}"
+            f.write(f"{i},{amount},{'abcde'[i % 5]},{i % 3 == 0},2024-01-{i % 28 + 1:02d}\n")
+
+
+def time_pandas_import() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'import pandas'], check=True)
+    return time.perf_counter() - start
+
+
+def time_run(data_path: str, report_path: str) -> float:
+    command = [sys.executable, MAIN, data_path, '--auto-report', report_path, '--no-cache', '--no-store']
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=SRC_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0 or not os.path.exists(report_path):
+        raise RuntimeError(f"main.py failed:\n{result.stderr}")
+    return elapsed
+
+
+def slowest_imports(data_path: str, report_path: str, top: int = 15):
+    """(cumulative seconds, module) of the slowest top-level imports of one run"""
+    command = [sys.executable, '-X', 'importtime', MAIN, data_path, '--auto-report', report_path,
+               '--no-cache', '--no-store']
+    result = subprocess.run(command, cwd=SRC_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        # Top-level imports are the ones without indentation
+        if not module[1:].startswith(' '):
+            imports.append((int(cumulative) / 1e6, module.strip()))
+    return sorted(imports, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold-start benchmark of main.py --auto-report')
+    parser.add_argument('data', nargs='?', help='File to report on (default: a generated 1,000-row CSV)')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to time')
+    parser.add_argument('--max-seconds', type=float,
+                        help='Exit with status 1 when the median run is slower than this')
+    parser.add_argument('--importtime', action='store_true', help='Also list the slowest imports')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = args.data
+        if data_path is None:
+            data_path = os.path.join(tmp, 'sample.csv')
+            write_sample_csv(data_path)
+        report_path = os.path.join(tmp, 'report.md')
+        times = [time_run(os.path.abspath(data_path), report_path) for _ in range(args.runs)]
+        floor = statistics.median(time_pandas_import() for _ in range(args.runs))
+        median = statistics.median(times)
+        print(f"main.py --auto-report {os.path.basename(data_path)}: median {median:.3f}s, "
+              f"min {min(times):.3f}s, max {max(times):.3f}s over {len(times)} runs")
+        print(f"import pandas alone: median {floor:.3f}s (overhead {median - floor:+.3f}s)")
+        if args.importtime:
+            print("\nSlowest imports (cumulative):")
+            for seconds, module in slowest_imports(os.path.abspath(data_path), report_path):
+                print(f"  {seconds:6.3f}s  {module}")
+
+    if args.max_seconds is not None and median > args.max_seconds:
+        print(f"❌ Median {median:.3f}s is over the {args.max_seconds:.3f}s budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Benchmark suite of the profiling pipeline.
+
+Generates synthetic datasets over a grid of rows, columns, dtype mixes,
+null densities and cardinalities, then times and memory-profiles every
+``EDAService`` method, each column analyzer over the columns routed to it,
+``get_high_correlations`` and ``ReportBuilder.build_json`` /
+``build_markdown``. Results are written as JSON; ``--compare`` checks them
+against a stored baseline and exits with status 1 on regressions.
+
+Run from ``src``:
+
+    python -m benchmarks.suite --preset quick --output baseline.json
+    python -m benchmarks.suite --preset quick --compare baseline.json
+    python -m benchmarks.suite --rows 1000000 --columns 50 --null-density 0.1 --cardinality 1000 \\
+        --dtype-mix float=3,categorical=1 --cases EDAService.analyze_columns
+"""
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.datasets import DEFAULT_DTYPE_MIX, DatasetSpec, synthetic_dataset
+from benchmarks.profiling import compare, measure
+from core.Analyzers.factory_analyzer import AnalyzerFactory
+from core.EDA.eda_service import EDAService
+from core.report.report_generator import ReportBuilder
+
+# (rows, columns) grids; larger runs are spelled out with --rows/--columns
+PRESETS = {
+    'quick': {'rows': [1_000, 10_000], 'columns': [10]},
+    'standard': {'rows': [1_000, 10_000, 100_000, 1_000_000], 'columns': [10, 100]},
+    'wide': {'rows': [1_000], 'columns': [1_000, 10_000]},
+    'long': {'rows': [10_000_000], 'columns': [10]},
+}
+
+# EDAService methods timed on a fresh service, so each includes whatever it computes on demand
+SERVICE_METHODS = (
+    'get_metadata',
+    'get_quality_report',
+    'get_duplicate_report',
+    'get_column_plan',
+    'analyze_columns',
+    'analyze_column',
+    'get_visualization_data',
+    'get_correlation_matrix',
+    'get_high_correlations',
+    'generate_insights',
+    'get_results',
+)
+
+Case = Tuple[str, Callable[[], Any], Callable[[Any], Any]]
+
+
+def service_cases(df: pd.DataFrame) -> List[Case]:
+    """(name, setup, run) of every EDAService method"""
+    first = df.columns[0]
+    takes_column = {'analyze_column', 'get_visualization_data'}
+    cases = []
+    for method in SERVICE_METHODS:
+        args = (first,) if method in takes_column else ()
+        cases.append((f"EDAService.{method}", lambda: EDAService(df),
+                      lambda service, method=method, args=args: getattr(service, method)(*args)))
+    return cases
+
+
+def analyzer_cases(df: pd.DataFrame) -> List[Case]:
+    """One case per analyzer class, analyzing every column routed to it with a fresh factory"""
+    plan = AnalyzerFactory().build_plan(df)
+    routed: Dict[str, List[Any]] = {}
+    for col in df.columns:
+        routed.setdefault(type(plan.analyzer(col)).__name__, []).append(col)
+
+    def run(columns):
+        def analyze(fresh_plan):
+            for col in columns:
+                fresh_plan.analyzer(col).analyze(df[col])
+        return analyze
+
+    # A new factory per run, so distinct counts are not served from the shared counter
+    return [(f"{name}.analyze", lambda: AnalyzerFactory().build_plan(df), run(columns))
+            for name, columns in sorted(routed.items())]
+
+
+def report_cases(df: pd.DataFrame) -> List[Case]:
+    """Report builders over a service whose results are already computed, so only the report is timed"""
+    def warm_service():
+        service = EDAService(df)
+        service.get_results()
+        service.generate_insights()
+        return service
+
+    def build(fmt):
+        def run(service):
+            builder = (ReportBuilder(service)
+                       .add_metadata_section()
+                       .add_quality_section()
+                       .add_column_analysis_section()
+                       .add_insights_section())
+            return builder.build_json() if fmt == 'json' else builder.build_markdown()
+        return run
+
+    return [("ReportBuilder.build_json", warm_service, build('json')),
+            ("ReportBuilder.build_markdown", warm_service, build('markdown'))]
+
+
+def run_dataset(spec: DatasetSpec, case_filter: List[str], repeat: int, memory: bool) -> List[Dict[str, Any]]:
+    start = time.perf_counter()
+    df = synthetic_dataset(spec)
+    generated = time.perf_counter() - start
+    dataset_mb = float(df.memory_usage(deep=True).sum()) / 1024 / 1024
+    print(f"\n📦 {spec.name}: {df.shape[0]:,} × {df.shape[1]}, {dataset_mb:.1f} MB (generated in {generated:.2f}s)")
+
+    results = []
+    for name, setup, run in service_cases(df) + analyzer_cases(df) + report_cases(df):
+        if case_filter and not any(name.startswith(prefix) for prefix in case_filter):
+            continue
+        measured = measure(run, setup, repeat=repeat, memory=memory)
+        peak = f", peak {measured['peak_mb']:.1f} MB" if 'peak_mb' in measured else ""
+        print(f"  {name:<40} {measured['seconds'] * 1000:10.2f} ms{peak}")
+        results.append({'dataset': spec.name, 'spec': spec.to_dict(), 'dataset_mb': dataset_mb,
+                        'case': name, **measured})
+    return results
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'float=3,categorical=1' -> {'float': 3.0, 'categorical': 1.0}"""
+    mix = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        mix[kind.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def environment() -> Dict[str, str]:
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'processor': platform.processor(), 'numpy': np.__version__, 'pandas': pd.__version__}
+
+
+def print_comparison(regressions: List[Dict[str, Any]], unmatched: List[str], tolerance: float) -> None:
+    if unmatched:
+        print(f"\nℹ️  {len(unmatched)} case(s) not in the baseline:")
+        for name in unmatched:
+            print(f"  {name}")
+    if not regressions:
+        print(f"\n✅ No regressions beyond {tolerance:.0%}")
+        return
+    print(f"\n❌ {len(regressions)} regression(s) beyond {tolerance:.0%}:")
+    for entry in regressions:
+        unit = 's' if entry['metric'] == 'seconds' else ' MB'
+        print(f"  {entry['dataset']} {entry['case']} {entry['metric']}: "
+              f"{entry['baseline']:.4g}{unit} → {entry['current']:.4g}{unit} (×{entry['ratio']:.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the EDA profiling pipeline on synthetic data')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='quick',
+                        help='Rows and columns grid unless --rows/--columns are given')
+    parser.add_argument('--rows', type=int, nargs='+', help='Row counts to generate')
+    parser.add_argument('--columns', type=int, nargs='+', help='Column counts to generate')
+    parser.add_argument('--dtype-mix', nargs='+', default=None,
+                        help="Column kind weights, e.g. 'float=3,categorical=1' (kinds: float, integer, "
+                             "categorical, text, boolean, datetime); several mixes make a grid")
+    parser.add_argument('--null-density', type=float, nargs='+', default=[0.05], help='Share of missing cells')
+    parser.add_argument('--cardinality', type=int, nargs='+', default=[100],
+                        help='Distinct values of integer, categorical and datetime columns')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cases', nargs='+', default=[],
+                        help='Only run cases whose name starts with one of these (e.g. EDAService NumericAnalyzer)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case (the best is reported)')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc peak-memory run')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Baseline JSON to check the results against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown or memory growth before a case counts as a regression')
+    parser.add_argument('--min-seconds', type=float, default=0.005,
+                        help='Ignore time differences below this (timer noise)')
+    parser.add_argument('--min-mb', type=float, default=1.0, help='Ignore memory differences below this')
+    args = parser.parse_args()
+
+    rows = args.rows or PRESETS[args.preset]['rows']
+    columns = args.columns or PRESETS[args.preset]['columns']
+    mixes = [parse_mix(text) for text in args.dtype_mix] if args.dtype_mix else [dict(DEFAULT_DTYPE_MIX)]
+    specs = [DatasetSpec(r, c, mix, null_density, cardinality, args.seed)
+             for r, c, mix, null_density, cardinality
+             in itertools.product(rows, columns, mixes, args.null_density, args.cardinality)]
+
+    results = []
+    for spec in specs:
+        results.extend(run_dataset(spec, args.cases, args.repeat, not args.no_memory))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'environment': environment(),
+                       'results': results}, f, indent=2)
+        print(f"\n💾 Results saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions, unmatched = compare(results, baseline['results'], args.tolerance,
+                                         args.min_seconds, args.min_mb)
+        print_comparison(regressions, unmatched, args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 
 class ColumnType(Enum):
@@ -22,6 +22,8 @@ class DatasetMetadata:
     row_count: int
     columns: List[str]
     dtypes: Dict[str, str]
+    sampled_rows: Optional[int] = None
+    memory_before_optimization_mb: Optional[float] = None
 
 
 @dataclass
@@ -33,6 +35,8 @@ class DataQualityReport:
     duplicate_percentage: float
     total_cells: int
     missing_cells: int
+    approximate_fields: List[str] = field(default_factory=list)
+    duplicate_collision_probability: float = 0.0
 
 
 @dataclass
@@ -45,3 +49,67 @@ class ColumnAnalysis:
     missing_percentage: float
     statistics: Dict[str, Any]
     insights: List[str]
+    approximate_statistics: List[str] = field(default_factory=list)
+    confidence_intervals: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    # Pre-aggregated chart payload (see IColumnAnalyzer.get_visualization_data); holds arrays, so not compared
+    visualization: Optional[Dict[str, Any]] = field(default=None, compare=False)
+
+
+@dataclass
+class DistinctCount:
+    """Distinct value count of a column"""
+    value: int
+    exact: bool = True
+    relative_error: float = 0.0
+
+
+@dataclass
+class DuplicateGroup:
+    """A set of identical rows"""
+    count: int
+    first_row: int
+    fingerprint: str
+
+
+@dataclass
+class DuplicateReport:
+    """Result of hash-based duplicate row detection"""
+    total_rows: int
+    distinct_rows: int
+    duplicate_rows: int
+    hash_bits: int
+    collision_probability: float
+    spilled: bool = False
+    top_groups: List[DuplicateGroup] = field(default_factory=list)
+
+
+@dataclass
+class SamplingConfig:
+    """How an approximate EDA session samples its dataset"""
+    method: str = 'uniform'
+    size: int = 100_000
+    stratify_by: Optional[str] = None
+    head_rows: int = 10_000
+    seed: Optional[int] = 0
+    confidence: float = 0.95
+
+
+@dataclass
+class DtypeOptimization:
+    """Memory saved by narrowing the dtypes of a loaded frame"""
+    memory_before_mb: float
+    memory_after_mb: float
+    conversions: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+
+@dataclass
+class AgentEvent:
+    """One step of a streamed agent reply.
+
+    ``kind`` is ``token`` (a chunk of model text), ``tool_call``,
+    ``tool_result``, and finally ``answer`` or ``error``.
+    """
+    kind: str
+    content: str = ''
+    tool: Optional[str] = None
+    args: Dict[str, Any] = field(default_factory=dict)
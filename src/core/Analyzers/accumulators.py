@@ -0,0 +1,540 @@
+from abc import ABC, abstractmethod
+import base64
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from classes.data_classes import ColumnAnalysis, ColumnType
+from core.Analyzers.boolean_analyzer import BooleanAnalyzer
+from core.Analyzers.categorical_analyzer import CategoricalAnalyzer
+from core.Analyzers.date_time_analyzer import DatetimeAnalyzer
+from core.Analyzers.numerical_analyzer import NumericAnalyzer
+from core.Analyzers.sketches import HyperLogLog, KLLSketch, MisraGries, hash_values
+from core.Analyzers.text_analyzer import TextAnalyzer
+from core.Analyzers.vectorized_numeric import shape_statistics
+
+
+Moments = Tuple[float, float, float, float, float]
+
+
+def merge_moments(a: Moments, b: Moments) -> Moments:
+    """Combine (count, mean, M2, M3, M4) central moment sums of two partitions.
+
+    Pairwise update formulas from Pébay (2008), exact up to rounding.
+    """
+    na, mean_a, m2a, m3a, m4a = a
+    nb, mean_b, m2b, m3b, m4b = b
+    if na == 0:
+        return b
+    if nb == 0:
+        return a
+    n = na + nb
+    delta = mean_b - mean_a
+    delta_n = delta / n
+    mean = mean_a + delta_n * nb
+    m2 = m2a + m2b + delta * delta_n * na * nb
+    m3 = (m3a + m3b + delta_n ** 2 * delta * na * nb * (na - nb)
+          + 3 * delta_n * (na * m2b - nb * m2a))
+    m4 = (m4a + m4b + delta_n ** 3 * delta * na * nb * (na * na - na * nb + nb * nb)
+          + 6 * delta_n ** 2 * (na * na * m2b + nb * nb * m2a)
+          + 4 * delta_n * (na * m3b - nb * m3a))
+    return n, mean, m2, m3, m4
+
+
+def batch_moments(values: np.ndarray) -> Moments:
+    """Two-pass central moment sums of a NaN-free array"""
+    n = len(values)
+    if n == 0:
+        return 0, 0.0, 0.0, 0.0, 0.0
+    mean = values.sum(dtype=np.float64) / n
+    adjusted = values - mean
+    adjusted2 = adjusted ** 2
+    return (n, float(mean), float(adjusted2.sum()), float((adjusted2 * adjusted).sum()),
+            float((adjusted2 ** 2).sum()))
+
+
+class ColumnProfile(ABC):
+    """Serializable, mergeable partial profile of one column.
+
+    Each partition of a dataset can be profiled independently (see
+    ``IColumnAnalyzer.profile``); ``merge`` is associative, so a reducer can
+    combine partials in any grouping and call ``to_analysis`` once at the end.
+    """
+
+    kind = ''
+    _registry: Dict[str, Type['ColumnProfile']] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.kind:
+            ColumnProfile._registry[cls.kind] = cls
+
+    def __init__(self, name: Any):
+        self.name = name
+        self.row_count = 0
+        self.missing_count = 0
+
+    @abstractmethod
+    def update(self, series: pd.Series) -> None:
+        """Fold a batch of values into the profile"""
+
+    @abstractmethod
+    def merge(self, other: 'ColumnProfile') -> 'ColumnProfile':
+        """Fold another partial profile of the same column into this one"""
+
+    @abstractmethod
+    def to_analysis(self) -> ColumnAnalysis:
+        """Finalize into a ColumnAnalysis"""
+
+    def _check_mergeable(self, other: 'ColumnProfile') -> None:
+        if type(other) is not type(self):
+            raise ValueError(f"Cannot merge {other.kind} profile into {self.kind} profile "
+                             f"for column '{self.name}'")
+        self.row_count += other.row_count
+        self.missing_count += other.missing_count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'kind': self.kind,
+            'name': self.name,
+            'row_count': self.row_count,
+            'missing_count': self.missing_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ColumnProfile':
+        profile_cls = ColumnProfile._registry[data['kind']]
+        profile = profile_cls.__new__(profile_cls)
+        ColumnProfile.__init__(profile, data['name'])
+        profile.row_count = data['row_count']
+        profile.missing_count = data['missing_count']
+        profile._load(data)
+        return profile
+
+    @abstractmethod
+    def _load(self, data: Dict[str, Any]) -> None:
+        """Restore subclass state from ``to_dict`` output"""
+
+
+class NumericAccumulator(ColumnProfile):
+    """Streaming counterpart of ``NumericAnalyzer``.
+
+    Moments, extrema and null counts are exact; quantiles come from a KLL
+    sketch (exact until it first compacts) and distinct counts from
+    HyperLogLog (exact up to ``exact_distinct_limit`` values). Non-numeric
+    values in later chunks are left out of the statistics and tallied in
+    ``coerced_count`` rather than counted as missing, so callers can detect
+    the mixed column and re-profile it.
+    """
+
+    kind = 'numeric'
+
+    def __init__(self, name: Any, sketch_k: int = 1000, hll_precision: int = 14,
+                 exact_distinct_limit: int = 1000):
+        super().__init__(name)
+        self.coerced_count = 0
+        self.moments: Moments = (0, 0.0, 0.0, 0.0, 0.0)
+        self.min = np.inf
+        self.max = -np.inf
+        self.quantiles = KLLSketch(sketch_k)
+        self.distinct = HyperLogLog(hll_precision, exact_distinct_limit)
+
+    def update(self, series: pd.Series) -> None:
+        coerced_count = 0
+        if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            coerced = pd.to_numeric(series, errors='coerce')
+            coerced_count = int((coerced.isna() & series.notna()).sum())
+            series = coerced
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = values[~np.isnan(values)]
+
+        self.row_count += len(values)
+        self.coerced_count += coerced_count
+        self.missing_count += len(values) - len(valid) - coerced_count
+        if len(valid) == 0:
+            return
+        self.moments = merge_moments(self.moments, batch_moments(valid))
+        self.min = min(self.min, float(valid.min()))
+        self.max = max(self.max, float(valid.max()))
+        self.quantiles.update(valid)
+        self.distinct.update_hashes(pd.util.hash_array(valid))
+
+    def merge(self, other: 'NumericAccumulator') -> 'NumericAccumulator':
+        self._check_mergeable(other)
+        self.coerced_count += other.coerced_count
+        self.moments = merge_moments(self.moments, other.moments)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.quantiles.merge(other.quantiles)
+        self.distinct.merge(other.distinct)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        data.update({
+            'coerced_count': self.coerced_count,
+            'moments': list(self.moments),
+            'min': self.min if np.isfinite(self.min) else None,
+            'max': self.max if np.isfinite(self.max) else None,
+            'quantiles': self.quantiles.to_dict(),
+            'distinct': self.distinct.to_dict(),
+        })
+        return data
+
+    def _load(self, data: Dict[str, Any]) -> None:
+        self.coerced_count = data['coerced_count']
+        self.moments = tuple(data['moments'])
+        self.min = np.inf if data['min'] is None else data['min']
+        self.max = -np.inf if data['max'] is None else data['max']
+        self.quantiles = KLLSketch.from_dict(data['quantiles'])
+        self.distinct = HyperLogLog.from_dict(data['distinct'])
+
+    def to_analysis(self) -> ColumnAnalysis:
+        count, mean, m2, m3, m4 = self.moments
+        std, skew, kurt = shape_statistics(np.array([count]), np.array([m2]),
+                                           np.array([m3]), np.array([m4]))
+        has_values = count > 0
+        stats = {
+            'mean': mean if has_values else float('nan'),
+            'median': self.quantiles.quantile(0.5),
+            'std': float(std[0]),
+            'min': self.min if has_values else float('nan'),
+            'max': self.max if has_values else float('nan'),
+            'q25': self.quantiles.quantile(0.25),
+            'q75': self.quantiles.quantile(0.75),
+            'skewness': float(skew[0]),
+            'kurtosis': float(kurt[0]),
+        }
+        iqr = stats['q75'] - stats['q25']
+        lower_bound = stats['q25'] - 1.5 * iqr
+        upper_bound = stats['q75'] + 1.5 * iqr
+        stats['outlier_count'] = int(round(self.quantiles.count_outside(lower_bound, upper_bound))) if has_values else 0
+
+        analysis = NumericAnalyzer().build_analysis(
+            name=self.name,
+            stats=stats,
+            unique_count=int(round(self.distinct.estimate())),
+            missing_count=self.missing_count,
+            row_count=self.row_count
+        )
+        if self.coerced_count:
+            analysis.insights.append(f"{self.coerced_count} non-numeric values excluded from the statistics")
+        analysis.approximate_statistics = [] if self.distinct.is_exact else ['unique_count']
+        if not self.quantiles.is_exact:
+            analysis.approximate_statistics += ['median', 'q25', 'q75', 'outlier_count', 'outlier_percentage']
+        return analysis
+
+
+class CategoricalAccumulator(ColumnProfile):
+    """Streaming counterpart of ``CategoricalAnalyzer``.
+
+    Value counts are kept in a Misra-Gries summary of ``top_k_capacity``
+    counters, so they are exact while the column has at most that many
+    distinct values; beyond that the top values are approximate and the
+    distinct count falls back to HyperLogLog. Text columns also keep exact
+    string length totals and extrema.
+    """
+
+    kind = 'categorical'
+
+    # Analyzer that finalizes each column type this accumulator can stand in for
+    _finalizers = {
+        ColumnType.CATEGORICAL: CategoricalAnalyzer,
+        ColumnType.BOOLEAN: BooleanAnalyzer,
+        ColumnType.TEXT: TextAnalyzer,
+    }
+
+    def __init__(self, name: Any, top_k_capacity: int = 1000, hll_precision: int = 14,
+                 column_type: ColumnType = ColumnType.CATEGORICAL):
+        super().__init__(name)
+        self.column_type = column_type
+        self.top_values = MisraGries(top_k_capacity)
+        self.distinct = HyperLogLog(hll_precision)
+        # (count, total, min, max) of string lengths, for text columns
+        self.lengths: Tuple[int, int, Optional[int], Optional[int]] = (0, 0, None, None)
+
+    def update(self, series: pd.Series) -> None:
+        self.row_count += len(series)
+        self.missing_count += int(series.isnull().sum())
+        counts = series.value_counts(sort=False)
+        self.top_values.update_counts(counts.items())
+        # HyperLogLog ignores repeats, so hashing each batch's distinct values is enough
+        self.distinct.update_hashes(hash_values(pd.Series(counts.index, dtype=object)))
+        if self.column_type == ColumnType.TEXT:
+            lengths = series.dropna().astype(str).str.len()
+            if len(lengths):
+                self._add_lengths((len(lengths), int(lengths.sum()), int(lengths.min()), int(lengths.max())))
+
+    def _add_lengths(self, other: Tuple[int, int, Optional[int], Optional[int]]) -> None:
+        count, total, low, high = self.lengths
+        if other[0] == 0:
+            return
+        self.lengths = (count + other[0], total + other[1],
+                        other[2] if low is None else min(low, other[2]),
+                        other[3] if high is None else max(high, other[3]))
+
+    def merge(self, other: 'CategoricalAccumulator') -> 'CategoricalAccumulator':
+        if isinstance(other, CategoricalAccumulator) and other.column_type != self.column_type:
+            raise ValueError(f"Cannot merge {other.column_type.value} profile into "
+                             f"{self.column_type.value} profile for column '{self.name}'")
+        self._check_mergeable(other)
+        self.top_values.merge(other.top_values)
+        self.distinct.merge(other.distinct)
+        self._add_lengths(other.lengths)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        data.update({
+            'column_type': self.column_type.value,
+            'top_values': self.top_values.to_dict(),
+            'distinct': self.distinct.to_dict(),
+            'lengths': list(self.lengths),
+        })
+        return data
+
+    def _load(self, data: Dict[str, Any]) -> None:
+        self.column_type = ColumnType(data['column_type'])
+        self.top_values = MisraGries.from_dict(data['top_values'])
+        self.distinct = HyperLogLog.from_dict(data['distinct'])
+        self.lengths = tuple(data.get('lengths', (0, 0, None, None)))
+
+    def mode(self) -> Optional[str]:
+        mode = self.top_values.mode()
+        return None if mode is None else str(mode)
+
+    def to_analysis(self) -> ColumnAnalysis:
+        exact = self.top_values.is_exact
+        analysis = self._finalizers[self.column_type]().build_analysis(
+            name=self.name,
+            value_counts=self.top_values.value_counts(),
+            unique_count=len(self.top_values.counts) if exact else int(round(self.distinct.estimate())),
+            mode=self.mode(),
+            missing_count=self.missing_count,
+            row_count=self.row_count
+        )
+        count, total, low, high = self.lengths
+        if count:
+            # As TextAnalyzer reports them
+            analysis.statistics['avg_length'] = round(total / count, 2)
+            analysis.statistics['min_length'] = low
+            analysis.statistics['max_length'] = high
+            analysis.insights.append(f"Free text (average {analysis.statistics['avg_length']:.0f} characters)")
+        if not exact:
+            analysis.statistics['top_values_error_bound'] = self.top_values.error_bound
+            analysis.approximate_statistics = ['unique_count', 'cardinality_ratio', 'top_values',
+                                               'mode', 'mode_frequency', 'mode_percentage']
+        return analysis
+
+
+class DatetimeAccumulator(ColumnProfile):
+    """Streaming counterpart of ``DatetimeAnalyzer``; distinct counts are exact up to ``exact_distinct_limit``"""
+
+    kind = 'datetime'
+
+    def __init__(self, name: Any, hll_precision: int = 14, exact_distinct_limit: int = 1000):
+        super().__init__(name)
+        self.min: Optional[pd.Timestamp] = None
+        self.max: Optional[pd.Timestamp] = None
+        self.distinct = HyperLogLog(hll_precision, exact_distinct_limit)
+
+    def update(self, series: pd.Series) -> None:
+        if not pd.api.types.is_datetime64_any_dtype(series):
+            series = pd.to_datetime(series, errors='coerce')
+        clean = series.dropna()
+        self.row_count += len(series)
+        self.missing_count += len(series) - len(clean)
+        if len(clean) == 0:
+            return
+        self._extend(clean.min(), clean.max())
+        self.distinct.update_hashes(hash_values(clean))
+
+    def _extend(self, low: Optional[pd.Timestamp], high: Optional[pd.Timestamp]) -> None:
+        if low is not None:
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+
+    def merge(self, other: 'DatetimeAccumulator') -> 'DatetimeAccumulator':
+        self._check_mergeable(other)
+        self._extend(other.min, other.max)
+        self.distinct.merge(other.distinct)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        data.update({
+            'min': None if self.min is None else self.min.isoformat(),
+            'max': None if self.max is None else self.max.isoformat(),
+            'distinct': self.distinct.to_dict(),
+        })
+        return data
+
+    def _load(self, data: Dict[str, Any]) -> None:
+        self.min = None if data['min'] is None else pd.Timestamp(data['min'])
+        self.max = None if data['max'] is None else pd.Timestamp(data['max'])
+        self.distinct = HyperLogLog.from_dict(data['distinct'])
+
+    def to_analysis(self) -> ColumnAnalysis:
+        analysis = DatetimeAnalyzer().build_analysis(
+            name=self.name,
+            min_value=self.min,
+            max_value=self.max,
+            unique_count=int(round(self.distinct.estimate())),
+            missing_count=self.missing_count,
+            row_count=self.row_count
+        )
+        if not self.distinct.is_exact:
+            analysis.approximate_statistics = ['unique_count']
+        return analysis
+
+
+class NullAccumulator(ColumnProfile):
+    """Placeholder for a column that has only had missing values so far.
+
+    Its type is decided by the first batch with a value: ``promote`` hands
+    the counted rows to the profile built from that batch. A column that
+    never gets a value is reported like an all-NaN numeric column, which is
+    what pandas reads an empty CSV column as.
+    """
+
+    kind = 'null'
+
+    def update(self, series: pd.Series) -> None:
+        self.row_count += len(series)
+        self.missing_count += int(series.isnull().sum())
+
+    def merge(self, other: 'NullAccumulator') -> 'NullAccumulator':
+        self._check_mergeable(other)
+        return self
+
+    def promote(self, profile: ColumnProfile) -> ColumnProfile:
+        """``profile`` with this placeholder's (all missing) rows added"""
+        profile.row_count += self.row_count
+        profile.missing_count += self.missing_count
+        return profile
+
+    def _load(self, data: Dict[str, Any]) -> None:
+        pass
+
+    def to_analysis(self) -> ColumnAnalysis:
+        return self.promote(NumericAccumulator(self.name)).to_analysis()
+
+
+def profile_for_type(column_type: ColumnType, series: pd.Series) -> ColumnProfile:
+    """Accumulator for a column of ``column_type``, updated with ``series``"""
+    if column_type == ColumnType.NUMERIC:
+        profile = NumericAccumulator(series.name)
+    elif column_type == ColumnType.DATETIME:
+        profile = DatetimeAccumulator(series.name)
+    else:
+        column_type = column_type if column_type in CategoricalAccumulator._finalizers else ColumnType.CATEGORICAL
+        profile = CategoricalAccumulator(series.name, column_type=column_type)
+    profile.update(series)
+    return profile
+
+
+class CorrelationAccumulator:
+    """Streaming Pearson correlation with pairwise-complete observations.
+
+    Accumulates, for every column pair, the co-observed count and the sums
+    needed for the correlation, after shifting each column by its first
+    observed mean to limit cancellation. Partials with different shifts are
+    rebased before merging.
+    """
+
+    def __init__(self, columns: List[Any]):
+        k = len(columns)
+        self.columns = list(columns)
+        self.shift: Optional[np.ndarray] = None
+        self.n = np.zeros((k, k))
+        self.sum_x = np.zeros((k, k))
+        self.sum_xx = np.zeros((k, k))
+        self.sum_xy = np.zeros((k, k))
+
+    def update(self, block: np.ndarray) -> None:
+        """Add a (rows x columns) float64 block, NaN marking missing values"""
+        present = ~np.isnan(block)
+        if self.shift is None:
+            counts = present.sum(axis=0)
+            self.shift = np.where(present, block, 0.0).sum(axis=0) / np.maximum(counts, 1)
+        centered = np.where(present, block - self.shift, 0.0)
+        present = present.astype(np.float64)
+        self.n += present.T @ present
+        # sum_x[i, j] is the sum of column i over rows where column j is present
+        self.sum_x += centered.T @ present
+        self.sum_xx += (centered ** 2).T @ present
+        self.sum_xy += centered.T @ centered
+
+    def _rebase(self, shift: np.ndarray) -> None:
+        """Re-express the sums relative to a new per-column shift"""
+        d = (self.shift - shift)[:, None]
+        sum_x = self.sum_x + self.n * d
+        self.sum_xy = self.sum_xy + d.T * self.sum_x + d * self.sum_x.T + self.n * d * d.T
+        self.sum_xx = self.sum_xx + 2 * d * self.sum_x + self.n * d * d
+        self.sum_x = sum_x
+        self.shift = shift
+
+    def merge(self, other: 'CorrelationAccumulator') -> 'CorrelationAccumulator':
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge correlation accumulators over different columns")
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.shift = other.shift.copy()
+        elif not np.array_equal(self.shift, other.shift):
+            other = CorrelationAccumulator.from_dict(other.to_dict())
+            other._rebase(self.shift)
+        self.n += other.n
+        self.sum_x += other.sum_x
+        self.sum_xx += other.sum_xx
+        self.sum_xy += other.sum_xy
+        return self
+
+    def subset(self, columns: List[Any]) -> 'CorrelationAccumulator':
+        """Accumulator restricted to ``columns`` (a subset of its own, in any order)"""
+        if list(columns) == self.columns:
+            return self
+        index = [self.columns.index(col) for col in columns]
+        pairs = np.ix_(index, index)
+        subset = CorrelationAccumulator(columns)
+        subset.shift = None if self.shift is None else self.shift[index]
+        for key in ('n', 'sum_x', 'sum_xx', 'sum_xy'):
+            setattr(subset, key, getattr(self, key)[pairs])
+        return subset
+
+    def to_dict(self) -> Dict[str, Any]:
+        def encode(array: np.ndarray) -> str:
+            return base64.b64encode(np.ascontiguousarray(array, dtype=np.float64).tobytes()).decode('ascii')
+
+        return {
+            'columns': self.columns,
+            'shift': None if self.shift is None else encode(self.shift),
+            'n': encode(self.n),
+            'sum_x': encode(self.sum_x),
+            'sum_xx': encode(self.sum_xx),
+            'sum_xy': encode(self.sum_xy),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CorrelationAccumulator':
+        accumulator = cls(data['columns'])
+        k = len(accumulator.columns)
+
+        def decode(text: str, shape: Tuple[int, ...]) -> np.ndarray:
+            return np.frombuffer(base64.b64decode(text), dtype=np.float64).reshape(shape).copy()
+
+        accumulator.shift = None if data['shift'] is None else decode(data['shift'], (k,))
+        for key in ('n', 'sum_x', 'sum_xx', 'sum_xy'):
+            setattr(accumulator, key, decode(data[key], (k, k)))
+        return accumulator
+
+    def matrix(self) -> pd.DataFrame:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = self.n * self.sum_xy - self.sum_x * self.sum_x.T
+            var_x = self.n * self.sum_xx - self.sum_x ** 2
+            corr = cov / np.sqrt(var_x * var_x.T)
+        corr = np.clip(corr, -1.0, 1.0)
+        diagonal = np.diag_indices_from(corr)
+        corr[diagonal] = np.where(np.isnan(corr[diagonal]), np.nan, 1.0)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
@@ -0,0 +1,150 @@
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+Range = Optional[Tuple[float, float]]
+
+
+def finite_values(series: pd.Series) -> np.ndarray:
+    """Non-missing, finite values of a numeric series as float64"""
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return values[np.isfinite(values)]
+
+
+def histogram_edges(low: float, high: float, bins: int) -> np.ndarray:
+    """Equal-width bin edges over [low, high], widened by 0.5 each side when low == high (as NumPy does)"""
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, bins + 1)
+
+
+def sorted_histogram(ordered: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Counts per bin of already sorted values; bins are half-open except the last (as ``np.histogram``)"""
+    positions = np.searchsorted(ordered, edges, side='left')
+    positions[-1] = np.searchsorted(ordered, edges[-1], side='right')
+    return np.diff(positions).astype(np.int64)
+
+
+def numeric_payload(edges: np.ndarray, counts: np.ndarray, kind: str = 'numeric') -> Dict[str, Any]:
+    """Histogram payload: ``len(edges) == len(counts) + 1``"""
+    return {'type': kind, 'edges': edges, 'counts': counts}
+
+
+def histogram_payload(values: np.ndarray, bins: int, kind: str = 'numeric') -> Dict[str, Any]:
+    """Histogram payload of finite float64 values in ``bins`` equal-width bins"""
+    if len(values) == 0:
+        return numeric_payload(np.zeros(0), np.zeros(0, dtype=np.int64), kind)
+    edges = histogram_edges(float(values.min()), float(values.max()), max(int(bins), 1))
+    counts, _ = np.histogram(values, bins=edges)
+    return numeric_payload(edges, counts.astype(np.int64), kind)
+
+
+def top_values_payload(value_counts: pd.Series, non_null_count: int, k: int = 20) -> Dict[str, Any]:
+    """Categorical payload: the ``k`` most frequent values and the count of all others"""
+    top = value_counts.head(k)
+    return {
+        'type': 'categorical',
+        'labels': top.index.tolist(),
+        'values': [int(count) for count in top.to_numpy()],
+        'other_count': int(max(non_null_count - top.sum(), 0)),
+    }
+
+
+# Finest first; a bucket's approximate length in days bounds how many a span needs
+TIME_GRANULARITIES = (('day', 'D', 1.0), ('week', 'W', 7.0), ('month', 'M', 30.44), ('year', 'Y', 365.25))
+
+
+def time_buckets_payload(values: pd.Series, max_buckets: int = 400) -> Dict[str, Any]:
+    """Counts per day, week, month or year: the finest granularity giving at most ``max_buckets`` buckets.
+
+    ``values`` are the non-missing timestamps; empty buckets inside the range
+    are included with a zero count, and ``buckets`` holds each bucket's start.
+    """
+    if len(values) == 0:
+        return {'type': 'datetime', 'granularity': None, 'buckets': np.zeros(0, dtype='datetime64[ns]'),
+                'counts': np.zeros(0, dtype=np.int64)}
+    if getattr(values.dt, 'tz', None) is not None:
+        values = values.dt.tz_localize(None)
+    span_days = (values.max() - values.min()) / pd.Timedelta(days=1)
+    granularity, freq = TIME_GRANULARITIES[-1][:2]
+    for name, code, days in TIME_GRANULARITIES:
+        if span_days / days + 1 <= max_buckets:
+            granularity, freq = name, code
+            break
+    periods = values.dt.to_period(freq)
+    counts = periods.value_counts()
+    full = pd.period_range(periods.min(), periods.max(), freq=freq)
+    counts = counts.reindex(full, fill_value=0)
+    return {'type': 'datetime', 'granularity': granularity, 'buckets': full.start_time.to_numpy(),
+            'counts': counts.to_numpy(dtype=np.int64)}
+
+
+def scale_payload(payload: Optional[Dict[str, Any]], factor: float) -> Optional[Dict[str, Any]]:
+    """Payload with its counts multiplied by ``factor`` (a sample scaled to its population)"""
+    if payload is None:
+        return None
+    scaled = dict(payload)
+    for key in ('counts', 'values', 'other_count'):
+        if key in scaled:
+            scaled[key] = np.rint(np.asarray(scaled[key]) * factor).astype(np.int64)
+            if key != 'counts':
+                scaled[key] = scaled[key].tolist()
+    return scaled
+
+
+def density_grid(x: np.ndarray, y: np.ndarray, bins: int = 100, x_range: Range = None,
+                 y_range: Range = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(counts, x_edges, y_edges) of a ``bins`` x ``bins`` grid; counts[i, j] is x bin i, y bin j"""
+    keep = np.isfinite(x) & np.isfinite(y)
+    x, y = x[keep], y[keep]
+    if len(x) == 0:
+        return np.zeros((0, 0), dtype=np.int64), np.zeros(0), np.zeros(0)
+    value_range = None if x_range is None and y_range is None else [
+        x_range or (x.min(), x.max()), y_range or (y.min(), y.max())]
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins, range=value_range)
+    return counts.astype(np.int64), x_edges, y_edges
+
+
+def sample_points(x: np.ndarray, y: np.ndarray, max_points: int = 5000, x_range: Range = None,
+                  y_range: Range = None, seed: int = 0) -> Tuple[np.ndarray, np.ndarray, int]:
+    """At most ``max_points`` (x, y) pairs inside the ranges, and how many pairs the ranges hold"""
+    keep = np.isfinite(x) & np.isfinite(y)
+    if x_range is not None:
+        keep &= (x >= x_range[0]) & (x <= x_range[1])
+    if y_range is not None:
+        keep &= (y >= y_range[0]) & (y <= y_range[1])
+    positions = np.flatnonzero(keep)
+    total = len(positions)
+    if total > max_points:
+        positions = np.sort(np.random.default_rng(seed).choice(positions, size=max_points, replace=False))
+    return x[positions], y[positions], total
+
+
+def box_summary(values: np.ndarray, max_outliers: int = 500) -> Dict[str, Any]:
+    """Five-number summary with Tukey fences and at most ``max_outliers`` outliers.
+
+    Whiskers end at the most extreme values inside 1.5 IQR of the quartiles
+    (as Plotly draws them). When there are more outliers than the cap, the
+    most extreme ones are kept and ``outlier_count`` still counts them all.
+    """
+    if len(values) == 0:
+        return {'count': 0}
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    outliers = values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)]
+    if len(outliers) > max_outliers:
+        distance = np.abs(outliers - median)
+        outliers = outliers[np.argpartition(distance, -max_outliers)[-max_outliers:]]
+    return {
+        'count': int(len(values)),
+        'q1': float(q1),
+        'median': float(median),
+        'q3': float(q3),
+        'mean': float(values.mean()),
+        'lower_fence': float(inside.min()),
+        'upper_fence': float(inside.max()),
+        'outliers': np.sort(outliers).tolist(),
+        'outlier_count': int(len(values) - len(inside)),
+    }
@@ -0,0 +1,33 @@
+import os
+import sys
+from typing import Any, Dict, Optional
+import pandas as pd
+# Adjust system path for module imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from classes.data_classes import ColumnAnalysis, ColumnType
+from core.Analyzers.categorical_analyzer import CategoricalAnalyzer
+
+
+class BooleanAnalyzer(CategoricalAnalyzer):
+    """Analyzer for boolean columns"""
+    
+    column_type = ColumnType.BOOLEAN
+    
+    def can_analyze(self, series: pd.Series) -> bool:
+        return pd.api.types.is_bool_dtype(series)
+    
+    def build_analysis(self, name: Any, value_counts: pd.Series, unique_count: int,
+                       mode: Optional[str], missing_count: int, row_count: int) -> ColumnAnalysis:
+        """Categorical statistics plus the share of True values"""
+        analysis = super().build_analysis(name, value_counts, unique_count, mode, missing_count, row_count)
+        true_count = int(value_counts.get(True, 0))
+        analysis.statistics['true_count'] = true_count
+        analysis.statistics['true_percentage'] = round(true_count / row_count * 100, 2) if row_count else 0.0
+        if unique_count == 1:
+            analysis.insights.append("Constant flag (only one value present)")
+        return analysis
+    
+    def visualization_payload(self, value_counts: pd.Series, non_null_count: int) -> Dict[str, Any]:
+        data = super().visualization_payload(value_counts, non_null_count)
+        data['labels'] = [str(label) for label in data['labels']]
+        return data
@@ -0,0 +1,71 @@
+import threading
+import weakref
+from typing import Dict, Tuple
+
+import pandas as pd
+
+from classes.data_classes import DistinctCount
+from core.Analyzers.sketches import HyperLogLog, hash_values
+
+
+class DistinctCounter:
+    """Computes each column's distinct count once and shares it.
+
+    The factory's routing check, the analyzers' ``unique_count``, the
+    cardinality ratio and the insights all ask the same counter, which
+    remembers the result per Series object. In exact mode the count is
+    ``series.nunique()``. In approximate mode the values are hashed once
+    into a HyperLogLog sketch of ``2 ** precision`` registers; when the
+    estimate is below ``exact_limit`` the count is taken exactly from the
+    same hashes (64-bit fingerprints, so collisions are negligible there).
+    """
+
+    def __init__(self, approximate: bool = False, precision: int = 14, exact_limit: int = 10_000):
+        HyperLogLog(precision)  # Validates the precision up front
+        self.approximate = approximate
+        self.precision = precision
+        self.exact_limit = exact_limit
+        self._cache: Dict[int, Tuple[weakref.ref, DistinctCount]] = {}
+        self._lock = threading.Lock()
+
+    def count(self, series: pd.Series) -> DistinctCount:
+        """Distinct non-null values of ``series``"""
+        key = id(series)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None and cached[0]() is series:
+            return cached[1]
+
+        result = self._compute(series)
+        with self._lock:
+            self._cache[key] = (weakref.ref(series, self._forget(key)), result)
+        return result
+
+    def nunique(self, series: pd.Series) -> int:
+        return self.count(series).value
+
+    def _forget(self, key: int):
+        def callback(ref: weakref.ref) -> None:
+            with self._lock:
+                if key in self._cache and self._cache[key][0] is ref:
+                    del self._cache[key]
+        return callback
+
+    def _compute(self, series: pd.Series) -> DistinctCount:
+        if not self.approximate:
+            return DistinctCount(int(series.nunique()))
+        # Without factorizing first, so no hash table of all values is built
+        hashes = hash_values(series, categorize=False)
+        sketch = HyperLogLog(self.precision).update_hashes(hashes)
+        estimate = sketch.estimate()
+        if estimate < self.exact_limit:
+            return DistinctCount(len(pd.unique(hashes)))
+        return DistinctCount(int(round(estimate)), exact=False, relative_error=sketch.relative_error)
+
+    def __getstate__(self):
+        # Worker processes get the settings, not the cache
+        return {'approximate': self.approximate, 'precision': self.precision,
+                'exact_limit': self.exact_limit}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
@@ -1,34 +1,116 @@
 import os
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import pandas as pd
 # Adjust system path for module imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from classes.data_classes import ColumnAnalysis, ColumnType
+from classes.data_classes import ColumnAnalysis, ColumnType, DistinctCount
+from core.Analyzers.binning import top_values_payload
+from core.Analyzers.cardinality import DistinctCounter
+from core.Analyzers.sketches import MisraGries
 from interface.Analyzer_interface import IColumnAnalyzer
 
 class CategoricalAnalyzer(IColumnAnalyzer):
-    """Analyzer for categorical columns"""
+    """Analyzer for categorical columns.
+
+    With ``top_k_capacity`` set, value frequencies come from a Misra-Gries
+    summary filled in one pass over ``block_rows``-row slices, so memory is
+    bounded by the capacity instead of the column's cardinality. An
+    approximate ``distinct_counter`` implies such a summary (of
+    ``DEFAULT_SUMMARY_CAPACITY`` counters unless ``top_k_capacity`` is set),
+    so the mode and top values do not build a full hash table either.
+    Conversely, ``top_k_capacity`` implies bounded distinct counting: exact
+    from the summary while it has not overflowed, HyperLogLog after.
+    """
+    
+    column_type = ColumnType.CATEGORICAL
+    DEFAULT_SUMMARY_CAPACITY = 1000
+    
+    def __init__(self, distinct_counter: Optional[DistinctCounter] = None,
+                 top_k_capacity: Optional[int] = None, block_rows: int = 100_000):
+        self.distinct_counter = distinct_counter or DistinctCounter()
+        self.top_k_capacity = top_k_capacity
+        self.block_rows = block_rows
+        counter = self.distinct_counter
+        self.sketch_counter = (counter if counter.approximate or top_k_capacity is None
+                               else DistinctCounter(True, counter.precision, counter.exact_limit))
     
     def can_analyze(self, series: pd.Series) -> bool:
         return (pd.api.types.is_object_dtype(series) or 
                 pd.api.types.is_categorical_dtype(series) or
-                series.nunique() < 20)  # Low cardinality numeric
+                self.distinct_counter.nunique(series) < 20)  # Low cardinality numeric
+    
+    @property
+    def summary_capacity(self) -> Optional[int]:
+        """Counters of the frequency summary, or None to count values exactly"""
+        if self.top_k_capacity is not None:
+            return self.top_k_capacity
+        return self.DEFAULT_SUMMARY_CAPACITY if self.distinct_counter.approximate else None
     
     def analyze(self, series: pd.Series) -> ColumnAnalysis:
+        if self.summary_capacity is None:
+            value_counts = series.value_counts()
+            mode = series.mode()
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Categorical modes come in category order; sort ties by value like object columns
+                mode = mode.astype(object).mode()
+            mode = str(mode[0]) if not mode.empty else None
+            top_k = None
+        else:
+            top_k = self.top_values(series)
+            value_counts = top_k.value_counts(20)
+            mode = top_k.mode()
+            mode = None if mode is None else str(mode)
+        
+        distinct = self.distinct_count(series, top_k)
+        analysis = self.build_analysis(
+            name=series.name,
+            value_counts=value_counts,
+            unique_count=distinct.value,
+            mode=mode,
+            missing_count=series.isnull().sum(),
+            row_count=len(series)
+        )
+        if not distinct.exact:
+            analysis.approximate_statistics.extend(['unique_count', 'cardinality_ratio'])
+        analysis.visualization = self.visualization_payload(value_counts, len(series) - int(analysis.missing_count))
+        if top_k is not None and not top_k.is_exact:
+            # Each reported count is at most this far below the true count
+            analysis.statistics['top_values_error_bound'] = top_k.error_bound
+            analysis.approximate_statistics.extend(['top_values', 'mode', 'mode_frequency', 'mode_percentage'])
+        return analysis
+    
+    def distinct_count(self, series: pd.Series, top_k: Optional[MisraGries] = None) -> DistinctCount:
+        """Distinct count, bounded in memory whenever a frequency summary is used"""
+        if top_k is None or self.distinct_counter.approximate:
+            return self.distinct_counter.count(series)
+        if top_k.is_exact:
+            # Nothing was evicted, so the summary holds every distinct value
+            return DistinctCount(len(top_k.counts))
+        return self.sketch_counter.count(series)
+    
+    def top_values(self, series: pd.Series) -> MisraGries:
+        """Bounded-memory frequency summary of the series, one pass in blocks"""
+        summary = MisraGries(self.summary_capacity)
+        for start in range(0, len(series), self.block_rows):
+            summary.update(series.iloc[start:start + self.block_rows])
+        return summary
+    
+    def build_analysis(self, name: Any, value_counts: pd.Series, unique_count: int,
+                       mode: Optional[str], missing_count: int, row_count: int) -> ColumnAnalysis:
+        """Derive statistics and insights from (at least the top two) value counts"""
         insights = []
         stats = {}
         
         # Value counts
-        value_counts = series.value_counts()
         stats['top_values'] = value_counts.head(10).to_dict()
-        stats['unique_count'] = series.nunique()
-        stats['mode'] = str(series.mode()[0]) if not series.mode().empty else None
+        stats['unique_count'] = unique_count
+        stats['mode'] = mode
         stats['mode_frequency'] = int(value_counts.iloc[0]) if len(value_counts) > 0 else 0
-        stats['mode_percentage'] = round(stats['mode_frequency'] / len(series) * 100, 2)
+        stats['mode_percentage'] = round(stats['mode_frequency'] / row_count * 100, 2)
         
         # Cardinality analysis
-        cardinality_ratio = stats['unique_count'] / len(series)
+        cardinality_ratio = stats['unique_count'] / row_count
         stats['cardinality_ratio'] = round(cardinality_ratio, 4)
         
         # Generate insights
@@ -47,19 +129,29 @@ class CategoricalAnalyzer(IColumnAnalyzer):
                 insights.append(f"Highly imbalanced (top category is {imbalance_ratio:.1f}x more frequent)")
         
         return ColumnAnalysis(
-            name=series.name,
-            column_type=ColumnType.CATEGORICAL,
+            name=name,
+            column_type=self.column_type,
             unique_count=stats['unique_count'],
-            missing_count=series.isnull().sum(),
-            missing_percentage=round(series.isnull().sum() / len(series) * 100, 2),
+            missing_count=missing_count,
+            missing_percentage=round(missing_count / row_count * 100, 2),
             statistics=stats,
             insights=insights
         )
     
+    def profile(self, series: pd.Series):
+        # Imported lazily: the accumulators build on this analyzer
+        from core.Analyzers.accumulators import CategoricalAccumulator
+        profile = CategoricalAccumulator(series.name, top_k_capacity=self.top_k_capacity or 1000,
+                                         column_type=self.column_type)
+        profile.update(series)
+        return profile
+    
     def get_visualization_data(self, series: pd.Series) -> Dict[str, Any]:
-        value_counts = series.value_counts().head(20)
-        return {
-            'type': 'categorical',
-            'labels': value_counts.index.tolist(),
-            'values': value_counts.values.tolist()
-        }
+        if self.summary_capacity is None:
+            value_counts = series.value_counts()
+        else:
+            value_counts = self.top_values(series).value_counts(20)
+        return self.visualization_payload(value_counts, int(series.notna().sum()))
+    
+    def visualization_payload(self, value_counts: pd.Series, non_null_count: int) -> Dict[str, Any]:
+        return top_values_payload(value_counts, non_null_count)
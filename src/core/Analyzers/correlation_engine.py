@@ -0,0 +1,186 @@
+from typing import Any, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+CorrelationPair = Tuple[Any, Any, float]
+
+
+def pairs_from_matrix(matrix: pd.DataFrame, threshold: float,
+                      top_n: Optional[int] = None) -> List[CorrelationPair]:
+    """Upper-triangle pairs of a correlation matrix with ``|r| > threshold``, strongest first"""
+    values = matrix.to_numpy(dtype=np.float64)
+    rows, cols = np.triu_indices(len(values), k=1)
+    found = _PairCollector(threshold, top_n)
+    found.add(rows, cols, values[rows, cols])
+    return found.pairs(matrix.columns)
+
+
+class _PairCollector:
+    """Pairs above a threshold, trimmed to the ``top_n`` strongest when set"""
+
+    def __init__(self, threshold: float, top_n: Optional[int]):
+        self.threshold = threshold
+        self.top_n = top_n
+        self._rows: List[np.ndarray] = []
+        self._cols: List[np.ndarray] = []
+        self._values: List[np.ndarray] = []
+        self._size = 0
+
+    def add(self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray) -> None:
+        keep = np.abs(values) > self.threshold
+        if not keep.any():
+            return
+        self._rows.append(rows[keep])
+        self._cols.append(cols[keep])
+        self._values.append(values[keep])
+        self._size += int(keep.sum())
+        if self.top_n is not None and self._size > 2 * self.top_n:
+            self._trim()
+
+    def _trim(self) -> None:
+        rows, cols, values = (np.concatenate(parts) for parts in (self._rows, self._cols, self._values))
+        if len(values) > self.top_n:
+            best = np.argpartition(-np.abs(values), self.top_n - 1)[:self.top_n] if self.top_n else []
+            rows, cols, values = rows[best], cols[best], values[best]
+        self._rows, self._cols, self._values = [rows], [cols], [values]
+        self._size = len(values)
+
+    def pairs(self, labels: pd.Index) -> List[CorrelationPair]:
+        if not self._values:
+            return []
+        if self.top_n is not None:
+            self._trim()
+        rows, cols, values = (np.concatenate(parts) for parts in (self._rows, self._cols, self._values))
+        order = np.lexsort((cols, rows, -np.abs(values)))
+        return [(labels[rows[i]], labels[cols[i]], round(float(values[i]), 3)) for i in order]
+
+
+class CorrelationEngine:
+    """Blocked Pearson/Spearman correlations on BLAS matrix products.
+
+    The k×k matrix is produced ``block_columns`` columns at a time as
+    products of one centered and scaled block against each later block,
+    preparing blocks as they are needed, so the working set stays bounded
+    whatever the width. ``high_pairs`` keeps only upper-triangle pairs above
+    a threshold and never builds the dense matrix.
+
+    Missing values are handled pairwise-complete like ``DataFrame.corr``:
+    for columns with NaNs each block also multiplies the validity masks to
+    get per-pair counts, sums and sums of squares. Spearman correlates the
+    average ranks of each column; with NaNs the ranks are taken over each
+    column's own non-missing values, whereas pandas re-ranks per pair, so
+    the two agree exactly only when missingness is shared.
+    """
+
+    METHODS = ('pearson', 'spearman')
+
+    def __init__(self, method: str = 'pearson', block_columns: int = 512, min_periods: int = 1):
+        if method not in self.METHODS:
+            raise ValueError(f"Unsupported correlation method '{method}', use one of {self.METHODS}")
+        self.method = method
+        self.block_columns = max(1, block_columns)
+        self.min_periods = max(1, min_periods)
+
+    def matrix(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Dense correlation matrix of the columns of ``df``"""
+        k = df.shape[1]
+        result = np.empty((k, k), dtype=np.float64)
+        for start, stop, block in self._blocks(df):
+            result[start:stop, start:] = block
+            result[start:, start:stop] = block.T
+        return pd.DataFrame(result, index=df.columns, columns=df.columns)
+
+    def high_pairs(self, df: pd.DataFrame, threshold: float = 0.7,
+                   top_n: Optional[int] = None) -> List[CorrelationPair]:
+        """Column pairs with ``|r| > threshold``, strongest first"""
+        found = _PairCollector(threshold, top_n)
+        for start, stop, block in self._blocks(df):
+            rows, cols = np.nonzero(np.abs(block) > threshold)
+            upper = cols + start > rows + start
+            rows, cols = rows[upper], cols[upper]
+            found.add(rows + start, cols + start, block[rows, cols])
+        return found.pairs(df.columns)
+
+    def _blocks(self, df: pd.DataFrame) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """Correlations of columns [start, stop) against columns [start, k).
+
+        Only two column blocks are converted, centered and squared at a time,
+        so the working set is a few n × ``block_columns`` arrays instead of
+        several n × k ones; the later blocks are prepared again per strip.
+        """
+        k = df.shape[1]
+        bounds = [(start, min(start + self.block_columns, k)) for start in range(0, k, self.block_columns)]
+        for i, (start, stop) in enumerate(bounds):
+            left = self._prepare(df, start, stop)
+            strip = np.empty((stop - start, k - start), dtype=np.float64)
+            for other_start, other_stop in bounds[i:]:
+                right = left if other_start == start else self._prepare(df, other_start, other_stop)
+                strip[:, other_start - start:other_stop - start] = self._correlate(left, right)
+            yield start, stop, strip
+
+    def _prepare(self, df: pd.DataFrame, start: int, stop: int) -> '_PreparedBlock':
+        """Columns [start, stop) as float64, ranked for Spearman and centered"""
+        values = df.iloc[:, start:stop].to_numpy(dtype=np.float64, na_value=np.nan)
+        # Like pandas, infinities count as missing
+        valid = np.isfinite(values)
+        complete = bool(valid.all())
+        if not complete:
+            values = np.where(valid, values, np.nan)
+        if self.method == 'spearman':
+            values = pd.DataFrame(values).rank(method='average').to_numpy()
+        if complete:
+            return _PreparedBlock(self._standardize(values), None)
+        # Centering by the column means keeps the pairwise sums well conditioned
+        with np.errstate(invalid='ignore'):
+            means = np.nanmean(values, axis=0)
+        centered = np.where(valid, values - np.nan_to_num(means), 0.0)
+        return _PreparedBlock(centered, valid.astype(np.float64))
+
+    def _correlate(self, left: '_PreparedBlock', right: '_PreparedBlock') -> np.ndarray:
+        """Correlations of the columns of ``left`` (rows) against those of ``right``"""
+        if left.mask is None and right.mask is None:
+            return np.clip(left.values.T @ right.values, -1.0, 1.0)
+
+        x, mx = left.pairwise()
+        y, my = right.pairwise()
+        count = mx.T @ my
+        sum_x = x.T @ my
+        sum_y = mx.T @ y
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = x.T @ y - sum_x * sum_y / count
+            var_x = (x * x).T @ my - sum_x * sum_x / count
+            var_y = mx.T @ (y * y) - sum_y * sum_y / count
+            block = cov / np.sqrt(var_x * var_y)
+        block[(count < self.min_periods) | (var_x <= 0) | (var_y <= 0)] = np.nan
+        return np.clip(block, -1.0, 1.0)
+
+    def _standardize(self, values: np.ndarray) -> np.ndarray:
+        """Center each column and scale it to unit norm; constant columns become NaN"""
+        centered = values - values.mean(axis=0)
+        norms = np.sqrt(np.einsum('ij,ij->j', centered, centered))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            standardized = centered / np.where(norms > 0, norms, np.nan)
+        if len(values) < self.min_periods:
+            standardized[:] = np.nan
+        return standardized
+
+
+class _PreparedBlock:
+    """A column block ready for correlation.
+
+    Complete blocks hold standardized columns and no mask; blocks with
+    missing values hold mean-centered columns (0 where missing) and the
+    validity mask as floats.
+    """
+
+    def __init__(self, values: np.ndarray, mask: Optional[np.ndarray]):
+        self.values = values
+        self.mask = mask
+
+    def pairwise(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(centered values, mask) for the pairwise-complete formulas"""
+        if self.mask is not None:
+            return self.values, self.mask
+        # Standardized columns are centered already; constant ones (NaN) have no variance either way
+        return np.nan_to_num(self.values), np.ones_like(self.values)
@@ -1,58 +1,84 @@
 import os
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import pandas as pd
 # Adjust system path for module imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from classes.data_classes import ColumnAnalysis, ColumnType
+from core.Analyzers.binning import time_buckets_payload
+from core.Analyzers.cardinality import DistinctCounter
 from interface.Analyzer_interface import IColumnAnalyzer
 
 
 class DatetimeAnalyzer(IColumnAnalyzer):
     """Analyzer for datetime columns"""
     
+    def __init__(self, distinct_counter: Optional[DistinctCounter] = None):
+        self.distinct_counter = distinct_counter or DistinctCounter()
+    
     def can_analyze(self, series: pd.Series) -> bool:
         return pd.api.types.is_datetime64_any_dtype(series)
     
     def analyze(self, series: pd.Series) -> ColumnAnalysis:
+        clean_series = series.dropna()
+        distinct = self.distinct_counter.count(series)
+        analysis = self.build_analysis(
+            name=series.name,
+            min_value=clean_series.min() if len(clean_series) else None,
+            max_value=clean_series.max() if len(clean_series) else None,
+            unique_count=distinct.value,
+            missing_count=series.isnull().sum(),
+            row_count=len(series)
+        )
+        if not distinct.exact:
+            analysis.approximate_statistics.append('unique_count')
+        analysis.visualization = time_buckets_payload(clean_series)
+        return analysis
+    
+    def build_analysis(self, name: Any, min_value: Optional[pd.Timestamp], max_value: Optional[pd.Timestamp],
+                       unique_count: int, missing_count: int, row_count: int) -> ColumnAnalysis:
+        """Derive statistics and insights from the date range"""
         insights = []
         stats = {}
         
-        clean_series = series.dropna()
-        if len(clean_series) == 0:
+        if min_value is None:
             return ColumnAnalysis(
-                name=series.name,
+                name=name,
                 column_type=ColumnType.DATETIME,
                 unique_count=0,
-                missing_count=series.isnull().sum(),
+                missing_count=missing_count,
                 missing_percentage=100.0,
                 statistics={},
                 insights=["All values are missing"]
             )
         
-        stats['min_date'] = str(clean_series.min())
-        stats['max_date'] = str(clean_series.max())
-        stats['date_range_days'] = (clean_series.max() - clean_series.min()).days
+        stats['min_date'] = str(min_value)
+        stats['max_date'] = str(max_value)
+        stats['date_range_days'] = (max_value - min_value).days
         
         # Extract components
-        stats['year_range'] = f"{clean_series.dt.year.min()} - {clean_series.dt.year.max()}"
+        stats['year_range'] = f"{min_value.year} - {max_value.year}"
         
         # Generate insights
         if stats['date_range_days'] > 365:
             insights.append(f"Spans {stats['date_range_days']} days ({stats['date_range_days']//365} years)")
         
         return ColumnAnalysis(
-            name=series.name,
+            name=name,
             column_type=ColumnType.DATETIME,
-            unique_count=series.nunique(),
-            missing_count=series.isnull().sum(),
-            missing_percentage=round(series.isnull().sum() / len(series) * 100, 2),
+            unique_count=unique_count,
+            missing_count=missing_count,
+            missing_percentage=round(missing_count / row_count * 100, 2),
             statistics=stats,
             insights=insights
         )
     
+    def profile(self, series: pd.Series):
+        # Imported lazily: the accumulators build on this analyzer
+        from core.Analyzers.accumulators import DatetimeAccumulator
+        profile = DatetimeAccumulator(series.name)
+        profile.update(series)
+        return profile
+    
     def get_visualization_data(self, series: pd.Series) -> Dict[str, Any]:
-        return {
-            'type': 'datetime',
-            'values': series.dropna().dt.strftime('%Y-%m-%d').tolist()
-        }
+        return time_buckets_payload(series.dropna())
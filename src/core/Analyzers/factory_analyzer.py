@@ -1,24 +1,104 @@
+from typing import Any, Dict, Optional, Tuple
+
 import pandas as pd
 
+from classes.data_classes import ColumnType
+from core.Analyzers.cardinality import DistinctCounter
 from interface.Analyzer_interface import IColumnAnalyzer
+from core.Analyzers.boolean_analyzer import BooleanAnalyzer
 from core.Analyzers.categorical_analyzer import CategoricalAnalyzer
 from core.Analyzers.date_time_analyzer import DatetimeAnalyzer
 from core.Analyzers.numerical_analyzer import NumericAnalyzer
+from core.Analyzers.text_analyzer import TextAnalyzer
+
+
+def schema_signature(df: pd.DataFrame) -> Tuple[Tuple[Any, str], ...]:
+    """Column labels and dtypes, which is all routing depends on"""
+    return tuple((col, str(dtype)) for col, dtype in df.dtypes.items())
+
+
+class ColumnTypePlan:
+    """Column type and analyzer of every column of one DataFrame schema"""
+
+    def __init__(self, schema: Tuple[Tuple[Any, str], ...],
+                 routes: Dict[Any, Tuple[ColumnType, IColumnAnalyzer]]):
+        self.schema = schema
+        self.routes = routes
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        return schema_signature(df) == self.schema
+
+    def column_type(self, column: Any) -> ColumnType:
+        return self.routes[column][0]
+
+    def analyzer(self, column: Any) -> IColumnAnalyzer:
+        return self.routes[column][1]
 
 
 class AnalyzerFactory:
-    """Factory for creating appropriate analyzers"""
-    
-    def __init__(self):
-        self._analyzers = [
-            DatetimeAnalyzer(),
-            NumericAnalyzer(),
-            CategoricalAnalyzer(),
-        ]
-    
+    """Factory for creating appropriate analyzers.
+
+    Routing is decided from the dtype alone, except for object/string
+    columns, where a strided sample of ``probe_size`` values tells booleans,
+    free text (long, mostly distinct strings) and categories apart.
+    """
+
+    def __init__(self, distinct_counter: Optional[DistinctCounter] = None,
+                 top_k_capacity: Optional[int] = None, probe_size: int = 1000,
+                 text_min_length: int = 40):
+        # One counter is shared so a column's distinct count is computed once
+        self.distinct_counter = distinct_counter or DistinctCounter()
+        self.top_k_capacity = top_k_capacity
+        self.probe_size = probe_size
+        self.text_min_length = text_min_length
+        self._analyzers: Dict[ColumnType, IColumnAnalyzer] = {
+            ColumnType.DATETIME: DatetimeAnalyzer(self.distinct_counter),
+            ColumnType.NUMERIC: NumericAnalyzer(self.distinct_counter),
+            ColumnType.BOOLEAN: BooleanAnalyzer(self.distinct_counter, top_k_capacity),
+            ColumnType.TEXT: TextAnalyzer(self.distinct_counter, top_k_capacity),
+            ColumnType.CATEGORICAL: CategoricalAnalyzer(self.distinct_counter, top_k_capacity),
+        }
+
     def get_analyzer(self, series: pd.Series) -> IColumnAnalyzer:
         """Get the appropriate analyzer for a series"""
-        for analyzer in self._analyzers:
-            if analyzer.can_analyze(series):
-                return analyzer
-        return CategoricalAnalyzer()  # Fallback
+        return self._analyzers[self.classify(series)]
+
+    def build_plan(self, df: pd.DataFrame) -> ColumnTypePlan:
+        """Route every column of ``df`` once"""
+        routes = {}
+        for i, col in enumerate(df.columns):
+            column_type = self.classify(df.iloc[:, i])
+            routes[col] = (column_type, self._analyzers[column_type])
+        return ColumnTypePlan(schema_signature(df), routes)
+
+    def classify(self, series: pd.Series) -> ColumnType:
+        """Column type of a series"""
+        dtype = series.dtype
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return ColumnType.DATETIME
+        if pd.api.types.is_bool_dtype(dtype):
+            return ColumnType.BOOLEAN
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_timedelta64_dtype(dtype):
+            return ColumnType.NUMERIC
+        if isinstance(dtype, pd.CategoricalDtype):
+            return ColumnType.CATEGORICAL
+        if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            return self._probe(series)
+        return ColumnType.CATEGORICAL
+
+    def _probe(self, series: pd.Series) -> ColumnType:
+        """Classify an object/string column from a strided sample"""
+        step = max(1, len(series) // self.probe_size)
+        sample = series.iloc[::step].iloc[:self.probe_size].dropna()
+        if sample.empty:
+            return ColumnType.CATEGORICAL
+
+        inferred = pd.api.types.infer_dtype(sample, skipna=True)
+        if inferred == 'boolean':
+            return ColumnType.BOOLEAN
+        if inferred == 'string':
+            long_values = sample.str.len().mean() >= self.text_min_length
+            mostly_distinct = sample.nunique() >= len(sample) / 2
+            if long_values and mostly_distinct:
+                return ColumnType.TEXT
+        return ColumnType.CATEGORICAL
@@ -1,22 +1,30 @@
 import os
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+import numpy as np
 import pandas as pd
 
 # Adjust system path for module imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from classes.data_classes import ColumnAnalysis, ColumnType
+from core.Analyzers.binning import finite_values, histogram_payload
+from core.Analyzers.cardinality import DistinctCounter
 from interface.Analyzer_interface import IColumnAnalyzer
 
 
 class NumericAnalyzer(IColumnAnalyzer):
     """Analyzer for numeric columns"""
     
+    def __init__(self, distinct_counter: Optional[DistinctCounter] = None):
+        self.distinct_counter = distinct_counter or DistinctCounter()
+    
     def can_analyze(self, series: pd.Series) -> bool:
         return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_datetime64_any_dtype(series) and not pd.api.types.is_timedelta64_dtype(series) and not pd.api.types.is_bool_dtype(series)
     
     def analyze(self, series: pd.Series) -> ColumnAnalysis:
-        insights = []
+        if series.dtype == np.float32:
+            # pandas reduces float32 in float32; widening keeps results independent of storage width
+            series = series.astype(np.float64)
         stats = {}
         
         # Basic statistics
@@ -39,7 +47,29 @@ class NumericAnalyzer(IColumnAnalyzer):
         upper_bound = q3 + 1.5 * iqr
         outliers = series[(series < lower_bound) | (series > upper_bound)]
         stats['outlier_count'] = len(outliers)
-        stats['outlier_percentage'] = round(len(outliers) / len(series) * 100, 2)
+        
+        distinct = self.distinct_counter.count(series)
+        analysis = self.build_analysis(
+            name=series.name,
+            stats=stats,
+            unique_count=distinct.value,
+            missing_count=series.isnull().sum(),
+            row_count=len(series)
+        )
+        if not distinct.exact:
+            analysis.approximate_statistics.append('unique_count')
+        analysis.visualization = histogram_payload(finite_values(series), self.histogram_bins(distinct.value))
+        return analysis
+    
+    @staticmethod
+    def histogram_bins(unique_count: int) -> int:
+        return max(1, min(50, int(unique_count)))
+    
+    def build_analysis(self, name: Any, stats: Dict[str, Any], unique_count: int,
+                       missing_count: int, row_count: int) -> ColumnAnalysis:
+        """Derive percentages and insights from precomputed statistics"""
+        insights = []
+        stats['outlier_percentage'] = round(stats['outlier_count'] / row_count * 100, 2)
         
         # Generate insights
         if abs(stats['skewness']) > 1:
@@ -53,19 +83,22 @@ class NumericAnalyzer(IColumnAnalyzer):
             insights.append("High variability (std > mean)")
         
         return ColumnAnalysis(
-            name=series.name,
+            name=name,
             column_type=ColumnType.NUMERIC,
-            unique_count=series.nunique(),
-            missing_count=series.isnull().sum(),
-            missing_percentage=round(series.isnull().sum() / len(series) * 100, 2),
+            unique_count=unique_count,
+            missing_count=missing_count,
+            missing_percentage=round(missing_count / row_count * 100, 2),
             statistics=stats,
             insights=insights
         )
     
+    def profile(self, series: pd.Series):
+        # Imported lazily: the accumulators build on this analyzer
+        from core.Analyzers.accumulators import NumericAccumulator
+        profile = NumericAccumulator(series.name)
+        profile.update(series)
+        return profile
+    
     def get_visualization_data(self, series: pd.Series) -> Dict[str, Any]:
-        return {
-            'type': 'numeric',
-            'values': series.dropna().tolist(),
-            'bins': min(50, series.nunique())
-        }
+        return histogram_payload(finite_values(series), self.histogram_bins(self.distinct_counter.nunique(series)))
 
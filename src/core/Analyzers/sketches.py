@@ -0,0 +1,375 @@
+import base64
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_for_hashing(values):
+    """Series or DataFrame whose hashes do not depend on how values are stored.
+
+    Narrow integer and float32 columns are widened to 64 bits, bool
+    columns become categoricals of the Python booleans, which hash like an
+    object column of True/False, and -0.0 becomes 0.0 (they compare equal).
+    Other columns are not copied.
+    """
+    if isinstance(values, pd.DataFrame):
+        if not any(_needs_normalizing(values.iloc[:, i]) for i in range(values.shape[1])):
+            return values
+        return pd.DataFrame({i: normalize_for_hashing(values.iloc[:, i]) for i in range(values.shape[1])},
+                            index=values.index, copy=False)
+    if not _needs_normalizing(values):
+        return values
+    dtype = values.dtype
+    if dtype.kind == 'b':
+        categories = pd.CategoricalDtype(pd.Index([False, True], dtype=object))
+        codes = values.to_numpy().view(np.int8)
+        return pd.Series(pd.Categorical.from_codes(codes, dtype=categories), index=values.index, name=values.name)
+    values = values.astype({'i': np.int64, 'u': np.uint64, 'f': np.float64}[dtype.kind], copy=False)
+    # Adding 0.0 turns -0.0 into 0.0 and leaves every other value alone
+    return values + 0.0 if dtype.kind == 'f' else values
+
+
+def _needs_normalizing(series: pd.Series) -> bool:
+    dtype = series.dtype
+    if not isinstance(dtype, np.dtype):
+        return False
+    if dtype.kind == 'f':
+        values = series.to_numpy()
+        return dtype.itemsize < 8 or bool(np.any((values == 0) & np.signbit(values)))
+    return dtype.kind == 'b' or (dtype.kind in 'iu' and dtype.itemsize < 8)
+
+
+def hash_values(series: pd.Series, categorize: bool = True) -> np.ndarray:
+    """64-bit hashes of the non-null values of a series.
+
+    ``categorize`` deduplicates object values before hashing, which only pays
+    off at low cardinality; the hashes are identical either way, and
+    identical for any storage width of the values.
+    """
+    return pd.util.hash_pandas_object(normalize_for_hashing(series).dropna(), index=False,
+                                      categorize=categorize).to_numpy(dtype=np.uint64)
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch.
+
+    Uses ``2 ** precision`` one-byte registers; the relative standard error
+    is about ``1.04 / sqrt(2 ** precision)`` (0.8% at the default 14). With
+    ``exact_limit`` the distinct hashes themselves are also kept until there
+    are more than that many, and the count is exact (``is_exact``) until then.
+    """
+
+    def __init__(self, precision: int = 14, exact_limit: int = 0):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+        self.exact_limit = exact_limit
+        self.exact_hashes: Optional[np.ndarray] = np.empty(0, dtype=np.uint64) if exact_limit > 0 else None
+
+    @property
+    def relative_error(self) -> float:
+        return 0.0 if self.is_exact else 1.04 / math.sqrt(len(self.registers))
+
+    @property
+    def is_exact(self) -> bool:
+        return self.exact_hashes is not None
+
+    def _add_exact(self, hashes: np.ndarray) -> None:
+        if self.exact_hashes is None:
+            return
+        merged = np.union1d(self.exact_hashes, hashes)
+        self.exact_hashes = merged if len(merged) <= self.exact_limit else None
+
+    def update(self, series: pd.Series) -> 'HyperLogLog':
+        """Add the non-null values of a series"""
+        return self.update_hashes(hash_values(series))
+
+    def update_hashes(self, hashes: np.ndarray) -> 'HyperLogLog':
+        """Add precomputed 64-bit hashes"""
+        if len(hashes) == 0:
+            return self
+        self._add_exact(hashes)
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.intp)
+        # A sentinel bit caps the rank at 64 - p + 1 for all-zero remainders
+        remainder = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))
+        rank = (64 - _bit_length(remainder) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Fold another sketch of the same precision into this one"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        if other.exact_hashes is None:
+            self.exact_hashes = None
+        else:
+            self._add_exact(other.exact_hashes)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'precision': self.precision,
+            'registers': base64.b64encode(self.registers.tobytes()).decode('ascii'),
+            'exact_limit': self.exact_limit,
+            'exact_hashes': (None if self.exact_hashes is None
+                             else base64.b64encode(self.exact_hashes.tobytes()).decode('ascii')),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HyperLogLog':
+        sketch = cls(data['precision'], data.get('exact_limit', 0))
+        sketch.registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8).copy()
+        exact = data.get('exact_hashes')
+        sketch.exact_hashes = None if exact is None else np.frombuffer(base64.b64decode(exact), dtype=np.uint64).copy()
+        return sketch
+
+    def estimate(self) -> float:
+        """Estimated number of distinct values (the exact count while ``is_exact``)"""
+        if self.exact_hashes is not None:
+            return float(len(self.exact_hashes))
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros > 0:
+            # Linear counting is far more accurate for small cardinalities
+            return m * math.log(m / zeros)
+        return float(raw)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Exact bit length of non-zero uint64 values"""
+    with np.errstate(divide='ignore'):
+        length = np.floor(np.log2(values.astype(np.float64))).astype(np.int64) + 1
+    length = np.minimum(length, 64)
+    # float64 rounding can push values just below a power of two up by one bit
+    too_long = (values >> np.clip(length - 1, 0, 63).astype(np.uint64)) == 0
+    length[too_long] -= 1
+    too_short = (length < 64) & ((values >> np.clip(length, 0, 63).astype(np.uint64)) != 0)
+    length[too_short] += 1
+    return length
+
+
+class KLLSketch:
+    """KLL quantile sketch over float values.
+
+    Keeps a hierarchy of compactors whose capacities shrink geometrically
+    from ``k``; an item at level ``h`` stands for ``2 ** h`` inputs. While no
+    compaction has happened the sketch holds every value and quantiles are
+    exact (``is_exact``); afterwards the rank error is roughly ``1.7 / k``.
+    Compaction coin flips come from a seeded generator, so the same input
+    always yields the same quantiles.
+    """
+
+    def __init__(self, k: int = 1000, seed: int = 0):
+        self.k = k
+        self.seed = seed
+        self.count = 0
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self.is_exact = True
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(8, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values: np.ndarray) -> 'KLLSketch':
+        """Add non-NaN float values"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.count += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """Fold another sketch into this one"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.count += other.count
+        self.is_exact = self.is_exact and other.is_exact
+        self._compress()
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'k': self.k,
+            'seed': self.seed,
+            'count': self.count,
+            'is_exact': self.is_exact,
+            'levels': [level.tolist() for level in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'KLLSketch':
+        sketch = cls(data['k'], data.get('seed', 0))
+        sketch.count = data['count']
+        sketch.is_exact = data['is_exact']
+        sketch.levels = [np.asarray(level, dtype=np.float64) for level in data['levels']]
+        return sketch
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                items = np.sort(items)
+                # An odd item out stays behind so total weight is preserved
+                leftover, items = (items[:1], items[1:]) if len(items) % 2 else (items[:0], items)
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level] = leftover
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.is_exact = False
+                # Capacities depend on the height, so re-check from the bottom
+                level = 0
+                continue
+            level += 1
+
+    def _weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2 ** h, dtype=np.float64)
+                                  for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], weights[order]
+
+    def quantile(self, q: float) -> float:
+        """Estimated q-quantile (linear interpolation while exact)"""
+        if self.count == 0:
+            return float('nan')
+        if self.is_exact:
+            # Imported lazily: the analyzers depend on this module
+            from core.Analyzers.vectorized_numeric import linear_quantile
+            ordered = np.sort(self.levels[0])[None, :]
+            return float(linear_quantile(ordered, np.array([len(self.levels[0])]), q)[0])
+        items, weights = self._weighted_items()
+        cumulative = np.cumsum(weights)
+        target = q * cumulative[-1]
+        return float(items[min(np.searchsorted(cumulative, target), len(items) - 1)])
+
+    def rank(self, value: float) -> float:
+        """Estimated number of inputs strictly below ``value``"""
+        items, weights = self._weighted_items()
+        return float(weights[items < value].sum())
+
+    def count_outside(self, lower: float, upper: float) -> float:
+        """Estimated number of inputs below ``lower`` or above ``upper``"""
+        items, weights = self._weighted_items()
+        return float(weights[(items < lower) | (items > upper)].sum())
+
+
+class MisraGries:
+    """Mergeable heavy-hitters summary (Misra-Gries) over hashable values.
+
+    Keeps at most ``capacity`` counters. Whenever a batch or merge overflows,
+    the (capacity + 1)-th largest count is subtracted from every counter and
+    non-positive counters are dropped; ``error_bound`` accumulates those
+    decrements. Reported counts are lower bounds and each true count is at
+    most ``error_bound`` higher, which never exceeds N / (capacity + 1).
+    While ``error_bound`` is zero the counts are exact.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.counts: Dict[Any, int] = {}
+        self.total = 0
+        self.error_bound = 0
+
+    @property
+    def is_exact(self) -> bool:
+        return self.error_bound == 0
+
+    def update(self, series: pd.Series) -> 'MisraGries':
+        """Add the non-null values of a series"""
+        counts = series.value_counts(sort=False)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Categories absent from this batch are listed with a zero count
+            counts = counts[counts > 0]
+        if len(counts) > self.capacity:
+            # Summarize the batch on its own first (vectorized), then merge the
+            # at most ``capacity`` survivors; the decrement joins the error bound
+            values = counts.to_numpy()
+            threshold = int(np.partition(values, -(self.capacity + 1))[-(self.capacity + 1)])
+            self.total += int(values.sum())
+            self.error_bound += threshold
+            counts = counts[values > threshold] - threshold
+            self.total -= int(counts.sum())
+        return self.update_counts(counts.items())
+
+    def update_counts(self, items: Iterable[Tuple[Any, int]]) -> 'MisraGries':
+        """Add (value, count) pairs, e.g. the value counts of one batch"""
+        counts = self.counts
+        for value, count in items:
+            count = int(count)
+            counts[value] = counts.get(value, 0) + count
+            self.total += count
+        self._reduce()
+        return self
+
+    def merge(self, other: 'MisraGries') -> 'MisraGries':
+        """Fold another summary into this one"""
+        self.update_counts(other.counts.items())
+        self.total += other.total - sum(other.counts.values())
+        self.error_bound += other.error_bound
+        return self
+
+    def _reduce(self) -> None:
+        if len(self.counts) <= self.capacity:
+            return
+        counts = np.fromiter(self.counts.values(), dtype=np.int64, count=len(self.counts))
+        threshold = int(np.partition(counts, -(self.capacity + 1))[-(self.capacity + 1)])
+        self.counts = {value: count - threshold for value, count in self.counts.items() if count > threshold}
+        self.error_bound += threshold
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[Any, int]]:
+        """Counters in descending order, ties in order of first appearance"""
+        ordered = sorted(self.counts.items(), key=lambda item: -item[1])
+        return ordered if n is None else ordered[:n]
+
+    def value_counts(self, n: Optional[int] = None) -> pd.Series:
+        """Top counters as a Series shaped like ``Series.value_counts()``"""
+        top = self.top(n)
+        return pd.Series([count for _, count in top], index=pd.Index([value for value, _ in top], dtype=object),
+                         dtype=np.int64)
+
+    def mode(self) -> Optional[Any]:
+        """Most frequent value, the smallest one on ties (as ``Series.mode``)"""
+        if not self.counts:
+            return None
+        top = max(self.counts.values())
+        tied = [value for value, count in self.counts.items() if count == top]
+        try:
+            tied = sorted(tied)
+        except TypeError:
+            pass
+        return tied[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'capacity': self.capacity,
+            'total': self.total,
+            'error_bound': self.error_bound,
+            'counts': [[_to_builtin(value), count] for value, count in self.counts.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MisraGries':
+        summary = cls(data['capacity'])
+        summary.total = data['total']
+        summary.error_bound = data['error_bound']
+        summary.counts = {value: count for value, count in data['counts']}
+        return summary
+
+
+def _to_builtin(value: Any) -> Any:
+    """Convert NumPy scalars to plain Python values for serialization"""
+    return value.item() if isinstance(value, np.generic) else value
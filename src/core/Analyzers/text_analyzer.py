@@ -0,0 +1,39 @@
+import os
+import sys
+from typing import Any, Dict
+import numpy as np
+import pandas as pd
+# Adjust system path for module imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from classes.data_classes import ColumnAnalysis, ColumnType
+from core.Analyzers.binning import histogram_payload
+from core.Analyzers.categorical_analyzer import CategoricalAnalyzer
+
+
+class TextAnalyzer(CategoricalAnalyzer):
+    """Analyzer for free-text columns (long, mostly distinct strings)"""
+    
+    column_type = ColumnType.TEXT
+    
+    def can_analyze(self, series: pd.Series) -> bool:
+        return pd.api.types.is_string_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype)
+    
+    def analyze(self, series: pd.Series) -> ColumnAnalysis:
+        analysis = super().analyze(series)
+        lengths = series.dropna().astype(str).str.len()
+        if len(lengths):
+            analysis.statistics['avg_length'] = round(float(lengths.mean()), 2)
+            analysis.statistics['min_length'] = int(lengths.min())
+            analysis.statistics['max_length'] = int(lengths.max())
+            analysis.insights.append(f"Free text (average {analysis.statistics['avg_length']:.0f} characters)")
+        analysis.visualization = self.length_histogram(lengths)
+        return analysis
+    
+    @staticmethod
+    def length_histogram(lengths: pd.Series) -> Dict[str, Any]:
+        """Histogram payload of string lengths"""
+        bins = max(1, min(50, int(lengths.nunique())))
+        return histogram_payload(lengths.to_numpy(dtype=np.float64), bins, kind='text')
+    
+    def get_visualization_data(self, series: pd.Series) -> Dict[str, Any]:
+        return self.length_histogram(series.dropna().astype(str).str.len())
@@ -0,0 +1,226 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from classes.data_classes import ColumnAnalysis
+from core.Analyzers.binning import histogram_edges, numeric_payload, sorted_histogram
+from core.Analyzers.numerical_analyzer import NumericAnalyzer
+
+# Integers beyond this magnitude are not all representable as float64
+FLOAT64_EXACT_INT = 2 ** 53
+
+
+class VectorizedNumericEngine:
+    """Batched profiler for numeric columns.
+
+    Stacks numeric columns into one 2-D float64 block (one row per column) and
+    computes null counts, moments, extrema, quantiles, distinct counts and IQR
+    outliers for the whole block in a handful of vectorized passes. The
+    formulas mirror pandas' nanops so results match ``NumericAnalyzer``.
+    Integer columns with values beyond 2**53 would collapse in the float64
+    block, so they go through ``NumericAnalyzer`` one at a time.
+    """
+
+    def __init__(self, analyzer: NumericAnalyzer = None, max_block_mb: float = 256.0):
+        self.analyzer = analyzer or NumericAnalyzer()
+        self.max_block_mb = max_block_mb
+
+    def analyze(self, df: pd.DataFrame, columns: Optional[Sequence[Any]] = None) -> List[ColumnAnalysis]:
+        """Analyze numeric ``columns`` of ``df`` (default: all), in column order"""
+        columns = list(df.columns if columns is None else columns)
+        row_count = len(df)
+        if row_count == 0:
+            return [self.analyzer.analyze(df[col]) for col in columns]
+
+        wide = {col for col in columns if not fits_float64(df[col])}
+        blocked = [col for col in columns if col not in wide]
+
+        # Each block needs the values, a sorted copy and a few boolean masks
+        bytes_per_column = row_count * 8 * 3
+        columns_per_block = max(1, int(self.max_block_mb * 1024 * 1024 // bytes_per_column))
+
+        by_column = {col: self.analyzer.analyze(df[col]) for col in wide}
+        for start in range(0, len(blocked), columns_per_block):
+            block_columns = blocked[start:start + columns_per_block]
+            by_column.update(zip(block_columns, self._analyze_block(df, block_columns)))
+        return [by_column[col] for col in columns]
+
+    def _analyze_block(self, df: pd.DataFrame, columns: List[Any]) -> List[ColumnAnalysis]:
+        row_count = len(df)
+        block = np.empty((len(columns), row_count), dtype=np.float64)
+        for i, col in enumerate(columns):
+            block[i] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        stats = self.compute_statistics(block)
+
+        analyses = []
+        for i, col in enumerate(columns):
+            column_stats = {key: float(values[i]) for key, values in stats.items()
+                            if key not in ('missing_count', 'unique_count', 'outlier_count', 'histograms')}
+            column_stats['outlier_count'] = int(stats['outlier_count'][i])
+            analysis = self.analyzer.build_analysis(
+                name=col,
+                stats=column_stats,
+                unique_count=int(stats['unique_count'][i]),
+                missing_count=int(stats['missing_count'][i]),
+                row_count=row_count
+            )
+            analysis.visualization = numeric_payload(*stats['histograms'][i])
+            analyses.append(analysis)
+        return analyses
+
+    @staticmethod
+    def compute_statistics(block: np.ndarray) -> Dict[str, np.ndarray]:
+        """Compute per-row statistics of a (columns x rows) float64 block"""
+        n_cols, n_rows = block.shape
+        mask = np.isnan(block)
+        missing = mask.sum(axis=1)
+        count = (n_rows - missing).astype(np.float64)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # Moments (two-pass, as in pandas.core.nanops)
+            filled = np.where(mask, 0.0, block)
+            mean = filled.sum(axis=1, dtype=np.float64) / count
+            adjusted = filled - mean[:, None]
+            adjusted[mask] = 0.0
+            adjusted2 = adjusted ** 2
+            m2 = adjusted2.sum(axis=1, dtype=np.float64)
+            m3 = (adjusted2 * adjusted).sum(axis=1, dtype=np.float64)
+            m4 = (adjusted2 ** 2).sum(axis=1, dtype=np.float64)
+            del filled, adjusted, adjusted2
+        std, skew, kurt = shape_statistics(count, m2, m3, m4)
+
+        # One sort per column yields extrema, quantiles and distinct counts;
+        # NaNs sort to the end so the valid values occupy [0, count)
+        ordered = np.sort(block, axis=1)
+        valid = count > 0
+        n_valid = (n_rows - missing).astype(np.intp)
+        rows = np.arange(n_cols)
+        last = np.maximum(n_valid - 1, 0)
+
+        minimum = np.where(valid, ordered[:, 0], np.nan)
+        maximum = np.where(valid, ordered[rows, last], np.nan)
+        q25 = linear_quantile(ordered, n_valid, 0.25)
+        q75 = linear_quantile(ordered, n_valid, 0.75)
+        median = _median(ordered, n_valid)
+
+        if n_rows > 1:
+            changes = ordered[:, 1:] != ordered[:, :-1]
+            changes &= np.arange(n_rows - 1)[None, :] < (n_valid - 1)[:, None]
+            unique = changes.sum(axis=1) + valid
+        else:
+            unique = valid.astype(np.intp)
+        histograms = [_histogram(ordered[i, :n_valid[i]], NumericAnalyzer.histogram_bins(unique[i]))
+                      for i in range(n_cols)]
+        del ordered
+
+        # IQR outliers; NaN bounds (all-missing columns) flag nothing
+        iqr = q75 - q25
+        lower = q25 - 1.5 * iqr
+        upper = q75 + 1.5 * iqr
+        with np.errstate(invalid='ignore'):
+            outliers = ((block < lower[:, None]) | (block > upper[:, None])).sum(axis=1)
+
+        return {
+            'mean': mean,
+            'median': median,
+            'std': std,
+            'min': minimum,
+            'max': maximum,
+            'q25': q25,
+            'q75': q75,
+            'skewness': skew,
+            'kurtosis': kurt,
+            'missing_count': missing,
+            'unique_count': unique,
+            'outlier_count': outliers,
+            'histograms': histograms,
+        }
+
+
+def fits_float64(series: pd.Series) -> bool:
+    """Whether every value of ``series`` survives a cast to float64 unchanged"""
+    if not pd.api.types.is_integer_dtype(series.dtype) or len(series) == 0:
+        return True
+    low, high = series.min(), series.max()
+    if pd.isna(low):
+        return True
+    return -FLOAT64_EXACT_INT <= int(low) and int(high) <= FLOAT64_EXACT_INT
+
+
+def _histogram(ordered: np.ndarray, bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(edges, counts) over the finite part of sorted values, as ``np.histogram`` bins them"""
+    start = np.searchsorted(ordered, -np.inf, side='right')
+    stop = np.searchsorted(ordered, np.inf, side='left')
+    finite = ordered[start:stop]
+    if len(finite) == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+    edges = histogram_edges(float(finite[0]), float(finite[-1]), bins)
+    return edges, sorted_histogram(finite, edges)
+
+
+def shape_statistics(count: np.ndarray, m2: np.ndarray, m3: np.ndarray,
+                     m4: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sample std, skewness and excess kurtosis from central moment sums.
+
+    ``m2``, ``m3`` and ``m4`` are sums of squared, cubed and fourth-power
+    deviations from the mean; the bias corrections follow pandas.
+    """
+    count = np.asarray(count, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ddof_count = np.where(count > 1, count - 1, np.nan)
+        std = np.sqrt(m2 / ddof_count)
+
+        m2_skew = _zero_out_fperr(m2)
+        m3 = _zero_out_fperr(m3)
+        skew = (count * (count - 1) ** 0.5 / (count - 2)) * (m3 / m2_skew ** 1.5)
+        skew = np.where(m2_skew == 0, 0.0, skew)
+        skew = np.where(count < 3, np.nan, skew)
+
+        adj = 3 * (count - 1) ** 2 / ((count - 2) * (count - 3))
+        numerator = _zero_out_fperr(count * (count + 1) * (count - 1) * m4)
+        denominator = _zero_out_fperr((count - 2) * (count - 3) * m2 ** 2)
+        kurt = numerator / denominator - adj
+        kurt = np.where(denominator == 0, 0.0, kurt)
+        kurt = np.where(count < 4, np.nan, kurt)
+    return std, skew, kurt
+
+
+def _zero_out_fperr(values: np.ndarray) -> np.ndarray:
+    """Treat tiny accumulated floating point error as zero (pandas GH18044)"""
+    return np.where(np.abs(values) < 1e-14, 0, values)
+
+
+def linear_quantile(ordered: np.ndarray, n_valid: np.ndarray, q: float) -> np.ndarray:
+    """Linear-interpolated quantile of each sorted row, matching numpy.percentile"""
+    rows = np.arange(ordered.shape[0])
+    virtual = (n_valid - 1) * q
+    previous = np.floor(virtual)
+    gamma = virtual - previous
+    previous = previous.astype(np.intp)
+    upper = np.minimum(previous + 1, np.maximum(n_valid - 1, 0))
+    previous = np.clip(previous, 0, None)
+
+    a = ordered[rows, previous]
+    b = ordered[rows, upper]
+    diff = b - a
+    result = a + diff * gamma
+    high = gamma >= 0.5
+    result[high] = b[high] - diff[high] * (1 - gamma[high])
+    result[n_valid == 0] = np.nan
+    return result
+
+
+def _median(ordered: np.ndarray, n_valid: np.ndarray) -> np.ndarray:
+    """Median of each sorted row, matching numpy.median"""
+    rows = np.arange(ordered.shape[0])
+    upper = n_valid // 2
+    lower = np.where(n_valid % 2 == 0, upper - 1, upper)
+    upper = np.minimum(upper, np.maximum(n_valid - 1, 0))
+    lower = np.clip(lower, 0, None)
+    with np.errstate(over='ignore'):
+        result = np.where(lower == upper, ordered[rows, upper],
+                          (ordered[rows, lower] + ordered[rows, upper]) / 2)
+    result[n_valid == 0] = np.nan
+    return result
@@ -0,0 +1,103 @@
+from typing import Any, List, Optional
+
+import pandas as pd
+
+from classes.data_classes import ColumnAnalysis, DataQualityReport, DatasetMetadata
+from core.EDA.dataset_profile import DatasetProfile
+from core.EDA.eda_service import EDAService
+
+
+class ProfiledEDAService(EDAService):
+    """EDA service answering every query from a ``DatasetProfile``.
+
+    Use it as the reducer of a partitioned run: merge the partition profiles
+    and wrap the result, no raw rows needed. Statistics that are estimated
+    are listed in ``ColumnAnalysis.approximate_statistics`` and
+    ``DataQualityReport.approximate_fields``.
+    """
+
+    def __init__(self, profile: Optional[DatasetProfile] = None, top_k_capacity: Optional[int] = None):
+        super().__init__(None, top_k_capacity=top_k_capacity)
+        self.profile = profile
+
+    def get_metadata(self) -> DatasetMetadata:
+        self._ensure_profiled()
+        return super().get_metadata()
+
+    def get_quality_report(self) -> DataQualityReport:
+        self._ensure_profiled()
+        return super().get_quality_report()
+
+    def analyze_columns(self, exact: bool = False) -> List[ColumnAnalysis]:
+        self._ensure_profiled()
+        return super().analyze_columns(exact)
+
+    def analyze_column(self, column: Any, exact: bool = False) -> ColumnAnalysis:
+        self._ensure_profiled()
+        return super().analyze_column(column, exact)
+    
+    def get_correlation_matrix(self) -> Optional[pd.DataFrame]:
+        self._ensure_profiled()
+        return self._correlation_matrix
+
+    def _ensure_profiled(self) -> None:
+        if self._metadata is None:
+            if self.profile is None:
+                self.profile = self._build_profile()
+            self._metadata = self.profile.metadata()
+            self._quality_report = self.profile.quality_report()
+            self._column_analyses = self.profile.column_analyses()
+            self._correlation_matrix = self.profile.correlation_matrix()
+
+    def _build_profile(self) -> DatasetProfile:
+        raise ValueError("No dataset profile to report on")
+
+
+class ChunkedEDAService(ProfiledEDAService):
+    """EDA service that profiles a CSV file in one streaming pass.
+
+    The file is read ``chunksize`` rows at a time and each chunk is folded into
+    a ``DatasetProfile``, so peak memory is bounded by the chunk size rather
+    than the file size (duplicate detection additionally keeps one 8-byte
+    fingerprint per row, spilled to disk past 256 MB). Column types are fixed
+    by the first chunk in which the column has a value; a column that turns
+    out to mix numbers and strings is re-read as text in a fresh pass, as a
+    full load would type it. Categorical frequencies are tracked with
+    ``top_k_capacity`` counters (1000 by default).
+    """
+
+    def __init__(self, csv_path: str, chunksize: int = 100_000, top_k_capacity: Optional[int] = None,
+                 **read_csv_kwargs: Any):
+        super().__init__(top_k_capacity=top_k_capacity)
+        self.csv_path = csv_path
+        self.chunksize = chunksize
+        self.read_csv_kwargs = read_csv_kwargs
+
+    def _build_profile(self) -> DatasetProfile:
+        """Stream the file into a profile, restarting when a column proves mixed"""
+        text_columns: List[Any] = []
+        while True:
+            mixed = []
+            profile = DatasetProfile(keep_row_hashes=True)
+            kwargs = self._read_kwargs(text_columns)
+            with pd.read_csv(self.csv_path, chunksize=self.chunksize, **kwargs) as reader:
+                for chunk in reader:
+                    profile.update(chunk, self.factory)
+                    mixed = profile.mixed_columns()
+                    if mixed:
+                        break
+            if not mixed:
+                break
+            text_columns += mixed
+        if not profile.columns:
+            # Header-only file
+            profile.update(pd.read_csv(self.csv_path, nrows=0, **kwargs), self.factory)
+        return profile
+
+    def _read_kwargs(self, text_columns: List[Any]) -> dict:
+        """``read_csv`` arguments with ``text_columns`` read as strings"""
+        kwargs = dict(self.read_csv_kwargs)
+        dtype = kwargs.get('dtype')
+        if text_columns and (dtype is None or isinstance(dtype, dict)):
+            kwargs['dtype'] = {**(dtype or {}), **{col: str for col in text_columns}}
+        return kwargs
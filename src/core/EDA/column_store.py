@@ -0,0 +1,266 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from classes.data_classes import ColumnType
+from core.Analyzers.factory_analyzer import AnalyzerFactory
+
+STORE_VERSION = 1
+
+DEFAULT_STORE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'eda_agent', 'stores')
+
+SCHEMA_FILE = 'schema.json'
+
+
+class ColumnStore:
+    """Parsed dataset saved as one memory-mapped file per column.
+
+    Numeric, boolean, datetime and timedelta columns are raw ``.npy`` arrays
+    (nullable extension types add a mask array); object, string and
+    categorical columns are dictionary-encoded as integer codes plus a
+    value table. ``schema.json`` records labels, dtypes, encodings, the
+    index and the source fingerprint, so ``open`` only parses that file.
+    ``read`` wraps the memory maps without copying: the OS pages a numeric
+    column in when an analysis first touches it. Object columns the
+    analyzers route as categories come back as ``category`` columns over
+    the stored codes (value counts and analyses are unchanged, see
+    ``optimize_dtypes``); text and boolean-like columns are decoded with one
+    vectorized take so their routing is kept. Maps are copy-on-write, so
+    the frame can be edited without touching the files. Value tables are
+    pickles, so only open stores from a directory you trust.
+    """
+
+    def __init__(self, directory: str, schema: Dict[str, Any]):
+        self.directory = directory
+        self.schema = schema
+        self._entries = {self._key(entry['name']): entry for entry in schema['columns']}
+
+    @property
+    def columns(self) -> List[Any]:
+        return [entry['name'] for entry in self.schema['columns']]
+
+    @property
+    def dtypes(self) -> Dict[Any, str]:
+        return {entry['name']: entry['dtype'] for entry in self.schema['columns']}
+
+    @property
+    def row_count(self) -> int:
+        return self.schema['row_count']
+
+    @property
+    def fingerprint(self) -> Optional[str]:
+        return self.schema.get('fingerprint')
+
+    @classmethod
+    def open(cls, directory: str) -> 'ColumnStore':
+        with open(os.path.join(directory, SCHEMA_FILE), encoding='utf-8') as f:
+            schema = json.load(f)
+        if schema.get('version') != STORE_VERSION:
+            raise ValueError(f"Column store version {schema.get('version')} is not supported")
+        return cls(directory, schema)
+
+    @classmethod
+    def write(cls, df: pd.DataFrame, directory: str, fingerprint: Optional[str] = None) -> 'ColumnStore':
+        """Store ``df`` in ``directory``, replacing any previous store atomically"""
+        if not df.columns.is_unique:
+            raise ValueError("Cannot store a DataFrame with duplicate column labels")
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=parent, prefix='.store-')
+        try:
+            columns = [_write_column(staging, f"col-{i:05d}", name, df.iloc[:, i])
+                       for i, name in enumerate(df.columns)]
+            schema = {
+                'version': STORE_VERSION,
+                'fingerprint': fingerprint,
+                'row_count': len(df),
+                'index': _write_index(staging, df.index),
+                'columns': columns,
+            }
+            with open(os.path.join(staging, SCHEMA_FILE), 'w', encoding='utf-8') as f:
+                json.dump(schema, f)
+            if os.path.isdir(directory):
+                shutil.rmtree(directory)
+            os.replace(staging, directory)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return cls(directory, schema)
+
+    def column(self, name: Any) -> pd.Series:
+        """One column as a Series backed by the memory map where possible"""
+        entry = self._entries.get(self._key(name))
+        if entry is None:
+            raise KeyError(f"Column '{name}' is not in the store")
+        return pd.Series(self._read_values(entry), index=self._index(), name=entry['name'], copy=False)
+
+    def read(self, columns: Optional[Sequence[Any]] = None) -> pd.DataFrame:
+        """DataFrame of ``columns`` (default: all); untouched columns are never read"""
+        names = self.columns if columns is None else list(columns)
+        data = {name: self.column(name) for name in names}
+        return pd.DataFrame(data, index=self._index(), columns=names, copy=False)
+
+    def _index(self) -> pd.Index:
+        index = self.schema['index']
+        if index['encoding'] == 'range':
+            return pd.RangeIndex(index['start'], index['stop'], index['step'], name=index['name'])
+        return pd.Index(self._read_values(index), name=index['name'])
+
+    def _read_values(self, entry: Dict[str, Any]):
+        def path(key: str) -> str:
+            return os.path.join(self.directory, entry['files'][key])
+
+        encoding = entry['encoding']
+        if encoding == 'numpy':
+            return _map(path('values'))
+        if encoding == 'datetime_tz':
+            values = _map(path('values'))
+            return pd.DatetimeIndex(values).tz_localize('UTC').tz_convert(entry['tz']).array
+        if encoding == 'masked':
+            dtype = pd.api.types.pandas_dtype(entry['dtype'])
+            values = _map(path('values'))
+            mask = _map(path('mask'))
+            return dtype.construct_array_type()(values, mask, copy=False)
+
+        codes = _map(path('codes'))
+        with open(path('table'), 'rb') as f:
+            table = pickle.load(f)
+        if encoding == 'categorical':
+            dtype = pd.CategoricalDtype(table, ordered=entry['ordered'])
+            return pd.Categorical.from_codes(codes, dtype=dtype)
+        # Code -1 marks a missing value and picks the trailing NaN
+        values = np.append(np.asarray(table, dtype=object), np.nan)
+        if entry['dtype'] == 'object' and _routes_to_category(codes, values):
+            # Categories in order of first appearance, as the table was factorized
+            return pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(pd.Index(table, dtype=object)))
+        decoded = values[codes]
+        if entry['dtype'] != 'object':
+            return pd.array(decoded, dtype=entry['dtype'])
+        return decoded
+
+    @staticmethod
+    def _key(name: Any) -> str:
+        return json.dumps(name)
+
+
+def _map(path: str) -> np.ndarray:
+    """Copy-on-write memory map of a .npy file as a plain ndarray view"""
+    return np.load(path, mmap_mode='c').view(np.ndarray)
+
+
+def _routes_to_category(codes: np.ndarray, values: np.ndarray) -> bool:
+    """Whether the decoded column would go to the categorical analyzer, from the values its probe reads"""
+    factory = AnalyzerFactory()
+    step = max(1, len(codes) // factory.probe_size)
+    probe = pd.Series(values[codes[::step][:factory.probe_size]], dtype=object)
+    return factory.classify(probe) == ColumnType.CATEGORICAL
+
+
+def _write_column(directory: str, stem: str, name: Any, series: pd.Series) -> Dict[str, Any]:
+    try:
+        json.dumps(name)
+    except TypeError as e:
+        raise ValueError(f"Column label {name!r} cannot be stored in the schema") from e
+    entry = _write_values(directory, stem, series)
+    entry['name'] = name
+    return entry
+
+
+def _write_index(directory: str, index: pd.Index) -> Dict[str, Any]:
+    if isinstance(index, pd.RangeIndex):
+        return {'encoding': 'range', 'start': index.start, 'stop': index.stop, 'step': index.step,
+                'name': index.name}
+    entry = _write_values(directory, 'index', pd.Series(index))
+    entry['name'] = index.name
+    return entry
+
+
+def _write_values(directory: str, stem: str, series: pd.Series) -> Dict[str, Any]:
+    dtype = series.dtype
+    entry: Dict[str, Any] = {'dtype': str(dtype), 'files': {}}
+
+    def save(key: str, array: np.ndarray) -> None:
+        filename = f"{stem}.{key}.npy"
+        np.save(os.path.join(directory, filename), np.ascontiguousarray(array), allow_pickle=False)
+        entry['files'][key] = filename
+
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        entry.update(encoding='datetime_tz', tz=str(dtype.tz))
+        save('values', series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy())
+    elif isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+        entry['encoding'] = 'numpy'
+        save('values', series.to_numpy())
+    elif isinstance(series.array, pd.api.extensions.ExtensionArray) and hasattr(series.array, '_mask'):
+        # Int64, Float64, boolean: raw values plus the missing mask
+        entry['encoding'] = 'masked'
+        save('values', series.array._data)
+        save('mask', series.array._mask)
+    else:
+        if isinstance(dtype, pd.CategoricalDtype):
+            entry.update(encoding='categorical', ordered=bool(dtype.ordered))
+            codes, table = series.cat.codes.to_numpy(), list(dtype.categories)
+        else:
+            entry['encoding'] = 'dictionary'
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            table = list(np.asarray(uniques, dtype=object))
+        save('codes', codes.astype(np.int32 if len(table) < 2 ** 31 else np.int64))
+        filename = f"{stem}.table.pkl"
+        with open(os.path.join(directory, filename), 'wb') as f:
+            pickle.dump(table, f, protocol=pickle.HIGHEST_PROTOCOL)
+        entry['files']['table'] = filename
+    return entry
+
+
+class ColumnStoreCache:
+    """Column stores keyed by source fingerprint, capped in size with LRU eviction"""
+
+    def __init__(self, directory: str = DEFAULT_STORE_DIR, max_bytes: int = 20 * 1024 ** 3):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self.directory, fingerprint)
+
+    def get(self, fingerprint: str) -> Optional[ColumnStore]:
+        """Store built from a source with this fingerprint, or None"""
+        path = self._path(fingerprint)
+        try:
+            store = ColumnStore.open(path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Half-written or from an incompatible version
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        if store.fingerprint != fingerprint:
+            return None
+        os.utime(os.path.join(path, SCHEMA_FILE))
+        return store
+
+    def put(self, df: pd.DataFrame, fingerprint: str) -> ColumnStore:
+        """Store ``df`` under ``fingerprint`` and evict down to the size cap"""
+        store = ColumnStore.write(df, self._path(fingerprint), fingerprint)
+        self._evict(keep=fingerprint)
+        return store
+
+    def _evict(self, keep: str) -> None:
+        entries = []
+        for entry in os.scandir(self.directory):
+            schema = os.path.join(entry.path, SCHEMA_FILE)
+            if not entry.is_dir() or not os.path.exists(schema):
+                continue
+            size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file())
+            entries.append((os.stat(schema).st_mtime_ns, size, entry.name, entry.path))
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, name, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name != keep:
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
@@ -0,0 +1,152 @@
+import os
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+# File extension -> format
+FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'ipc',
+    '.ipc': 'ipc',
+}
+ARROW_FORMATS = ('parquet', 'feather', 'ipc')
+
+Source = Union[str, os.PathLike, BinaryIO]
+
+
+def detect_format(source: Source, name: Optional[str] = None) -> str:
+    """Format of a path or uploaded file from its (or ``name``'s) extension; unknown ones are CSV"""
+    name = name or getattr(source, 'name', None) or os.fspath(source)
+    return FORMATS.get(os.path.splitext(str(name))[1].lower(), 'csv')
+
+
+def load_dataset(source: Source, columns: Optional[Sequence[str]] = None, file_format: Optional[str] = None,
+                 **read_csv_kwargs: Any) -> pd.DataFrame:
+    """Read a CSV, Parquet, Feather or Arrow IPC file, keeping only ``columns``"""
+    file_format = file_format or detect_format(source)
+    if file_format == 'csv':
+        if columns is not None:
+            read_csv_kwargs['usecols'] = list(columns)
+        return pd.read_csv(source, **read_csv_kwargs)
+    return ArrowDataset(source, file_format).read(columns)
+
+
+def open_dataset(source: Source, file_format: Optional[str] = None) -> Optional['ArrowDataset']:
+    """Arrow handle on a columnar file, or None for CSV"""
+    file_format = file_format or detect_format(source)
+    return None if file_format == 'csv' else ArrowDataset(source, file_format)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Reading Parquet/Feather/Arrow files requires pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def _missing_count(values) -> int:
+    """Nulls plus NaNs of an Arrow column"""
+    import pyarrow.compute as pc
+    missing = values.null_count
+    if _pyarrow().types.is_floating(values.type):
+        missing += pc.sum(pc.is_nan(values)).as_py() or 0
+    return missing
+
+
+class ArrowDataset:
+    """Lazy handle on a Parquet, Feather or Arrow IPC file.
+
+    Parquet files are opened by their footer and Feather/IPC files are
+    memory-mapped, so nothing is decoded up front. ``read`` decodes only the
+    requested columns with Arrow's thread pool and converts them to pandas
+    once. ``null_counts`` answers from Parquet row-group statistics where
+    every row group carries them, and otherwise from Arrow compute kernels
+    over that single column, never building pandas object columns.
+    """
+
+    def __init__(self, source: Source, file_format: Optional[str] = None):
+        self.source = source
+        self.format = file_format or detect_format(source)
+        if self.format not in ARROW_FORMATS:
+            raise ValueError(f"ArrowDataset reads {ARROW_FORMATS}, not '{self.format}'")
+        _pyarrow()
+        if self.format == 'parquet':
+            import pyarrow.parquet as pq
+            self._parquet = pq.ParquetFile(source)
+            self.schema = self._parquet.schema_arrow
+            self.row_count = self._parquet.metadata.num_rows
+        else:
+            import pyarrow.feather as feather
+            self._parquet = None
+            # Feather v2 is the IPC file format; memory-mapping keeps uncompressed reads zero-copy
+            self._table = feather.read_table(source, memory_map=isinstance(source, (str, os.PathLike)))
+            self.schema = self._table.schema
+            self.row_count = self._table.num_rows
+
+    @property
+    def columns(self) -> List[str]:
+        """Data columns, without index columns stored by pandas"""
+        index_columns = (self.schema.pandas_metadata or {}).get('index_columns', [])
+        return [name for name in self.schema.names if name not in index_columns]
+
+    def read_table(self, columns: Optional[Sequence[str]] = None, use_pandas_metadata: bool = False):
+        """Arrow table of ``columns`` (default: all)"""
+        columns = None if columns is None else list(columns)
+        self._check_columns(columns)
+        if self._parquet is not None:
+            return self._parquet.read(columns=columns, use_threads=True, use_pandas_metadata=use_pandas_metadata)
+        if columns is None:
+            return self._table
+        index_columns = [name for name in (self.schema.pandas_metadata or {}).get('index_columns', [])
+                         if isinstance(name, str) and use_pandas_metadata]
+        return self._table.select(columns + index_columns)
+
+    def read(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """pandas frame of ``columns`` (default: all)"""
+        return self.read_table(columns, use_pandas_metadata=True).to_pandas(use_threads=True)
+
+    def null_counts(self, columns: Optional[Sequence[str]] = None) -> Dict[str, int]:
+        """Missing values per column as pandas counts them (nulls plus float NaNs).
+
+        Free for Parquet columns whose statistics cover every row group.
+        """
+        counts = {}
+        for column in columns or self.columns:
+            null_count = self._footer_null_count(column)
+            if null_count is None:
+                null_count = _missing_count(self.read_table([column]).column(0))
+            counts[column] = null_count
+        return counts
+
+    def _footer_null_count(self, column: str) -> Optional[int]:
+        """Null count from Parquet row-group statistics.
+
+        None unless every row group carries a null count for the column.
+        """
+        if self._parquet is None:
+            return None
+        metadata = self._parquet.metadata
+        names = self._parquet.schema.names
+        if column not in names:
+            return None
+        index = names.index(column)
+        if _pyarrow().types.is_floating(self.schema.field(column).type):
+            # NaNs are values to Parquet but missing to pandas; the footer does not count them
+            return None
+
+        null_count = 0
+        for i in range(metadata.num_row_groups):
+            stats = metadata.row_group(i).column(index).statistics
+            if stats is None or not stats.has_null_count:
+                return None
+            null_count += stats.null_count
+        return null_count
+
+    def _check_columns(self, columns: Optional[Sequence[str]]) -> None:
+        missing = [col for col in columns or [] if col not in self.columns]
+        if missing:
+            raise ValueError(f"Columns not found: {', '.join(map(str, missing))}")
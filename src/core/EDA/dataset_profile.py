@@ -0,0 +1,262 @@
+import base64
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from classes.data_classes import ColumnAnalysis, DataQualityReport, DatasetMetadata
+from core.Analyzers.accumulators import ColumnProfile, CorrelationAccumulator, NullAccumulator, NumericAccumulator
+from core.Analyzers.factory_analyzer import AnalyzerFactory
+from core.Analyzers.sketches import HyperLogLog
+from core.EDA.duplicates import DuplicateDetector, collision_probability, hash_rows
+
+
+class DatasetProfile:
+    """Mergeable partial profile of a whole dataset.
+
+    Holds one ``ColumnProfile`` per column, the numeric co-moment sums for
+    correlations and the 64-bit fingerprint of every row. Partitions (chunks,
+    files, shards on other machines) are profiled independently with
+    ``from_frame`` or ``update``, shipped as ``to_json`` and combined with
+    ``merge``; no raw rows cross partition boundaries. Fingerprints are kept
+    in a ``DuplicateDetector`` (spilling to disk past its memory budget) and
+    travel with the profile, so duplicates across partitions are counted
+    exactly. With ``keep_row_hashes=False`` the profile stays small and
+    duplicates are estimated from a HyperLogLog of the fingerprints, which
+    is only useful when they are a large share of the rows.
+    """
+
+    def __init__(self, keep_row_hashes: bool = True):
+        self.row_count = 0
+        self.memory_bytes = 0
+        self.columns: List[Any] = []
+        self.dtypes: Dict[Any, np.dtype] = {}
+        self.column_profiles: Dict[Any, ColumnProfile] = {}
+        self.correlations: Optional[CorrelationAccumulator] = None
+        self.distinct_rows = HyperLogLog()
+        self.keep_row_hashes = keep_row_hashes
+        self.row_hashes: Optional[DuplicateDetector] = DuplicateDetector() if keep_row_hashes else None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, factory: Optional[AnalyzerFactory] = None,
+                   keep_row_hashes: bool = True) -> 'DatasetProfile':
+        """Profile one partition"""
+        profile = cls(keep_row_hashes)
+        profile.update(df, factory)
+        return profile
+
+    def update(self, df: pd.DataFrame, factory: Optional[AnalyzerFactory] = None) -> 'DatasetProfile':
+        """Fold the rows of ``df`` into the profile.
+
+        A column's type is fixed by the first frame in which it has a value;
+        until then it is held by a ``NullAccumulator``.
+        """
+        if not df.columns.is_unique:
+            raise ValueError("Cannot profile a DataFrame with duplicate column labels")
+        factory = factory or AnalyzerFactory()
+        if not self.column_profiles:
+            self.columns = df.columns.tolist()
+            self.column_profiles = {col: _new_profile(df[col], factory) for col in self.columns}
+            # Untyped columns are tracked too: they contribute nothing until they hold numbers
+            self.correlations = CorrelationAccumulator(
+                [col for col in self.columns
+                 if isinstance(self.column_profiles[col], (NumericAccumulator, NullAccumulator))])
+        else:
+            if df.columns.tolist() != self.columns:
+                raise ValueError("Partition columns do not match the profile")
+            for col in self.columns:
+                profile = self.column_profiles[col]
+                if isinstance(profile, NullAccumulator) and df[col].notna().any():
+                    self.column_profiles[col] = profile.promote(_new_profile(df[col], factory))
+                else:
+                    profile.update(df[col])
+
+        self.row_count += len(df)
+        self.memory_bytes += int(df.memory_usage(deep=True, index=False).sum())
+        for col in self.columns:
+            self.dtypes[col] = _combine_dtypes(self.dtypes.get(col), df[col].dtype)
+
+        # Numeric columns are normalized so values hash identically across partitions
+        numeric_cols = self._numeric_columns()
+        normalized = df.copy()
+        for col in numeric_cols:
+            normalized[col] = pd.to_numeric(df[col], errors='coerce').astype(np.float64)
+        hashes = hash_rows(normalized)
+        self.distinct_rows.update_hashes(hashes)
+        if self.keep_row_hashes:
+            self.row_hashes.update_hashes(hashes)
+        if len(self.correlations.columns) > 1:
+            block = np.full((len(df), len(self.correlations.columns)), np.nan)
+            for i, col in enumerate(self.correlations.columns):
+                if col in numeric_cols:
+                    block[:, i] = normalized[col].to_numpy()
+            self.correlations.update(block)
+        return self
+
+    def _numeric_columns(self) -> List[Any]:
+        """Correlation columns currently typed as numeric"""
+        return [col for col in self.correlations.columns
+                if isinstance(self.column_profiles[col], NumericAccumulator)]
+
+    def mixed_columns(self) -> List[Any]:
+        """Columns typed as numeric that have since received non-numeric values"""
+        return [col for col in self.columns
+                if isinstance(self.column_profiles[col], NumericAccumulator)
+                and self.column_profiles[col].coerced_count]
+
+    def merge(self, other: 'DatasetProfile') -> 'DatasetProfile':
+        """Fold another partition's profile into this one (associative)"""
+        if not other.column_profiles:
+            self.row_count += other.row_count
+            return self
+        if not self.column_profiles:
+            self.columns = list(other.columns)
+            self.column_profiles = {col: ColumnProfile.from_dict(other.column_profiles[col].to_dict())
+                                    for col in other.columns}
+            self.correlations = CorrelationAccumulator.from_dict(other.correlations.to_dict())
+        else:
+            if other.columns != self.columns:
+                raise ValueError("Cannot merge profiles with different columns")
+            for col in self.columns:
+                self.column_profiles[col] = _merge_column(self.column_profiles[col], other.column_profiles[col])
+            # A column untyped on one side and typed as non-numeric on the other leaves the correlations
+            columns = [col for col in self.columns
+                       if isinstance(self.column_profiles[col], (NumericAccumulator, NullAccumulator))]
+            self.correlations = self.correlations.subset(columns).merge(other.correlations.subset(columns))
+
+        self.row_count += other.row_count
+        self.memory_bytes += other.memory_bytes
+        for col in self.columns:
+            self.dtypes[col] = _combine_dtypes(self.dtypes.get(col), other.dtypes[col])
+        self.distinct_rows.merge(other.distinct_rows)
+        if self.keep_row_hashes and other.keep_row_hashes:
+            self.row_hashes.merge(other.row_hashes)
+        else:
+            self.keep_row_hashes = False
+            self.row_hashes = None
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-compatible representation (8 bytes per row while fingerprints are kept)"""
+        return {
+            'row_count': self.row_count,
+            'memory_bytes': self.memory_bytes,
+            'columns': self.columns,
+            'dtypes': [str(self.dtypes[col]) for col in self.columns],
+            'column_profiles': [self.column_profiles[col].to_dict() for col in self.columns],
+            'correlations': None if self.correlations is None else self.correlations.to_dict(),
+            'distinct_rows': self.distinct_rows.to_dict(),
+            'row_hashes': (base64.b64encode(self.row_hashes.fingerprints().tobytes()).decode('ascii')
+                           if self.keep_row_hashes else None),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DatasetProfile':
+        profile = cls()
+        profile.row_count = data['row_count']
+        profile.memory_bytes = data['memory_bytes']
+        profile.columns = list(data['columns'])
+        profile.dtypes = {col: _parse_dtype(dtype) for col, dtype in zip(profile.columns, data['dtypes'])}
+        profile.column_profiles = {col: ColumnProfile.from_dict(column)
+                                   for col, column in zip(profile.columns, data['column_profiles'])}
+        if data['correlations'] is not None:
+            profile.correlations = CorrelationAccumulator.from_dict(data['correlations'])
+        profile.distinct_rows = HyperLogLog.from_dict(data['distinct_rows'])
+        if data.get('row_hashes') is None:
+            profile.keep_row_hashes = False
+            profile.row_hashes = None
+        else:
+            profile.row_hashes.update_hashes(np.frombuffer(base64.b64decode(data['row_hashes']), dtype=np.uint64))
+        return profile
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text: str) -> 'DatasetProfile':
+        return cls.from_dict(json.loads(text))
+
+    def metadata(self) -> DatasetMetadata:
+        memory_bytes = self.memory_bytes + pd.RangeIndex(self.row_count).memory_usage()
+        return DatasetMetadata(
+            shape=(self.row_count, len(self.columns)),
+            memory_usage_mb=round(memory_bytes / 1024 / 1024, 2),
+            column_count=len(self.columns),
+            row_count=self.row_count,
+            columns=self.columns,
+            dtypes={col: str(self.dtypes[col]) for col in self.columns}
+        )
+
+    def duplicate_rows(self) -> int:
+        """Duplicate row count from exact fingerprints when kept, else the sketch"""
+        if self.keep_row_hashes:
+            return self.row_hashes.report(top_n=0).duplicate_rows
+        distinct = min(int(round(self.distinct_rows.estimate())), self.row_count)
+        return self.row_count - distinct
+
+    def quality_report(self) -> DataQualityReport:
+        row_count = self.row_count
+        duplicates = self.duplicate_rows()
+        missing = {col: self.column_profiles[col].missing_count for col in self.columns}
+        return DataQualityReport(
+            missing_values={col: count for col, count in missing.items() if count > 0},
+            missing_percentages={col: round(count / row_count * 100, 2)
+                                 for col, count in missing.items() if count > 0},
+            duplicate_rows=duplicates,
+            duplicate_percentage=round(duplicates / row_count * 100, 2) if row_count else 0.0,
+            total_cells=row_count * len(self.columns),
+            missing_cells=sum(missing.values()),
+            duplicate_collision_probability=collision_probability(row_count, 64) if self.keep_row_hashes else 0.0,
+            approximate_fields=[] if self.keep_row_hashes else ['duplicate_rows', 'duplicate_percentage']
+        )
+
+    def column_analyses(self) -> List[ColumnAnalysis]:
+        return [self.column_profiles[col].to_analysis() for col in self.columns]
+
+    def correlation_matrix(self) -> Optional[pd.DataFrame]:
+        if self.correlations is None:
+            return None
+        # Columns that stayed empty read as all-NaN numeric; ones typed otherwise drop out
+        columns = [col for col in self.correlations.columns
+                   if isinstance(self.column_profiles[col], (NumericAccumulator, NullAccumulator))]
+        if len(columns) < 2:
+            return None
+        matrix = self.correlations.matrix()
+        return matrix if len(columns) == len(matrix) else matrix.loc[columns, columns]
+
+
+def _new_profile(series: pd.Series, factory: AnalyzerFactory) -> ColumnProfile:
+    """Profile typed by ``series``, or a placeholder while it only has missing values"""
+    if len(series) and not series.notna().any():
+        profile = NullAccumulator(series.name)
+        profile.update(series)
+        return profile
+    return factory.get_analyzer(series).profile(series)
+
+
+def _merge_column(mine: ColumnProfile, theirs: ColumnProfile) -> ColumnProfile:
+    """``mine`` merged with ``theirs``, typing an untyped side from the other"""
+    if isinstance(theirs, NullAccumulator) and not isinstance(mine, NullAccumulator):
+        return theirs.promote(mine)
+    if isinstance(mine, NullAccumulator) and not isinstance(theirs, NullAccumulator):
+        return mine.promote(ColumnProfile.from_dict(theirs.to_dict()))
+    return mine.merge(theirs)
+
+
+def _combine_dtypes(current: Optional[np.dtype], new: np.dtype) -> np.dtype:
+    """Dtype pandas would infer for a column whose partitions had these dtypes"""
+    if current is None or current == new:
+        return new
+    both_numeric = all(pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d)
+                       for d in (current, new))
+    if both_numeric:
+        return np.result_type(current, new)
+    return np.dtype(object)
+
+
+def _parse_dtype(name: str):
+    try:
+        return pd.api.types.pandas_dtype(name)
+    except TypeError:
+        return np.dtype(object)
@@ -0,0 +1,74 @@
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from classes.data_classes import ColumnType, DtypeOptimization
+from core.Analyzers.factory_analyzer import AnalyzerFactory
+
+
+def optimize_dtypes(df: pd.DataFrame, max_category_ratio: float = 0.5,
+                    factory: Optional[AnalyzerFactory] = None) -> Tuple[pd.DataFrame, DtypeOptimization]:
+    """Copy of ``df`` in the narrowest dtypes that hold every value exactly.
+
+    Integers get the smallest integer width that fits their range, float64
+    columns become float32 only when every value survives the round trip,
+    object columns of booleans without missing values become ``bool``, and
+    object columns routed to the categorical analyzer become
+    ``category`` when at most ``max_category_ratio`` of their rows are
+    distinct. Categories keep the order of first appearance so value counts
+    break ties exactly as on the object column, and text, boolean and
+    categorical routing is unchanged, so every analysis is identical.
+    """
+    factory = factory or AnalyzerFactory()
+    before = df.memory_usage(deep=True).sum()
+    columns = {}
+    conversions = {}
+    for i, name in enumerate(df.columns):
+        series = df.iloc[:, i]
+        optimized = _optimize_column(series, max_category_ratio, factory)
+        if optimized.dtype != series.dtype:
+            conversions[name] = (str(series.dtype), str(optimized.dtype))
+        columns[i] = optimized
+    result = pd.concat(columns, axis=1, copy=False) if columns else df.copy()
+    result.columns = df.columns
+    after = result.memory_usage(deep=True).sum()
+    return result, DtypeOptimization(round(float(before) / 1024 / 1024, 2), round(float(after) / 1024 / 1024, 2),
+                                    conversions)
+
+
+def _optimize_column(series: pd.Series, max_category_ratio: float, factory: AnalyzerFactory) -> pd.Series:
+    dtype = series.dtype
+    if not isinstance(dtype, np.dtype):
+        return series
+    if dtype.kind in 'iu':
+        return pd.to_numeric(series, downcast='integer' if dtype.kind == 'i' else 'unsigned')
+    if dtype == np.float64:
+        narrow = series.to_numpy().astype(np.float32)
+        if np.array_equal(narrow.astype(np.float64), series.to_numpy(), equal_nan=True):
+            return pd.Series(narrow, index=series.index, name=series.name, copy=False)
+        return series
+    if dtype != object:
+        return series
+
+    column_type = factory.classify(series)
+    if column_type == ColumnType.BOOLEAN:
+        # Routing looked at a sample; the conversion needs every value to be a boolean
+        # (with missing values the nullable dtype would report numpy bools as top values)
+        if series.notna().all() and pd.api.types.infer_dtype(series, skipna=False) == 'boolean':
+            return series.astype(bool)
+    elif column_type == ColumnType.CATEGORICAL:
+        return _to_category(series, max_category_ratio)
+    return series
+
+
+def _to_category(series: pd.Series, max_category_ratio: float) -> pd.Series:
+    try:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    except TypeError:
+        # Unhashable values (lists, dicts)
+        return series
+    if len(uniques) > max_category_ratio * len(series):
+        return series
+    values = pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(pd.Index(uniques, dtype=object)))
+    return pd.Series(values, index=series.index, name=series.name, copy=False)
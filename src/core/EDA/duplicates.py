@@ -0,0 +1,271 @@
+import heapq
+import numbers
+import os
+import shutil
+import tempfile
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from classes.data_classes import DuplicateGroup, DuplicateReport
+from core.Analyzers.sketches import normalize_for_hashing
+
+# pandas' default key plus an independent one for the upper 64 bits
+_HASH_KEYS = ('0123456789123456', 'a5c1e9f0b2d47e63')
+
+
+def hash_rows(df: pd.DataFrame, bits: int = 64) -> np.ndarray:
+    """Fingerprint each row from vectorized per-column hashes.
+
+    Returns a uint64 array of shape (rows,) for 64-bit fingerprints or
+    (rows, 2) for 128-bit ones. The index is not part of the fingerprint,
+    and neither is the dtype values are stored in.
+
+    Rows match as ``df.duplicated()`` would match them: 0.0 and -0.0 are
+    equal, and so are 1, 1.0 and True in an object column, while 1 and '1'
+    or None and NaN are told apart by the type of the value.
+    """
+    if bits not in (64, 128):
+        raise ValueError("Row fingerprints must be 64 or 128 bits")
+    df = _tag_object_types(normalize_for_hashing(df))
+    words = [pd.util.hash_pandas_object(df, index=False, hash_key=key).to_numpy(dtype=np.uint64)
+             for key in _HASH_KEYS[:bits // 64]]
+    return words[0] if bits == 64 else np.column_stack(words)
+
+
+def _tag_object_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Frame whose object columns are each followed by the type of their values.
+
+    Object columns are hashed by their string form, so values of different
+    types with the same text would collide. Numbers are first brought to one
+    form so values that compare equal (1, 1.0, True) still hash alike.
+    Columns holding only strings keep their values and get a constant
+    categorical tag, which hashes like the per-value one at little cost.
+    """
+    objects = [i for i in range(df.shape[1]) if df.dtypes.iloc[i] == object]
+    if not objects:
+        return df
+    columns = {}
+    for i in range(df.shape[1]):
+        values = df.iloc[:, i]
+        if i not in objects:
+            columns[i] = values
+        elif pd.api.types.infer_dtype(values, skipna=False) == 'string':
+            columns[(i, 'value')] = values
+            columns[(i, 'type')] = pd.Categorical.from_codes(np.zeros(len(values), dtype=np.int8), ['str'])
+        else:
+            columns[(i, 'value')] = values.map(_canonical_number)
+            columns[(i, 'type')] = values.map(_type_tag)
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def _canonical_number(value):
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        value = float(value)
+        return int(value) if value.is_integer() else value
+    return value
+
+
+def _type_tag(value) -> str:
+    return 'number' if isinstance(value, numbers.Real) else type(value).__name__
+
+
+def collision_probability(rows: int, bits: int) -> float:
+    """Birthday bound on the chance that any two distinct rows share a fingerprint"""
+    return min(1.0, rows * (rows - 1) / 2 / 2.0 ** bits)
+
+
+class DuplicateDetector:
+    """Streaming duplicate-row counter over row fingerprints.
+
+    Feed frames with ``update`` (one frame or many chunks) and call
+    ``report``. Fingerprints are kept in memory, and counted with a hash
+    set, until they exceed ``max_memory_mb``. Past that they are spilled to
+    ``partitions`` files by their leading bits. Each file is then sorted and
+    counted on its own, so peak memory stays at about one partition.
+    ``track_groups`` also records row positions, so the most duplicated
+    row groups can be reported.
+    """
+
+    def __init__(self, bits: int = 64, max_memory_mb: float = 256.0, spill_dir: Optional[str] = None,
+                 track_groups: bool = False, partitions: int = 64):
+        if bits not in (64, 128):
+            raise ValueError("Row fingerprints must be 64 or 128 bits")
+        self.bits = bits
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+        self.spill_dir = spill_dir
+        self.track_groups = track_groups
+        self.partitions = partitions
+        self.total_rows = 0
+        self._hashes: List[np.ndarray] = []
+        self._positions: List[np.ndarray] = []
+        self._buffered_bytes = 0
+        self._spill_path: Optional[str] = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._spill_path is not None
+
+    def update(self, df: pd.DataFrame) -> 'DuplicateDetector':
+        """Add the rows of ``df``"""
+        return self.update_hashes(hash_rows(df, self.bits))
+
+    def update_hashes(self, hashes: np.ndarray) -> 'DuplicateDetector':
+        """Add precomputed row fingerprints (from ``hash_rows``)"""
+        positions = np.arange(self.total_rows, self.total_rows + len(hashes), dtype=np.int64)
+        self._add(hashes, positions)
+        self.total_rows += len(hashes)
+        return self
+
+    def merge(self, other: 'DuplicateDetector') -> 'DuplicateDetector':
+        """Fold in the fingerprints of another detector; its rows follow this one's"""
+        if other.bits != self.bits:
+            raise ValueError("Cannot merge detectors with different fingerprint sizes")
+        offset = self.total_rows
+        for hashes, positions in other._blocks():
+            self._add(hashes, positions + offset)
+        self.total_rows = offset + other.total_rows
+        return self
+
+    def _add(self, hashes: np.ndarray, positions: np.ndarray) -> None:
+        if len(hashes) == 0:
+            return
+        self._hashes.append(hashes)
+        self._buffered_bytes += hashes.nbytes
+        if self.track_groups:
+            self._positions.append(positions)
+            self._buffered_bytes += positions.nbytes
+        if self._buffered_bytes > self.max_memory_bytes:
+            self._spill()
+
+    def _spill(self) -> None:
+        """Append the buffered fingerprints to per-partition files"""
+        if not self._hashes:
+            return
+        if self._spill_path is None:
+            self._spill_path = tempfile.mkdtemp(prefix='eda-duplicates-', dir=self.spill_dir)
+        hashes, positions = self._take_buffer()
+        lead = hashes if hashes.ndim == 1 else hashes[:, 0]
+        shift = np.uint64(64 - max(1, int(np.ceil(np.log2(self.partitions)))))
+        partition = (lead >> shift).astype(np.int64) % self.partitions
+        order = np.argsort(partition, kind='stable')
+        bounds = np.searchsorted(partition[order], np.arange(self.partitions + 1))
+        for p in range(self.partitions):
+            rows = order[bounds[p]:bounds[p + 1]]
+            if len(rows) == 0:
+                continue
+            with open(self._partition_file(p, 'hashes'), 'ab') as f:
+                hashes[rows].tofile(f)
+            if positions is not None:
+                with open(self._partition_file(p, 'positions'), 'ab') as f:
+                    positions[rows].tofile(f)
+
+    def _partition_file(self, partition: int, kind: str) -> str:
+        return os.path.join(self._spill_path, f"{kind}-{partition:04d}.bin")
+
+    def _take_buffer(self) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        hashes = np.concatenate(self._hashes)
+        positions = np.concatenate(self._positions) if self.track_groups else None
+        self._hashes, self._positions, self._buffered_bytes = [], [], 0
+        return hashes, positions
+
+    def _blocks(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Stored fingerprints (and positions, or placeholders) one block at a time"""
+        if self._spill_path is not None:
+            width = self.bits // 64
+            for p in range(self.partitions):
+                path = self._partition_file(p, 'hashes')
+                if not os.path.exists(path):
+                    continue
+                hashes = np.fromfile(path, dtype=np.uint64)
+                hashes = hashes if width == 1 else hashes.reshape(-1, width)
+                if self.track_groups:
+                    positions = np.fromfile(self._partition_file(p, 'positions'), dtype=np.int64)
+                else:
+                    positions = np.zeros(len(hashes), dtype=np.int64)
+                yield hashes, positions
+        for i, hashes in enumerate(self._hashes):
+            positions = self._positions[i] if self.track_groups else np.zeros(len(hashes), dtype=np.int64)
+            yield hashes, positions
+
+    def fingerprints(self) -> np.ndarray:
+        """Every stored fingerprint in one array (in no particular order)"""
+        blocks = [hashes for hashes, _ in self._blocks()]
+        if not blocks:
+            return np.zeros((0,) if self.bits == 64 else (0, 2), dtype=np.uint64)
+        return np.concatenate(blocks)
+
+    def report(self, top_n: int = 10) -> DuplicateReport:
+        """Count duplicate rows; with ``track_groups``, also list the ``top_n`` largest groups"""
+        if self.spilled:
+            # Partitions never share a fingerprint, so each is counted independently
+            self._spill()
+            blocks = self._blocks()
+        elif self._hashes:
+            blocks = iter([self._consolidate()])
+        else:
+            blocks = iter([])
+
+        distinct = 0
+        groups: List[Tuple[int, int, str]] = []
+        for hashes, positions in blocks:
+            block_distinct, block_groups = self._count(hashes, positions, top_n if self.track_groups else 0)
+            distinct += block_distinct
+            groups = heapq.nlargest(top_n, groups + block_groups, key=lambda g: (g[0], -g[1]))
+
+        return DuplicateReport(
+            total_rows=self.total_rows,
+            distinct_rows=distinct,
+            duplicate_rows=self.total_rows - distinct,
+            hash_bits=self.bits,
+            collision_probability=collision_probability(self.total_rows, self.bits),
+            spilled=self.spilled,
+            top_groups=[DuplicateGroup(count=count, first_row=first, fingerprint=fingerprint)
+                        for count, first, fingerprint in groups]
+        )
+
+    def _consolidate(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Consolidate the in-memory buffer into one block and keep it"""
+        hashes, positions = self._take_buffer()
+        self._hashes = [hashes]
+        self._buffered_bytes = hashes.nbytes
+        if positions is None:
+            return hashes, np.zeros(len(hashes), dtype=np.int64)
+        self._positions = [positions]
+        self._buffered_bytes += positions.nbytes
+        return hashes, positions
+
+    @staticmethod
+    def _count(hashes: np.ndarray, positions: np.ndarray, top_n: int) -> Tuple[int, List[Tuple[int, int, str]]]:
+        if hashes.ndim == 1 and top_n == 0:
+            # A hash set over 64-bit keys is the cheapest distinct count
+            return len(pd.unique(hashes)), []
+
+        keys = hashes if hashes.ndim == 1 else np.ascontiguousarray(hashes).view(np.dtype((np.void, 16))).ravel()
+        order = np.argsort(keys, kind='stable')
+        ordered = keys[order]
+        starts = np.flatnonzero(np.concatenate([[True], ordered[1:] != ordered[:-1]]))
+        if top_n == 0:
+            return len(starts), []
+
+        counts = np.diff(np.append(starts, len(ordered)))
+        duplicated = np.flatnonzero(counts > 1)
+        top = duplicated[np.argsort(-counts[duplicated], kind='stable')[:top_n]]
+        groups = []
+        for g in top:
+            members = order[starts[g]:starts[g] + counts[g]]
+            fingerprint = ''.join(f"{word:016x}" for word in np.atleast_1d(hashes[members[0]]))
+            groups.append((int(counts[g]), int(positions[members].min()), fingerprint))
+        return len(starts), groups
+
+    def close(self) -> None:
+        """Delete spill files"""
+        if self._spill_path is not None:
+            shutil.rmtree(self._spill_path, ignore_errors=True)
+            self._spill_path = None
+
+    def __del__(self):
+        self.close()
@@ -1,26 +1,76 @@
 import os
-from typing import Optional
+from typing import Any, AsyncIterator, Iterator, List, Optional
 
 import pandas as pd
+from classes.data_classes import AgentEvent, SamplingConfig
 from core.EDA.eda_service import EDAService
+from core.EDA.response_cache import ResponseCache, dataframe_fingerprint
+from core.EDA.sampled_service import SampledEDAService
 from core.EDA.eda_tools import EDATools
 
 from core.report.report_generator import ReportBuilder
 
 
 class EDAAgent:
-    """Intelligent chat agent for EDA interaction"""
+    """Intelligent chat agent for EDA interaction.
     
-    def __init__(self, df: pd.DataFrame, use_openai: bool = False):
+    Unless ``cache_responses`` is False, answers are cached in
+    ``response_cache`` (a fresh in-memory LRU by default) under the dataset fingerprint, model,
+    ``PROMPT_VERSION`` and the normalized question. Without
+    ``dataset_fingerprint`` the DataFrame's content is hashed on first use.
+    ``tool_token_budget`` caps the size of each tool result (see ``EDATools``).
+    
+    The LangChain tools, chat model and LangGraph agent (and their
+    LangChain imports) are built on first use; reports, quick commands
+    (``run_tool`` calls the ``EDATools`` methods directly) and cached
+    answers never pay for them.
+    """
+    
+    # Bump whenever the system prompt or the tool set changes so cached answers are not reused
+    PROMPT_VERSION = '3'
+    
+    def __init__(self, df: pd.DataFrame, use_openai: bool = False,
+                 eda_service: Optional[EDAService] = None, sampling: Optional[SamplingConfig] = None,
+                 response_cache: Optional[ResponseCache] = None, cache_responses: bool = True,
+                 dataset_fingerprint: Optional[str] = None,
+                 tool_token_budget: int = EDATools.DEFAULT_MAX_TOKENS):
         self.df = df
-        self.eda_service = EDAService(df)
-        self.tools = EDATools.create_tools(self.eda_service)
-        self.llm = self._setup_llm(use_openai)
-        self.agent = self._create_agent()
+        if eda_service is None:
+            eda_service = SampledEDAService(df, sampling) if sampling else EDAService(df)
+        self.eda_service = eda_service
+        self.response_cache = (response_cache or ResponseCache()) if cache_responses else None
+        self.dataset_fingerprint = dataset_fingerprint
+        self.use_openai = use_openai or bool(os.getenv("OPENAI_API_KEY"))
+        # Known without building the model, so cache lookups stay cheap
+        self.model_name = ("openai:gpt-4o-mini" if self.use_openai
+                           else f"ollama:{os.getenv('OLLAMA_MODEL', 'qwen3:4b')}")
+        self.tool_token_budget = tool_token_budget
+        self.toolkit = EDATools(eda_service, max_tokens=tool_token_budget)
+        self._tools = None
+        self._llm = None
+        self._agent = None
+    
+    @property
+    def tools(self) -> List:
+        if self._tools is None:
+            self._tools = self.toolkit.langchain_tools()
+        return self._tools
+    
+    @property
+    def llm(self):
+        if self._llm is None:
+            self._llm = self._setup_llm(self.use_openai)
+        return self._llm
+    
+    @property
+    def agent(self):
+        if self._agent is None:
+            self._agent = self._create_agent()
+        return self._agent
     
     def _setup_llm(self, use_openai: bool):
         """Setup LLM (OpenAI or Ollama)"""
-        if use_openai or os.getenv("OPENAI_API_KEY"):
+        if use_openai:
             from langchain_openai import ChatOpenAI
             print("🤖 Using OpenAI GPT-4o-mini\n")
             return ChatOpenAI(model="gpt-4o-mini", temperature=0)
@@ -53,6 +103,7 @@ AVAILABLE TOOLS:
 5. get_automated_insights - Get AI-generated insights
 6. generate_full_report - Create comprehensive EDA report
 7. compare_columns - Compare multiple columns side-by-side
+8. analyze_column_exact - Exact statistics for one column when the others are sampled estimates
 
 INSTRUCTIONS:
 - Always start with get_dataset_overview for new questions about the dataset
@@ -60,8 +111,10 @@ INSTRUCTIONS:
 - Provide clear, actionable insights after each analysis
 - When you find issues (missing data, outliers, imbalance), suggest solutions
 - Format responses clearly with sections and bullet points
-- If asked for a full EDA, use generate_full_report
+- If asked for a full EDA, use generate_full_report; its column section is paged, so fetch further pages only for the columns the question needs
 - Don't make up numbers - only use what tools return
+- Long listings are paged: when a result says "call again with offset=N", do so only if you need the rest
+- When tools say figures are estimates, say so and quote the confidence intervals
 
 RESPONSE STYLE:
 - Be concise but informative
@@ -76,28 +129,130 @@ RESPONSE STYLE:
             state_modifier=system_prompt
         )
     
+    # (stream modes, config) shared by chat and the streaming APIs
+    STREAM_MODES = ["messages", "updates"]
+    CONFIG = {"recursion_limit": 15}
+    NO_RESPONSE = "No response generated."
+    
+    def run_tool(self, name: str, **kwargs: Any) -> str:
+        """Run one of the agent's tools directly, without the model or LangChain"""
+        return self.toolkit.run(name, **kwargs)
+    
     def chat(self, query: str, verbose: bool = False) -> str:
         """Send a query to the agent"""
+        key = self._cache_key(query)
+        cached = self._cached(key)
+        if cached is not None:
+            if verbose:
+                print("\n⚡ Cached response\n")
+            return cached
         try:
-            response = self.agent.invoke(
-                {"messages": [("user", query)]},
-                {"recursion_limit": 15}
-            )
+            response = self.agent.invoke({"messages": [("user", query)]}, self.CONFIG)
             
             if verbose:
                 self._print_tool_activity(response)
             
-            # Extract final answer
-            messages = response.get("messages", [])
-            for msg in reversed(messages):
-                if hasattr(msg, 'content') and isinstance(msg.content, str):
-                    if msg.content and not msg.content.startswith('['):
-                        return msg.content
-            
-            return "No response generated."
+            return self._remember(key, self._final_answer(response.get("messages", [])))
+        
+        except Exception as e:
+            return self._error_message(e)
+    
+    def stream(self, query: str) -> Iterator[AgentEvent]:
+        """Reply to a query incrementally.
         
+        Yields model tokens as they are generated, each tool call and its
+        result, and ends with one ``answer`` (or ``error``) event holding
+        the same text ``chat`` returns. A cached answer is a lone ``answer`` event.
+        """
+        key = self._cache_key(query)
+        cached = self._cached(key)
+        if cached is not None:
+            yield AgentEvent('answer', cached)
+            return
+        messages: List[Any] = []
+        try:
+            for mode, chunk in self.agent.stream({"messages": [("user", query)]}, self.CONFIG,
+                                                 stream_mode=self.STREAM_MODES):
+                yield from self._events(mode, chunk, messages)
+        except Exception as e:
+            yield AgentEvent('error', self._error_message(e))
+            return
+        yield AgentEvent('answer', self._remember(key, self._final_answer(messages)))
+    
+    async def astream(self, query: str) -> AsyncIterator[AgentEvent]:
+        """Async version of ``stream``"""
+        key = self._cache_key(query)
+        cached = self._cached(key)
+        if cached is not None:
+            yield AgentEvent('answer', cached)
+            return
+        messages: List[Any] = []
+        try:
+            async for mode, chunk in self.agent.astream({"messages": [("user", query)]}, self.CONFIG,
+                                                        stream_mode=self.STREAM_MODES):
+                for event in self._events(mode, chunk, messages):
+                    yield event
         except Exception as e:
-            return f"❌ Error: {str(e)}\n\nTry rephrasing your question or use 'help' for guidance."
+            yield AgentEvent('error', self._error_message(e))
+            return
+        yield AgentEvent('answer', self._remember(key, self._final_answer(messages)))
+    
+    async def achat(self, query: str) -> str:
+        """Async version of ``chat``"""
+        answer = self.NO_RESPONSE
+        async for event in self.astream(query):
+            if event.kind in ('answer', 'error'):
+                answer = event.content
+        return answer
+    
+    def _cache_key(self, query: str) -> Optional[str]:
+        """Response cache key of ``query``, or None when answers are not cached"""
+        if self.response_cache is None:
+            return None
+        if self.dataset_fingerprint is None:
+            self.dataset_fingerprint = dataframe_fingerprint(self.df) or ''
+        if not self.dataset_fingerprint:
+            return None
+        return self.response_cache.make_key(self.dataset_fingerprint, self.model_name, self.PROMPT_VERSION, query)
+    
+    def _cached(self, key: Optional[str]) -> Optional[str]:
+        return None if key is None else self.response_cache.get(key)
+    
+    def _remember(self, key: Optional[str], answer: str) -> str:
+        """Cache a real answer (not the empty-reply fallback) and return it"""
+        if key is not None and answer != self.NO_RESPONSE:
+            self.response_cache.put(key, answer)
+        return answer
+    
+    @staticmethod
+    def _events(mode: str, chunk: Any, messages: List[Any]) -> Iterator[AgentEvent]:
+        """Events of one LangGraph stream item; completed messages are appended to ``messages``"""
+        if mode == "messages":
+            message, metadata = chunk
+            # Only the model node streams tokens; tool output arrives as a whole update
+            if metadata.get("langgraph_node") == "agent" and isinstance(message.content, str) and message.content:
+                yield AgentEvent('token', message.content)
+            return
+        for update in chunk.values():
+            for msg in (update or {}).get("messages", []):
+                messages.append(msg)
+                if getattr(msg, 'type', None) == 'ai':
+                    for tc in getattr(msg, 'tool_calls', None) or []:
+                        yield AgentEvent('tool_call', tool=tc['name'], args=tc['args'])
+                elif getattr(msg, 'type', None) == 'tool':
+                    yield AgentEvent('tool_result', str(msg.content), tool=getattr(msg, 'name', None))
+    
+    @staticmethod
+    def _final_answer(messages: List[Any]) -> str:
+        for msg in reversed(messages):
+            if hasattr(msg, 'content') and isinstance(msg.content, str):
+                if msg.content and not msg.content.startswith('['):
+                    return msg.content
+        return EDAAgent.NO_RESPONSE
+    
+    @staticmethod
+    def _error_message(error: Exception) -> str:
+        return f"❌ Error: {str(error)}\n\nTry rephrasing your question or use 'help' for guidance."
     
     def _print_tool_activity(self, response):
         """Print tool calls for debugging"""
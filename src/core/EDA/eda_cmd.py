@@ -1,8 +1,16 @@
 from core.EDA.eda_agent import EDAAgent
 
+# A trailing word that sends a quick command to the model for interpretation
+EXPLAIN_WORDS = ('explain', '--explain')
+
 
 class EDACommandLine:
-    """Interactive command-line interface"""
+    """Interactive command-line interface.
+    
+    Quick commands run their EDA tool (or the report builder) directly and
+    print the result, without the model; adding ``explain`` asks the model
+    to interpret it instead.
+    """
     
     def __init__(self, agent: EDAAgent):
         self.agent = agent
@@ -30,17 +38,18 @@ class EDACommandLine:
                     continue
                 
                 # Check if it's a command
-                cmd_parts = user_input.lower().split()
-                if cmd_parts[0] in self.commands:
-                    result = self.commands[cmd_parts[0]](cmd_parts[1:] if len(cmd_parts) > 1 else [])
+                # Arguments keep their case: column names are case-sensitive
+                cmd_parts = user_input.split()
+                command = cmd_parts[0].lower()
+                if command in self.commands:
+                    result = self.commands[command](cmd_parts[1:])
                     if result == "QUIT":
                         break
                     if result:
                         print(f"\n🤖 Assistant:\n{result}")
                 else:
                     # Natural language query to agent
-                    response = self.agent.chat(user_input)
-                    print(f"\n🤖 Assistant:\n{response}")
+                    self._stream_reply(user_input)
             
             except KeyboardInterrupt:
                 print("\n\n👋 Goodbye!")
@@ -48,6 +57,29 @@ class EDACommandLine:
             except Exception as e:
                 print(f"\n❌ Error: {e}")
     
+    def _stream_reply(self, query: str):
+        """Print the agent's reply as it is generated, with a line per tool call"""
+        print("\n🤖 Assistant:")
+        streamed = False
+        for event in self.agent.stream(query):
+            if event.kind == 'token':
+                print(event.content, end="", flush=True)
+                streamed = True
+            elif event.kind == 'tool_call':
+                if streamed:
+                    print()
+                    streamed = False
+                args = ", ".join(f"{k}={v!r}" for k, v in event.args.items())
+                print(f"  🔧 {event.tool}({args})", flush=True)
+            elif event.kind == 'answer':
+                # Already printed token by token unless the model does not stream
+                if streamed:
+                    print()
+                else:
+                    print(event.content)
+            elif event.kind == 'error':
+                print(("\n" if streamed else "") + event.content)
+    
     def _print_welcome(self):
         """Print welcome message"""
         print("\n" + "="*70)
@@ -73,14 +105,17 @@ class EDACommandLine:
         return """Available Commands:
         
 🔍 QUICK COMMANDS:
-  • overview          - Get dataset overview
-  • quality           - Check data quality
+  • overview [offset] - Get dataset overview
+  • quality [offset]  - Check data quality
   • columns           - List all columns
   • analyze <column>  - Analyze specific column
-  • insights          - Get automated insights
-  • report [markdown|json] - Generate full report
+  • insights [offset] - Get automated insights
+  • report [markdown|json] [offset] - Generate full report (columns are paged)
   • quit / exit       - Exit program
 
+  Quick commands are computed instantly without the AI model.
+  Add 'explain' (e.g. "quality explain") to have the model interpret the result.
+
 💬 NATURAL LANGUAGE:
 Just ask questions! Examples:
   • "Which features are most correlated?"
@@ -91,11 +126,25 @@ Just ask questions! Examples:
 
 The agent will use appropriate tools automatically!"""
     
+    def _direct(self, args, tool_name, prompt, **tool_args):
+        """Result of ``tool_name`` run locally, or the model's answer to ``prompt`` when args end with 'explain'"""
+        if args and args[-1].lower() in EXPLAIN_WORDS:
+            self._stream_reply(prompt)
+            return None
+        return self.agent.run_tool(tool_name, **tool_args)
+    
+    @staticmethod
+    def _offset(args):
+        """Paging offset given as the first argument, 0 by default"""
+        return int(args[0]) if args and args[0].isdigit() else 0
+    
     def _overview(self, args):
-        return self.agent.chat("Give me a dataset overview")
+        return self._direct(args, 'get_dataset_overview', "Give me a dataset overview",
+                            offset=self._offset(args))
     
     def _quality(self, args):
-        return self.agent.chat("Check data quality and tell me about any issues")
+        return self._direct(args, 'get_data_quality', "Check data quality and tell me about any issues",
+                            offset=self._offset(args))
     
     def _list_columns(self, args):
         cols = self.agent.df.columns.tolist()
@@ -104,16 +153,24 @@ The agent will use appropriate tools automatically!"""
     def _analyze_column(self, args):
         if not args:
             return "❌ Usage: analyze <column_name>"
-        col_name = " ".join(args)
-        return self.agent.chat(f"Analyze the {col_name} column in detail")
+        explain = args[-1].lower() in EXPLAIN_WORDS
+        col_name = " ".join(args[:-1] if explain else args)
+        if not col_name:
+            return "❌ Usage: analyze <column_name> [explain]"
+        return self._direct(args, 'analyze_column', f"Analyze the {col_name} column in detail",
+                            column_name=col_name)
     
     def _generate_report(self, args):
-        format_type = args[0] if args else "markdown"
+        words = [arg for arg in args if not arg.isdigit() and arg.lower() not in EXPLAIN_WORDS]
+        format_type = words[0].lower() if words else "markdown"
+        offsets = [int(arg) for arg in args if arg.isdigit()]
         print("\n⏳ Generating comprehensive EDA report...\n")
-        return self.agent.chat(f"Generate a full EDA report in {format_type} format")
+        return self._direct(args, 'generate_full_report', f"Generate a full EDA report in {format_type} format",
+                            format_type=format_type, offset=offsets[0] if offsets else 0)
     
     def _get_insights(self, args):
-        return self.agent.chat("Give me all automated insights and recommendations")
+        return self._direct(args, 'get_automated_insights', "Give me all automated insights and recommendations",
+                            offset=self._offset(args))
     
     def _quit(self, args):
         print("\n👋 Thank you for using EDA Agent! Goodbye!")
@@ -1,21 +1,110 @@
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from typing import Any, Dict, List, Optional, Set
 import numpy as np
 import pandas as pd
 
-from classes.data_classes import ColumnAnalysis, ColumnType, DataQualityReport, DatasetMetadata
-from core.Analyzers.factory_analyzer import AnalyzerFactory
+from classes.data_classes import (ColumnAnalysis, ColumnType, DataQualityReport, DatasetMetadata, DtypeOptimization,
+                                  DuplicateReport)
+from core.Analyzers.cardinality import DistinctCounter
+from core.Analyzers.correlation_engine import CorrelationEngine, CorrelationPair, pairs_from_matrix
+from core.Analyzers.factory_analyzer import AnalyzerFactory, ColumnTypePlan, schema_signature
+from core.Analyzers.vectorized_numeric import VectorizedNumericEngine
+from core.EDA.dataset_loader import ArrowDataset, load_dataset, open_dataset
+from core.EDA.dataset_profile import DatasetProfile
+from core.EDA.dtype_optimizer import optimize_dtypes
+from core.EDA.duplicates import DuplicateDetector
+from core.EDA.parallel_analysis import ParallelColumnAnalyzer, analyze_frame
+from interface.Analyzer_interface import IColumnAnalyzer
+
+
+def _concat_schema(df: pd.DataFrame, rows_df: pd.DataFrame):
+    """Schema of ``df`` with ``rows_df`` appended, from one row of each"""
+    if len(df) == 0 or len(rows_df) == 0:
+        return schema_signature(pd.concat([df, rows_df]))
+    return schema_signature(pd.concat([df.iloc[:1], rows_df.iloc[:1]]))
 
 
 class EDAService:
-    """Main EDA service coordinating all analyses"""
+    """Main EDA service coordinating all analyses.
+
+    Column analyses are memoized per column: ``analyze_column`` computes a
+    single column on first use, ``analyze_columns`` computes only the
+    columns not yet cached, and the agent tools and ``ReportBuilder`` all
+    read the same cache. Population is thread-safe; ``column_cache_stats``
+    reports hits and misses.
+
+    ``append`` grows the dataset incrementally: running per-column state
+    (a ``DatasetProfile``) absorbs only the new rows and refreshes metadata,
+    quality, correlations and column analyses. Batches are concatenated
+    onto ``df`` only when the raw rows are next needed. Column fields the
+    running state can only estimate (quantiles past the sketch size,
+    distinct counts past the exact limit, overflowing top-k) are listed in
+    ``approximate_statistics``; they are recomputed from the data only for
+    callers that pass ``exact=True`` (or call ``analyze_column_exact``).
+    """
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, vectorized: bool = True,
+                 n_workers: int = 1, parallel_backend: str = 'thread',
+                 distinct_counter: Optional[DistinctCounter] = None,
+                 top_k_capacity: Optional[int] = None, source: Optional[ArrowDataset] = None,
+                 dtype_optimization: Optional[DtypeOptimization] = None):
+        self._rows_lock = threading.Lock()
         self.df = df
-        self.factory = AnalyzerFactory()
+        # Columnar file the frame was read from, for metadata-only answers
+        self.source = source
+        # Set when ``df`` is the output of ``optimize_dtypes``
+        self.dtype_optimization = dtype_optimization
+        self.distinct_counter = distinct_counter or DistinctCounter()
+        self.factory = AnalyzerFactory(self.distinct_counter, top_k_capacity)
+        self.vectorized = vectorized
+        self.numeric_engine = VectorizedNumericEngine()
+        self.correlation_engine = CorrelationEngine()
+        self.n_workers = n_workers
+        self.parallel_backend = parallel_backend
         self._metadata: Optional[DatasetMetadata] = None
         self._quality_report: Optional[DataQualityReport] = None
         self._column_analyses: Optional[List[ColumnAnalysis]] = None
         self._correlation_matrix: Optional[pd.DataFrame] = None
+        self._column_plan: Optional[ColumnTypePlan] = None
+        self._column_cache: Dict[Any, ColumnAnalysis] = {}
+        self._column_locks: Dict[Any, threading.Lock] = {}
+        self._cache_lock = threading.Lock()
+        self._analyze_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # Fields of cached analyses that are running-state estimates, per column
+        self._stale_fields: Dict[Any, Set[str]] = {}
+        self._running: Optional[DatasetProfile] = None
+    
+    @property
+    def df(self) -> pd.DataFrame:
+        """The dataset, including any rows appended since it was last read"""
+        with self._rows_lock:
+            if self._appended:
+                frames = [self._df, *self._appended]
+                self._df = pd.concat(frames, ignore_index=isinstance(self._df.index, pd.RangeIndex))
+                self._appended = []
+            return self._df
+    
+    @df.setter
+    def df(self, df: pd.DataFrame) -> None:
+        with self._rows_lock:
+            self._df = df
+            self._appended: List[pd.DataFrame] = []
+    
+    @classmethod
+    def from_file(cls, path: str, columns: Optional[List[str]] = None, optimize: bool = False,
+                  **service_kwargs: Any) -> 'EDAService':
+        """Service over a CSV/Parquet/Feather/Arrow file, reading only ``columns``.
+
+        ``optimize`` narrows dtypes with ``optimize_dtypes`` after loading.
+        """
+        source = open_dataset(path)
+        df = load_dataset(path, columns) if source is None else source.read(columns)
+        optimization = None
+        if optimize:
+            df, optimization = optimize_dtypes(df)
+        return cls(df, source=source, dtype_optimization=optimization, **service_kwargs)
     
     def get_metadata(self) -> DatasetMetadata:
         """Extract dataset metadata"""
@@ -27,64 +116,268 @@ class EDAService:
                 column_count=len(self.df.columns),
                 row_count=len(self.df),
                 columns=self.df.columns.tolist(),
-                dtypes={col: str(dtype) for col, dtype in self.df.dtypes.items()}
+                dtypes={col: str(dtype) for col, dtype in self.df.dtypes.items()},
+                memory_before_optimization_mb=(self.dtype_optimization.memory_before_mb
+                                               if self.dtype_optimization is not None else None)
             )
         return self._metadata
     
     def get_quality_report(self) -> DataQualityReport:
         """Generate data quality report"""
         if self._quality_report is None:
-            missing = self.df.isnull().sum()
+            if self.source is not None:
+                # Null counts come from file statistics or Arrow, not a scan of object columns
+                null_counts = self.source.null_counts(self.df.columns.tolist())
+                missing = pd.Series([null_counts[col] for col in self.df.columns], index=self.df.columns)
+            else:
+                missing = self.df.isnull().sum()
             total_cells = self.df.shape[0] * self.df.shape[1]
             missing_cells = missing.sum()
-            duplicates = self.df.duplicated().sum()
+            duplicates = self.get_duplicate_report(top_n=0)
             
+            row_count = len(self.df)
             self._quality_report = DataQualityReport(
                 missing_values={col: int(count) for col, count in missing.items() if count > 0},
-                missing_percentages={col: round(count/len(self.df)*100, 2) 
+                missing_percentages={col: round(count/row_count*100, 2) 
                                    for col, count in missing.items() if count > 0},
-                duplicate_rows=int(duplicates),
-                duplicate_percentage=round(duplicates/len(self.df)*100, 2),
+                duplicate_rows=duplicates.duplicate_rows,
+                duplicate_percentage=round(duplicates.duplicate_rows/row_count*100, 2) if row_count else 0.0,
                 total_cells=total_cells,
-                missing_cells=int(missing_cells)
+                missing_cells=int(missing_cells),
+                duplicate_collision_probability=duplicates.collision_probability
             )
         return self._quality_report
     
-    def analyze_columns(self) -> List[ColumnAnalysis]:
-        """Analyze all columns"""
-        if self._column_analyses is None:
-            self._column_analyses = []
-            for col in self.df.columns:
-                analyzer = self.factory.get_analyzer(self.df[col])
-                analysis = analyzer.analyze(self.df[col])
-                self._column_analyses.append(analysis)
-        return self._column_analyses
+    def get_duplicate_report(self, top_n: int = 10, bits: int = 64,
+                             max_memory_mb: float = 256.0) -> DuplicateReport:
+        """Duplicate rows from row fingerprints, with the ``top_n`` largest groups"""
+        detector = DuplicateDetector(bits=bits, max_memory_mb=max_memory_mb, track_groups=top_n > 0)
+        try:
+            return detector.update(self.df).report(top_n)
+        finally:
+            detector.close()
+    
+    def get_column_plan(self) -> ColumnTypePlan:
+        """Column type and analyzer per column, rebuilt only when the schema changes"""
+        if self._column_plan is None or not self._column_plan.matches(self.df):
+            self._column_plan = self.factory.build_plan(self.df)
+        return self._column_plan
+    
+    def get_analyzer(self, column: Any) -> IColumnAnalyzer:
+        """Analyzer for a column of the dataset"""
+        return self.get_column_plan().analyzer(column)
+    
+    def analyze_columns(self, exact: bool = False) -> List[ColumnAnalysis]:
+        """Analyze all columns; ``exact`` recomputes fields estimated by ``append``"""
+        with self._analyze_lock:
+            if self._column_analyses is not None:
+                self._record(hits=len(self._column_analyses))
+                return self._column_analyses
+            
+            columns = self.df.columns.tolist()
+            if not self.df.columns.is_unique:
+                # Labels cannot key the per-column cache
+                self._column_analyses = self._compute_columns(columns)
+                self._record(misses=len(columns))
+                return self._column_analyses
+            
+            with self._cache_lock:
+                missing = [col for col in columns if col not in self._column_cache
+                           or (exact and col in self._stale_fields)]
+            computed = self._compute_columns(missing) if missing else []
+            with self._cache_lock:
+                for analysis in computed:
+                    self._column_cache[analysis.name] = analysis
+                    self._stale_fields.pop(analysis.name, None)
+                analyses = [self._column_cache[col] for col in columns]
+                if not self._stale_fields:
+                    self._column_analyses = analyses
+            self._record(hits=len(columns) - len(missing), misses=len(missing))
+            return analyses
+    
+    def analyze_column(self, column: Any, exact: bool = False) -> ColumnAnalysis:
+        """Analysis of one column, computed on first request and cached.
+
+        ``exact`` recomputes the column when ``append`` left estimated fields in it.
+        """
+        with self._cache_lock:
+            cached = self._cached_analysis(column, exact)
+            column_lock = self._column_locks.setdefault(column, threading.Lock())
+        if cached is not None:
+            self._record(hits=1)
+            return cached
+        
+        # Concurrent requests for the same column wait for one computation
+        with column_lock:
+            with self._cache_lock:
+                cached = self._cached_analysis(column, exact)
+            if cached is not None:
+                self._record(hits=1)
+                return cached
+            analysis = self._compute_columns([column])[0]
+            with self._cache_lock:
+                self._column_cache[column] = analysis
+                self._stale_fields.pop(column, None)
+            self._record(misses=1)
+            return analysis
+    
+    def get_visualization_data(self, column: Any) -> Optional[Dict[str, Any]]:
+        """Pre-aggregated chart payload of a column, cached with its analysis.
+
+        Analyses rebuilt from running state (after ``append``) carry no
+        payload; it is then computed from the column once and attached.
+        """
+        analysis = self.analyze_column(column)
+        if analysis.visualization is None and column in self.df.columns:
+            analysis.visualization = self.get_analyzer(column).get_visualization_data(self.df[column])
+        return analysis.visualization
+    
+    def analyze_column_exact(self, column: Any) -> ColumnAnalysis:
+        """Exact analysis of one column; services that estimate override this"""
+        return self.analyze_column(column, exact=True)
+
+    def column_cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counters of the per-column analysis cache"""
+        with self._cache_lock:
+            return {
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+                'cached_columns': len(self._column_cache),
+            }
+    
+    def _cached_analysis(self, column: Any, exact: bool = False) -> Optional[ColumnAnalysis]:
+        """Cached analysis of a column; the caller holds ``_cache_lock``"""
+        if column not in self._column_cache and self._column_analyses is not None:
+            # Results seeded wholesale (profiles, disk cache) fill the map lazily
+            for analysis in self._column_analyses:
+                self._column_cache.setdefault(analysis.name, analysis)
+        if exact and column in self._stale_fields:
+            return None
+        return self._column_cache.get(column)
+    
+    def append(self, rows_df: pd.DataFrame) -> None:
+        """Add rows, updating cached results from running state instead of rescanning.
+
+        The first call seeds the running state with one pass over the existing
+        rows; later calls cost O(new rows). The batch is concatenated onto
+        ``df`` when the rows are next read. A batch that changes a column's
+        dtype resets every cache instead.
+        """
+        with self._rows_lock:
+            frame = self._df
+        if set(rows_df.columns) != set(frame.columns) or not frame.columns.is_unique:
+            raise ValueError("Appended rows must have the same columns as the dataset")
+        rows_df = rows_df[frame.columns.tolist()]
+        
+        with self._analyze_lock:
+            self.source = None
+            self.dtype_optimization = None
+            if self._running is None:
+                self._running = DatasetProfile.from_frame(self.df, self.factory, keep_row_hashes=True)
+            if _concat_schema(frame, rows_df) != schema_signature(frame):
+                self.df = pd.concat([self.df, rows_df], ignore_index=isinstance(frame.index, pd.RangeIndex))
+                self._reset_results()
+                return
+            with self._rows_lock:
+                self._appended.append(rows_df)
+                batches = [self._df, *self._appended]
+            
+            running = self._running.update(rows_df, self.factory)
+            row_count = sum(len(batch) for batch in batches)
+            if isinstance(frame.index, pd.RangeIndex):
+                index_bytes = pd.RangeIndex(row_count).memory_usage()
+            else:
+                index_bytes = sum(batch.index.memory_usage(deep=True) for batch in batches)
+            self._metadata = DatasetMetadata(
+                shape=(row_count, len(frame.columns)),
+                memory_usage_mb=round((running.memory_bytes + index_bytes) / 1024 / 1024, 2),
+                column_count=len(frame.columns),
+                row_count=row_count,
+                columns=frame.columns.tolist(),
+                dtypes={col: str(dtype) for col, dtype in frame.dtypes.items()}
+            )
+            self._quality_report = running.quality_report()
+            self._correlation_matrix = running.correlation_matrix()
+            
+            analyses = {analysis.name: analysis for analysis in running.column_analyses()}
+            with self._cache_lock:
+                self._column_analyses = None
+                self._column_cache = analyses
+                self._stale_fields = {col: set(analysis.approximate_statistics)
+                                      for col, analysis in analyses.items() if analysis.approximate_statistics}
+    
+    def _reset_results(self) -> None:
+        self._metadata = None
+        self._quality_report = None
+        self._correlation_matrix = None
+        self._running = None
+        with self._cache_lock:
+            self._column_analyses = None
+            self._column_cache = {}
+            self._stale_fields = {}
+    
+    def _compute_columns(self, columns: List[Any]) -> List[ColumnAnalysis]:
+        plan = self.get_column_plan()
+        if self.n_workers > 1 and len(columns) > 1:
+            executor = ParallelColumnAnalyzer(self.n_workers, self.parallel_backend, self.vectorized,
+                                              factory=self.factory)
+            return executor.analyze(self.df, plan, columns)
+        engine = self.numeric_engine if self.vectorized else None
+        return analyze_frame(self.df, columns, self.factory, engine, plan)
+    
+    def _record(self, hits: int = 0, misses: int = 0) -> None:
+        with self._cache_lock:
+            self._cache_hits += hits
+            self._cache_misses += misses
     
     def get_correlation_matrix(self) -> Optional[pd.DataFrame]:
         """Calculate correlation matrix for numeric columns"""
         if self._correlation_matrix is None:
             numeric_cols = self.df.select_dtypes(include=[np.number]).columns
             if len(numeric_cols) > 1:
-                self._correlation_matrix = self.df[numeric_cols].corr()
+                self._correlation_matrix = self.correlation_engine.matrix(self.df[numeric_cols])
         return self._correlation_matrix
     
-    def get_high_correlations(self, threshold: float = 0.7) -> List[Tuple[str, str, float]]:
-        """Find highly correlated feature pairs"""
-        corr_matrix = self.get_correlation_matrix()
-        if corr_matrix is None:
-            return []
+    def get_results(self) -> Dict[str, Any]:
+        """Every cached result, computing any that are missing"""
+        return {
+            'metadata': self.get_metadata(),
+            'quality_report': self.get_quality_report(),
+            'column_analyses': self.analyze_columns(),
+            'correlation_matrix': self.get_correlation_matrix(),
+        }
+    
+    def load_results(self, results: Dict[str, Any]) -> None:
+        """Seed the result caches, e.g. from a ``ProfileCache`` entry"""
+        self._metadata = results['metadata']
+        self._quality_report = results['quality_report']
+        self._column_analyses = results['column_analyses']
+        self._correlation_matrix = results['correlation_matrix']
+        self._running = None
+        with self._cache_lock:
+            self._column_cache = {}
+            self._stale_fields = {}
+    
+    def get_high_correlations(self, threshold: float = 0.7, method: str = 'pearson',
+                              top_n: Optional[int] = None) -> List[CorrelationPair]:
+        """Find highly correlated feature pairs, strongest first.
+
+        Reads the cached Pearson matrix when there is one; otherwise the pairs
+        are computed block by block without building the dense matrix.
+        """
+        if method == 'pearson' and (self._correlation_matrix is not None or self.df is None):
+            corr_matrix = self.get_correlation_matrix()
+            return [] if corr_matrix is None else pairs_from_matrix(corr_matrix, threshold, top_n)
+        if self.df is None:
+            raise ValueError(f"{method.title()} correlations need the raw data")
         
-        high_corrs = []
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i+1, len(corr_matrix.columns)):
-                corr_val = corr_matrix.iloc[i, j]
-                if abs(corr_val) > threshold:
-                    high_corrs.append((
-                        corr_matrix.columns[i],
-                        corr_matrix.columns[j],
-                        round(corr_val, 3)
-                    ))
-        return sorted(high_corrs, key=lambda x: abs(x[2]), reverse=True)
+        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+        if len(numeric_cols) < 2:
+            return []
+        engine = self.correlation_engine
+        if method != engine.method:
+            engine = CorrelationEngine(method, engine.block_columns, engine.min_periods)
+        return engine.high_pairs(self.df[numeric_cols], threshold, top_n)
     
     def generate_insights(self) -> Dict[str, Any]:
         """Generate automated insights"""
@@ -115,7 +408,7 @@ class EDAService:
                 ])
         
         # Correlation insights
-        high_corrs = self.get_high_correlations()
+        high_corrs = self.get_high_correlations(top_n=5)
         for col1, col2, corr in high_corrs[:5]:  # Top 5
             insights['correlations'].append(
                 f"Strong correlation between '{col1}' and '{col2}' (r={corr})"
@@ -1,68 +1,118 @@
 import json
-from typing import List
-from langchain_core.tools import tool
+from collections import Counter
+from dataclasses import asdict
+from typing import Any, List
 
 from classes.data_classes import ColumnType
 from core.EDA.eda_service import EDAService
-from core.report.report_generator import ReportBuilder
+from core.EDA.token_budget import FOOTER_TOKENS, clip_to_tokens, paginate, with_token_estimate
+from core.report.report_generator import ReportBuilder, analysis_dict, format_intervals, format_memory_saving
 
 class EDATools:
-    """Tools for LLM interaction with EDA service"""
+    """Tools for LLM interaction with EDA service.
     
-    def __init__(self, eda_service: EDAService):
+    Every result stays within ``max_tokens`` tokens and ends with its token
+    estimate. Listing tools (overview, quality, correlations, insights,
+    column comparisons and the full report's column section) return at
+    most ``page_size`` entries, most important first, and an ``offset``
+    argument pages through the rest; single-column analyses are clipped.
+    """
+    
+    DEFAULT_MAX_TOKENS = 1500
+    DEFAULT_PAGE_SIZE = 30
+    # Methods the agent gets as tools, in order
+    TOOL_NAMES = (
+        'get_dataset_overview',
+        'get_data_quality',
+        'analyze_column',
+        'analyze_column_exact',
+        'get_correlations',
+        'get_automated_insights',
+        'generate_full_report',
+        'compare_columns',
+    )
+    
+    def __init__(self, eda_service: EDAService, max_tokens: int = DEFAULT_MAX_TOKENS,
+                 page_size: int = DEFAULT_PAGE_SIZE):
         self.eda = eda_service
+        self.max_tokens = max_tokens
+        self.page_size = page_size
+    
+    def page(self, header: str, lines: List[str], offset: int, noun: str) -> str:
+        """One budgeted page of a listing"""
+        return paginate(header, lines, offset, self.page_size, self.max_tokens, noun)
+    
+    def clip(self, text: str) -> str:
+        """A single result cut to the budget"""
+        return with_token_estimate(clip_to_tokens(text, self.max_tokens - FOOTER_TOKENS))
     
     @staticmethod
-    def create_tools(eda_service: EDAService) -> List:
+    def create_tools(eda_service: EDAService, max_tokens: int = DEFAULT_MAX_TOKENS,
+                     page_size: int = DEFAULT_PAGE_SIZE) -> List:
         """Factory method to create all tools"""
-        tools_instance = EDATools(eda_service)
-        
-        @tool
-        def get_dataset_overview(query: str = "") -> str:
-            """Get basic dataset information: shape, columns, memory usage.
-            Use this first to understand the dataset structure."""
-            metadata = tools_instance.eda.get_metadata()
-            return f"""Dataset Overview:
+        return EDATools(eda_service, max_tokens, page_size).langchain_tools()
+    
+    def langchain_tools(self) -> List:
+        """The tool methods wrapped as LangChain tools for the agent"""
+        from langchain_core.tools import tool
+        return [tool(getattr(self, name)) for name in self.TOOL_NAMES]
+    
+    def run(self, name: str, **kwargs: Any) -> str:
+        """Call one tool method directly, without LangChain"""
+        if name not in self.TOOL_NAMES:
+            raise KeyError(f"Unknown tool '{name}'")
+        return getattr(self, name)(**kwargs)
+    
+    def get_dataset_overview(self, offset: int = 0) -> str:
+        """Get basic dataset information: shape, memory usage, dtype counts and columns.
+        Use this first to understand the dataset structure.
+        Input: offset (default 0) of the first column listed; wide datasets are paged."""
+        metadata = self.eda.get_metadata()
+        dtype_counts = Counter(metadata.dtypes.values()).most_common()
+        header = f"""Dataset Overview:
 - Rows: {metadata.row_count:,}
 - Columns: {metadata.column_count}
-- Memory: {metadata.memory_usage_mb:.2f} MB
-- Column Names: {', '.join(metadata.columns)}
-- Data Types: {json.dumps(metadata.dtypes, indent=2)}"""
-        
-        @tool
-        def get_data_quality(query: str = "") -> str:
-            """Get data quality metrics: missing values, duplicates, completeness.
-            Use this to identify data quality issues."""
-            quality = tools_instance.eda.get_quality_report()
-            result = f"""Data Quality Report:
+- Memory: {metadata.memory_usage_mb:.2f} MB{format_memory_saving(metadata)}
+- Data Types: {', '.join(f"{count} {dtype}" for dtype, count in dtype_counts)}""" + (
+            f"\n- Sampled: statistics are estimates from {metadata.sampled_rows:,} rows"
+            if metadata.sampled_rows is not None else "") + "\n- Columns (name: dtype):"
+        lines = [f"  - {col}: {metadata.dtypes.get(col, '')}" for col in metadata.columns]
+        return self.page(header, lines, offset, 'columns')
+    
+    def get_data_quality(self, offset: int = 0) -> str:
+        """Get data quality metrics: missing values, duplicates, completeness.
+        Use this to identify data quality issues.
+        Input: offset (default 0) into the columns with missing values, most missing first."""
+        quality = self.eda.get_quality_report()
+        header = f"""Data Quality Report:
 - Total Cells: {quality.total_cells:,}
 - Missing Cells: {quality.missing_cells:,} ({quality.missing_cells/quality.total_cells*100:.2f}%)
-- Duplicate Rows: {quality.duplicate_rows:,} ({quality.duplicate_percentage:.2f}%)
-"""
-            if quality.missing_values:
-                result += "\nColumns with Missing Values:\n"
-                for col, count in quality.missing_values.items():
-                    pct = quality.missing_percentages[col]
-                    result += f"  - {col}: {count:,} missing ({pct:.1f}%)\n"
-            return result
+- Duplicate Rows: {quality.duplicate_rows:,} ({quality.duplicate_percentage:.2f}%)"""
+        if quality.approximate_fields:
+            header += f"\n- Estimated (not exact): {', '.join(quality.approximate_fields)}"
+        if not quality.missing_values:
+            return self.page(header, [], 0, 'columns')
+        header += f"\n\nColumns with Missing Values ({len(quality.missing_values)}, most missing first):"
+        worst = sorted(quality.missing_values.items(), key=lambda item: -item[1])
+        lines = [f"  - {col}: {count:,} missing ({quality.missing_percentages[col]:.1f}%)"
+                 for col, count in worst]
+        return self.page(header, lines, offset, 'columns')
+    
+    def analyze_column(self, column_name: str) -> str:
+        """Analyze a specific column in detail.
+        Input: Column name (e.g., 'age', 'sex', 'fare')
+        Returns: Statistics, insights, and distribution info for that column."""
+        if not column_name or column_name.strip() == "":
+            return "Error: Please provide a column name"
+        
+        col = column_name.strip()
+        if col not in self.eda.df.columns:
+            available = ', '.join(self.eda.df.columns.tolist()[:10])
+            return f"Error: Column '{col}' not found. Available: {available}..."
+        
+        analysis = self.eda.analyze_column(col)
         
-        @tool
-        def analyze_column(column_name: str) -> str:
-            """Analyze a specific column in detail.
-            Input: Column name (e.g., 'age', 'sex', 'fare')
-            Returns: Statistics, insights, and distribution info for that column."""
-            if not column_name or column_name.strip() == "":
-                return "Error: Please provide a column name"
-            
-            col = column_name.strip()
-            if col not in tools_instance.eda.df.columns:
-                available = ', '.join(tools_instance.eda.df.columns.tolist()[:10])
-                return f"Error: Column '{col}' not found. Available: {available}..."
-            
-            analyzer = tools_instance.eda.factory.get_analyzer(tools_instance.eda.df[col])
-            analysis = analyzer.analyze(tools_instance.eda.df[col])
-            
-            result = f"""Column Analysis: {analysis.name}
+        result = f"""Column Analysis: {analysis.name}
 - Type: {analysis.column_type.value}
 - Unique Values: {analysis.unique_count:,}
 - Missing: {analysis.missing_count:,} ({analysis.missing_percentage:.1f}%)
@@ -72,99 +122,115 @@ Statistics:
 
 Insights:
 """
-            if analysis.insights:
-                result += '\n'.join(f"  - {insight}" for insight in analysis.insights)
-            else:
-                result += "  - No significant insights detected"
-            
-            return result
+        if analysis.insights:
+            result += '\n'.join(f"  - {insight}" for insight in analysis.insights)
+        else:
+            result += "  - No significant insights detected"
         
-        @tool
-        def get_correlations(threshold: str = "0.7") -> str:
-            """Get highly correlated feature pairs.
-            Input: Correlation threshold (default: 0.7)
-            Returns: Pairs of features with correlation above threshold."""
-            try:
-                thresh = float(threshold) if threshold else 0.7
-            except:
-                thresh = 0.7
-            
-            high_corrs = tools_instance.eda.get_high_correlations(threshold=thresh)
-            
-            if not high_corrs:
-                return f"No correlations found above threshold {thresh}"
-            
-            result = f"Highly Correlated Features (|r| > {thresh}):\n\n"
-            for col1, col2, corr in high_corrs:
-                result += f"  - {col1} ↔ {col2}: r = {corr:.3f}\n"
-            
-            return result
+        if analysis.confidence_intervals:
+            result += ("\n\nThese are ESTIMATES from a sample. Confidence intervals:\n"
+                       f"  {format_intervals(analysis)}\n"
+                       "Use analyze_column_exact for exact figures.")
+        return self.clip(result)
+    
+    def analyze_column_exact(self, column_name: str) -> str:
+        """Analyze a column exactly over the full dataset, replacing sampled estimates.
+        Input: Column name (e.g., 'age')
+        Returns: Exact statistics. Slower than analyze_column on large sampled datasets."""
+        col = (column_name or "").strip()
+        if col not in self.eda.df.columns:
+            available = ', '.join(self.eda.df.columns.tolist()[:10])
+            return f"Error: Column '{col}' not found. Available: {available}..."
+        
+        analysis = self.eda.analyze_column_exact(col)
+        return self.clip(f"""Exact Column Analysis: {analysis.name}
+- Type: {analysis.column_type.value}
+- Unique Values: {analysis.unique_count:,}
+- Missing: {analysis.missing_count:,} ({analysis.missing_percentage:.1f}%)
+
+Statistics:
+{json.dumps(analysis.statistics, indent=2, default=str)}""")
+    
+    def get_correlations(self, threshold: str = "0.7", offset: int = 0) -> str:
+        """Get highly correlated feature pairs, strongest first.
+        Input: Correlation threshold (default: 0.7) and offset (default 0) of the first pair listed
+        Returns: Pairs of features with correlation above threshold."""
+        try:
+            thresh = float(threshold) if threshold else 0.7
+        except:
+            thresh = 0.7
+        
+        high_corrs = self.eda.get_high_correlations(threshold=thresh)
         
-        @tool
-        def get_automated_insights(query: str = "") -> str:
-            """Get automated insights and recommendations for the dataset.
-            Returns: Key findings, patterns, and suggested next steps."""
-            insights = tools_instance.eda.generate_insights()
-            
-            result = "Automated Insights:\n\n"
-            for category, items in insights.items():
-                if items:
-                    result += f"{category.replace('_', ' ').title()}:\n"
-                    for item in items:
-                        result += f"  • {item}\n"
-                    result += "\n"
-            
-            return result
+        if not high_corrs:
+            return f"No correlations found above threshold {thresh}"
         
-        @tool
-        def generate_full_report(format_type: str = "markdown") -> str:
-            """Generate a complete EDA report.
-            Input: Format type ('markdown' or 'json')
-            Returns: Full EDA report with all sections."""
-            builder = ReportBuilder(tools_instance.eda)
+        header = f"Highly Correlated Features (|r| > {thresh}, {len(high_corrs)} pairs):\n"
+        lines = [f"  - {col1} ↔ {col2}: r = {corr:.3f}" for col1, col2, corr in high_corrs]
+        return self.page(header, lines, offset, 'pairs')
+    
+    def get_automated_insights(self, offset: int = 0) -> str:
+        """Get automated insights and recommendations for the dataset.
+        Input: offset (default 0) of the first insight listed
+        Returns: Key findings, patterns, and suggested next steps."""
+        insights = self.eda.generate_insights()
+        # Recommendations and quality first: on wide datasets per-column findings are the long tail
+        order = ['recommendations', 'data_quality', 'correlations', 'distributions']
+        categories = sorted(insights, key=lambda c: order.index(c) if c in order else len(order))
+        lines = [f"  • {category.replace('_', ' ').title()}: {item}"
+                 for category in categories for item in insights[category]]
+        return self.page("Automated Insights:\n", lines, offset, 'insights')
+    
+    def generate_full_report(self, format_type: str = "markdown", offset: int = 0) -> str:
+        """Generate a complete EDA report: metadata, quality and insights, then one entry per column.
+        Input: Format type ('markdown' or 'json') and offset (default 0) of the first column listed;
+        the column section is paged and later pages repeat only the columns.
+        Returns: EDA report with all sections."""
+        eda = self.eda
+        analyses = eda.analyze_columns()
+        if format_type.lower() == "json":
+            header = json.dumps({'metadata': asdict(eda.get_metadata()),
+                                 'quality': asdict(eda.get_quality_report()),
+                                 'insights': eda.generate_insights()}, default=str)
+            header += "\nColumns (one JSON object each):"
+            lines = [json.dumps(analysis_dict(analysis), default=str) for analysis in analyses]
+        else:
+            builder = ReportBuilder(eda)
             builder.add_metadata_section()\
                    .add_quality_section()\
-                   .add_column_analysis_section()\
                    .add_insights_section()
-            
-            if format_type.lower() == "json":
-                return builder.build_json()
-            return builder.build_markdown()
+            header = builder.build_markdown() + "\n## 📈 Column Analysis\n"
+            lines = [ReportBuilder.column_block(analysis) for analysis in analyses]
+        if offset:
+            header = "Column Analysis (continued):"
+        return self.page(header, lines, offset, 'columns')
+    
+    def compare_columns(self, columns: str, offset: int = 0) -> str:
+        """Compare statistics between multiple columns.
+        Input: Comma-separated column names (e.g., 'age,fare,pclass') and offset (default 0)
+        of the first column listed when there are many
+        Returns: Comparative statistics for the specified columns."""
+        if not columns or columns.strip() == "":
+            return "Error: Please provide comma-separated column names"
+        
+        cols = [c.strip() for c in columns.split(",")]
+        invalid = [c for c in cols if c not in self.eda.df.columns]
+        
+        if invalid:
+            return f"Error: Invalid columns: {', '.join(invalid)}"
         
-        @tool
-        def compare_columns(columns: str) -> str:
-            """Compare statistics between multiple columns.
-            Input: Comma-separated column names (e.g., 'age,fare,pclass')
-            Returns: Comparative statistics for the specified columns."""
-            if not columns or columns.strip() == "":
-                return "Error: Please provide comma-separated column names"
-            
-            cols = [c.strip() for c in columns.split(",")]
-            invalid = [c for c in cols if c not in tools_instance.eda.df.columns]
-            
-            if invalid:
-                return f"Error: Invalid columns: {', '.join(invalid)}"
-            
-            result = "Column Comparison:\n\n"
-            for col in cols:
-                analyzer = tools_instance.eda.factory.get_analyzer(tools_instance.eda.df[col])
-                analysis = analyzer.analyze(tools_instance.eda.df[col])
-                result += f"{col} ({analysis.column_type.value}):\n"
-                result += f"  - Unique: {analysis.unique_count:,}\n"
-                result += f"  - Missing: {analysis.missing_percentage:.1f}%\n"
-                if analysis.column_type == ColumnType.NUMERIC:
-                    result += f"  - Mean: {analysis.statistics.get('mean', 'N/A'):.2f}\n"
-                    result += f"  - Std: {analysis.statistics.get('std', 'N/A'):.2f}\n"
-                result += "\n"
-            
-            return result
+        blocks = []
+        for col in cols:
+            analysis = self.eda.analyze_column(col)
+            block = f"{col} ({analysis.column_type.value}):\n"
+            block += f"  - Unique: {analysis.unique_count:,}\n"
+            block += f"  - Missing: {analysis.missing_percentage:.1f}%\n"
+            if analysis.column_type == ColumnType.NUMERIC:
+                block += f"  - Mean: {analysis.statistics.get('mean', 'N/A'):.2f}\n"
+                block += f"  - Std: {analysis.statistics.get('std', 'N/A'):.2f}\n"
+            if analysis.confidence_intervals:
+                keys = ['unique_count', 'missing_percentage', 'mean', 'std']
+                block += f"  - Estimated, intervals: {format_intervals(analysis, keys)}\n"
+            blocks.append(block)
         
-        return [
-            get_dataset_overview,
-            get_data_quality,
-            analyze_column,
-            get_correlations,
-            get_automated_insights,
-            generate_full_report,
-            compare_columns
-        ]
\ No newline at end of file
+        return self.page("Column Comparison:\n", blocks, offset, 'columns')
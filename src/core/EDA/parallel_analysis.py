@@ -0,0 +1,324 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+import heapq
+import math
+import os
+import sys
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from classes.data_classes import ColumnAnalysis
+from core.Analyzers.factory_analyzer import AnalyzerFactory, ColumnTypePlan
+from core.Analyzers.numerical_analyzer import NumericAnalyzer
+from core.Analyzers.vectorized_numeric import VectorizedNumericEngine
+
+
+def analyze_frame(df: pd.DataFrame, columns: Sequence[Any], factory: AnalyzerFactory,
+                  numeric_engine: Optional[VectorizedNumericEngine] = None,
+                  plan: Optional[ColumnTypePlan] = None) -> List[ColumnAnalysis]:
+    """Run the analyzer pipeline over ``columns`` of ``df``, preserving order.
+
+    Columns are routed by ``plan`` when one is given, else by ``factory``.
+    Numeric columns are profiled together by ``numeric_engine`` when one is
+    given; every other column goes through its ``IColumnAnalyzer``.
+    """
+    use_plan = plan is not None and df.columns.is_unique
+    # Each column is fetched once so per-Series caches (distinct counts) are reused
+    analyzers = [(col, series, plan.analyzer(col) if use_plan else factory.get_analyzer(series))
+                 for col, series in ((col, df[col]) for col in columns)]
+
+    batched = {}
+    if numeric_engine is not None and df.columns.is_unique:
+        numeric_cols = [col for col, _, analyzer in analyzers if isinstance(analyzer, NumericAnalyzer)]
+        if numeric_cols:
+            batched = {a.name: a for a in numeric_engine.analyze(df, numeric_cols)}
+
+    return [batched[col] if col in batched else analyzer.analyze(series)
+            for col, series, analyzer in analyzers]
+
+
+# Relative per-row cost of each dtype family, used to balance batches
+DTYPE_COST = {
+    'numeric': 1.0,
+    'bool': 0.5,
+    'datetime': 1.5,
+    'categorical': 1.0,
+    'object': 4.0,
+}
+
+
+@dataclass
+class _SharedBuffer:
+    """Handle to a NumPy array stored in a shared memory segment"""
+    shm_name: str
+    dtype: str
+    length: int
+
+
+@dataclass
+class _ColumnSpec:
+    """Picklable description of a column exported to a worker process"""
+    name: Any
+    kind: str
+    buffers: List[_SharedBuffer] = field(default_factory=list)
+    payload: Any = None
+
+
+class ParallelColumnAnalyzer:
+    """Runs the AnalyzerFactory / IColumnAnalyzer pipeline on a worker pool.
+
+    Columns are split into batches balanced by estimated cost (rows x dtype
+    weight x cardinality) and analyzed concurrently. The thread backend shares
+    the DataFrame directly; the process backend exports column buffers
+    through shared memory so workers map them instead of unpickling copies,
+    while object columns are analyzed on threads in the parent; the two
+    pools split ``n_workers`` by estimated cost, so together they never use
+    more. Results are returned in the original column order.
+    """
+
+    def __init__(self, n_workers: Optional[int] = None, backend: str = 'thread',
+                 vectorized: bool = True, batches_per_worker: int = 4,
+                 factory: Optional[AnalyzerFactory] = None):
+        if backend not in ('thread', 'process'):
+            raise ValueError(f"Unknown parallel backend '{backend}' (expected 'thread' or 'process')")
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.backend = backend
+        self.vectorized = vectorized
+        self.batches_per_worker = batches_per_worker
+        # Analyzers are stateless apart from the locked distinct-count cache,
+        # so threads share the factory and processes receive a pickled copy
+        self.factory = factory or AnalyzerFactory()
+
+    def analyze(self, df: pd.DataFrame, plan: Optional[ColumnTypePlan] = None,
+                columns: Optional[Sequence[Any]] = None) -> List[ColumnAnalysis]:
+        """Analyze ``columns`` of ``df`` (default: all) in parallel, routed by ``plan`` if given"""
+        columns = df.columns.tolist() if columns is None else list(columns)
+        if not columns:
+            return []
+        if not df.columns.is_unique:
+            # Batches address columns by label, which is ambiguous here
+            return analyze_frame(df, columns, self.factory, self._engine())
+
+        n_batches = self.n_workers * self.batches_per_worker
+        if self.backend == 'thread':
+            results = self._run_threads(df, self.plan_batches(df, n_batches, columns), plan)
+        else:
+            # Python objects cannot live in shared memory and rebuilding them in
+            # every worker copies the column, so object columns stay on threads
+            local = [col for col in columns if _is_object(df[col])]
+            shared = [col for col in columns if not _is_object(df[col])]
+            thread_workers, process_workers = self._split_workers(df, local, shared)
+            if thread_workers + process_workers > self.n_workers:
+                # A single worker: run the pools one after the other
+                results = self._run_threads(df, self.plan_batches(df, n_batches, local), plan, 1)
+                results += self._run_processes(df, self.plan_batches(df, n_batches, shared), plan, 1)
+            else:
+                with ThreadPoolExecutor(max_workers=max(thread_workers, 1)) as threads:
+                    local_batches = self.plan_batches(df, thread_workers * self.batches_per_worker, local)
+                    local_results = self._submit_threads(threads, df, local_batches, plan)
+                    shared_batches = self.plan_batches(df, process_workers * self.batches_per_worker, shared)
+                    results = self._run_processes(df, shared_batches, plan, process_workers) if shared else []
+                    results += [future.result() for future in local_results]
+
+        by_name = {analysis.name: analysis for batch in results for analysis in batch}
+        return [by_name[col] for col in columns]
+
+    def _split_workers(self, df: pd.DataFrame, local: Sequence[Any], shared: Sequence[Any]) -> Tuple[int, int]:
+        """(threads, processes) sharing ``n_workers`` in proportion to the estimated cost of their columns"""
+        if not local or not shared:
+            return (self.n_workers, 0) if local else (0, self.n_workers)
+        if self.n_workers < 2:
+            return 1, 1
+        local_cost = sum(self.estimate_cost(df[col]) for col in local)
+        shared_cost = sum(self.estimate_cost(df[col]) for col in shared)
+        threads = round(self.n_workers * local_cost / (local_cost + shared_cost))
+        threads = min(max(threads, 1), self.n_workers - 1)
+        return threads, self.n_workers - threads
+
+    def _engine(self) -> Optional[VectorizedNumericEngine]:
+        return VectorizedNumericEngine() if self.vectorized else None
+
+    @staticmethod
+    def estimate_cost(series: pd.Series, sample_size: int = 1000) -> float:
+        """Estimate the relative cost of analyzing a column"""
+        rows = max(len(series), 1)
+        dtype = series.dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            family = 'bool'
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            family = 'datetime'
+        elif isinstance(dtype, pd.CategoricalDtype):
+            family = 'categorical'
+        elif pd.api.types.is_numeric_dtype(dtype):
+            family = 'numeric'
+        else:
+            family = 'object'
+
+        cost = rows * DTYPE_COST[family]
+        if family == 'object':
+            # Hashing cost grows with cardinality; probe a small head sample
+            sample = series.iloc[:sample_size]
+            ratio = sample.nunique() / max(len(sample), 1)
+            cost *= 1 + math.log10(1 + ratio * rows)
+        return cost
+
+    def plan_batches(self, df: pd.DataFrame, n_batches: int,
+                     columns: Optional[Sequence[Any]] = None) -> List[List[Any]]:
+        """Split columns into cost-balanced batches (longest processing time first)"""
+        columns = df.columns if columns is None else columns
+        costs = sorted(((self.estimate_cost(df[col]), i, col) for i, col in enumerate(columns)),
+                       reverse=True)
+        n_batches = max(1, min(n_batches, len(costs)))
+        heap = [(0.0, b) for b in range(n_batches)]
+        batches: List[List[Tuple[int, Any]]] = [[] for _ in range(n_batches)]
+        for cost, i, col in costs:
+            load, b = heapq.heappop(heap)
+            batches[b].append((i, col))
+            heapq.heappush(heap, (load + cost, b))
+        # Keep original order inside each batch so vectorized blocks stay contiguous
+        return [[col for _, col in sorted(batch, key=lambda item: item[0])] for batch in batches if batch]
+
+    def _run_threads(self, df: pd.DataFrame, batches: List[List[Any]], plan: Optional[ColumnTypePlan] = None,
+                     workers: Optional[int] = None) -> List[List[ColumnAnalysis]]:
+        if not batches:
+            return []
+        with ThreadPoolExecutor(max_workers=workers or self.n_workers) as pool:
+            return [future.result() for future in self._submit_threads(pool, df, batches, plan)]
+
+    def _submit_threads(self, pool: ThreadPoolExecutor, df: pd.DataFrame, batches: List[List[Any]],
+                        plan: Optional[ColumnTypePlan] = None) -> List[Future]:
+        return [pool.submit(analyze_frame, df, batch, self.factory, self._engine(), plan)
+                for batch in batches]
+
+    def _run_processes(self, df: pd.DataFrame, batches: List[List[Any]], plan: Optional[ColumnTypePlan] = None,
+                       workers: Optional[int] = None) -> List[List[ColumnAnalysis]]:
+        # Only ``workers`` batches are exported at a time, so the shared
+        # segments never hold more than that share of the frame
+        if not batches:
+            return []
+        workers = workers or self.n_workers
+        results: List[List[ColumnAnalysis]] = []
+        pending: Dict[Future, List[SharedMemory]] = {}
+        queue = list(batches)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            try:
+                while queue or pending:
+                    while queue and len(pending) < workers:
+                        specs, segments = _export_columns(df, queue.pop(0))
+                        pending[pool.submit(_analyze_shared_batch, specs, self.vectorized,
+                                            self.factory, plan)] = segments
+                    done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _release(pending.pop(future))
+                        results.append(future.result())
+            finally:
+                for segments in pending.values():
+                    _release(segments)
+        return results
+
+
+def _is_object(series: pd.Series) -> bool:
+    """Whether ``series`` holds Python objects (strings, mixed values)"""
+    return isinstance(series.dtype, np.dtype) and series.dtype == object
+
+
+def _share_array(values: np.ndarray, segments: List[SharedMemory]) -> _SharedBuffer:
+    values = np.ascontiguousarray(values)
+    shm = SharedMemory(create=True, size=max(values.nbytes, 1))
+    segments.append(shm)
+    np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+    return _SharedBuffer(shm_name=shm.name, dtype=values.dtype.str, length=len(values))
+
+
+def _export_columns(df: pd.DataFrame, columns: List[Any]) -> Tuple[List[_ColumnSpec], List[SharedMemory]]:
+    """Copy a batch of columns into shared memory segments"""
+    specs: List[_ColumnSpec] = []
+    segments: List[SharedMemory] = []
+    try:
+        for col in columns:
+            series = df[col]
+            dtype = series.dtype
+            values = series.array
+
+            if isinstance(dtype, pd.CategoricalDtype):
+                specs.append(_ColumnSpec(col, 'categorical', [_share_array(values.codes, segments)],
+                                         payload=dtype))
+            elif isinstance(dtype, pd.DatetimeTZDtype):
+                specs.append(_ColumnSpec(col, 'datetimetz', [_share_array(values.asi8, segments)],
+                                         payload=dtype))
+            elif hasattr(values, '_data') and hasattr(values, '_mask'):
+                # Nullable extension arrays (Int64, Float64, boolean)
+                specs.append(_ColumnSpec(col, 'masked', [_share_array(values._data, segments),
+                                                         _share_array(values._mask, segments)],
+                                         payload=dtype))
+            elif isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+                specs.append(_ColumnSpec(col, 'numpy', [_share_array(series.to_numpy(), segments)]))
+            else:
+                specs.append(_ColumnSpec(col, 'pickled', payload=series))
+    except BaseException:
+        _release(segments)
+        raise
+    return specs, segments
+
+
+def _release(segments: List[SharedMemory]) -> None:
+    for shm in segments:
+        shm.close()
+        shm.unlink()
+
+
+def _attach(name: str) -> SharedMemory:
+    """Attach to a segment owned by the parent without registering it for cleanup"""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _analyze_shared_batch(specs: List[_ColumnSpec], vectorized: bool,
+                          factory: AnalyzerFactory,
+                          plan: Optional[ColumnTypePlan] = None) -> List[ColumnAnalysis]:
+    """Worker entry point: rebuild columns over shared buffers and analyze them"""
+    attached: List[SharedMemory] = []
+
+    def view(buffer: _SharedBuffer) -> np.ndarray:
+        shm = _attach(buffer.shm_name)
+        attached.append(shm)
+        return np.ndarray((buffer.length,), dtype=np.dtype(buffer.dtype), buffer=shm.buf)
+
+    try:
+        columns = {}
+        for spec in specs:
+            if spec.kind == 'numpy':
+                values = view(spec.buffers[0])
+            elif spec.kind == 'masked':
+                array_type = spec.payload.construct_array_type()
+                values = array_type(view(spec.buffers[0]), view(spec.buffers[1]))
+            elif spec.kind == 'categorical':
+                values = pd.Categorical.from_codes(view(spec.buffers[0]), dtype=spec.payload)
+            elif spec.kind == 'datetimetz':
+                values = pd.DatetimeIndex(view(spec.buffers[0]).view(f'M8[{spec.payload.unit}]'),
+                                          tz='UTC').tz_convert(spec.payload.tz)
+            else:
+                values = spec.payload.array
+            columns[spec.name] = pd.Series(values, name=spec.name, copy=False)
+
+        frame = pd.DataFrame(columns, copy=False)
+        engine = VectorizedNumericEngine() if vectorized else None
+        results = analyze_frame(frame, list(columns), factory, engine, plan)
+        del frame, columns
+        return results
+    finally:
+        for shm in attached:
+            try:
+                shm.close()
+            except BufferError:
+                pass
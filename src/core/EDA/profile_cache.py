@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, Optional
+
+from core.EDA.eda_service import EDAService
+
+# Bump whenever analyzer output changes so stale profiles are never served
+ANALYZER_VERSION = '6'
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'eda_agent', 'profiles')
+
+
+def file_fingerprint(path: str, full_hash: bool = False, sample_blocks: int = 16,
+                     block_size: int = 64 * 1024) -> str:
+    """Fast content fingerprint of a file.
+
+    By default hashes the size, modification time and ``sample_blocks``
+    evenly spaced blocks (always including the first and last), which reads
+    about 1 MB whatever the file size. ``full_hash`` hashes the whole
+    content instead and ignores the modification time, so copies and
+    touched files still match.
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        if full_hash:
+            digest.update(f"full:{size}".encode())
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        else:
+            digest.update(f"sampled:{size}:{os.stat(path).st_mtime_ns}".encode())
+            last = max(size - block_size, 0)
+            offsets = sorted({last * i // max(sample_blocks - 1, 1) for i in range(sample_blocks)})
+            for offset in offsets:
+                f.seek(offset)
+                digest.update(f.read(block_size))
+    return digest.hexdigest()
+
+
+class ProfileCache:
+    """Disk cache of EDAService results with size-capped LRU eviction.
+
+    Each entry holds the metadata, quality report, column analyses and
+    correlation matrix of one dataset under a key derived from its
+    fingerprint, the service settings and ``ANALYZER_VERSION``. Reads bump
+    an entry's modification time; when the directory grows past
+    ``max_bytes`` the least recently used entries are deleted. Entries are
+    pickles, so only point the cache at a directory you trust.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def make_key(self, fingerprint: str, settings: Optional[Dict[str, Any]] = None) -> str:
+        payload = json.dumps({'fingerprint': fingerprint, 'version': ANALYZER_VERSION,
+                              'settings': settings or {}}, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached results for ``key``, or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                results = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated or written by an incompatible version
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return results
+
+    def put(self, key: str, results: Dict[str, Any]) -> None:
+        """Store results atomically, then evict down to the size cap"""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self._evict()
+
+    def load_into(self, service: EDAService, key: str) -> bool:
+        """Fill ``service``'s result caches from disk; True on a hit"""
+        results = self.get(key)
+        if results is None:
+            return False
+        service.load_results(results)
+        return True
+
+    def store(self, service: EDAService, key: str) -> None:
+        """Compute (if needed) and persist every result of ``service``"""
+        self.put(key, service.get_results())
+
+    def clear(self) -> int:
+        """Delete every entry; returns the number removed"""
+        removed = 0
+        for entry in self._entries():
+            self._remove(entry.path)
+            removed += 1
+        return removed
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [entry for entry in os.scandir(self.directory)
+                if entry.is_file() and entry.name.endswith('.pkl')]
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
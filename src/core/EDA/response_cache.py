@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import pandas as pd
+
+from core.EDA.profile_cache import ANALYZER_VERSION
+
+DEFAULT_RESPONSE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'eda_agent', 'responses')
+
+
+def normalize_query(query: str) -> str:
+    """Query text with runs of whitespace collapsed and trailing punctuation dropped.
+
+    Case is kept: column names are case-sensitive, so "Age" and "age" may
+    be different questions.
+    """
+    return re.sub(r'\s+', ' ', query).strip().rstrip('?.!').strip()
+
+
+def dataframe_fingerprint(df: pd.DataFrame) -> Optional[str]:
+    """Content hash of a DataFrame (labels, dtypes and values), or None if a value is unhashable"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([list(map(str, df.columns)), list(map(str, df.dtypes))]).encode())
+    try:
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    except TypeError:
+        # Lists or dicts in object columns
+        return None
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Agent answers keyed by dataset, model, system prompt and question.
+
+    A bounded in-memory LRU answers repeated questions within a session;
+    with ``directory`` set, answers are also written there as small JSON
+    files and reused by later runs until they are ``ttl_seconds`` old.
+    Expired files are swept on write at most every ``expire_interval``
+    seconds. One instance can be shared between threads (as Streamlit
+    sessions do): the memory tier and ``stats`` are guarded by a lock.
+    """
+
+    def __init__(self, max_entries: int = 256, directory: Optional[str] = None,
+                 ttl_seconds: float = 24 * 3600, expire_interval: float = 600):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.expire_interval = expire_interval
+        self._memory: 'OrderedDict[str, str]' = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+        self._last_expire = float('-inf')
+
+    @staticmethod
+    def make_key(dataset_fingerprint: str, model: str, prompt_version: str, query: str) -> str:
+        payload = json.dumps({'dataset': dataset_fingerprint, 'model': model, 'prompt': prompt_version,
+                              'analyzer': ANALYZER_VERSION, 'query': normalize_query(query)}, sort_keys=True)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached answer for ``key``, or None"""
+        with self._lock:
+            answer = self._memory.get(key)
+            if answer is not None:
+                self._memory.move_to_end(key)
+        if answer is None and self.directory is not None:
+            answer = self._read(key)
+            if answer is not None:
+                self._remember(key, answer)
+        with self._lock:
+            self.stats['hits' if answer is not None else 'misses'] += 1
+        return answer
+
+    def put(self, key: str, answer: str) -> None:
+        self._remember(key, answer)
+        if self.directory is not None:
+            try:
+                self._write(key, answer)
+            except OSError:
+                # The disk tier is best effort; the answer is still cached in memory
+                pass
+
+    def clear(self) -> int:
+        """Drop every entry in memory and on disk; returns the number of files removed"""
+        with self._lock:
+            self._memory.clear()
+        removed = 0
+        for path in self._files():
+            self._remove(path)
+            removed += 1
+        return removed
+
+    def _remember(self, key: str, answer: str) -> None:
+        with self._lock:
+            self._memory[key] = answer
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self._remove(path)
+            return None
+        if time.time() - entry.get('created', 0) > self.ttl_seconds:
+            self._remove(path)
+            return None
+        return entry.get('answer')
+
+    def _write(self, key: str, answer: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'created': time.time(), 'answer': answer}, f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self._expire()
+
+    def _expire(self) -> None:
+        """Remove expired files, unless the directory was swept less than ``expire_interval`` ago"""
+        now = time.time()
+        with self._lock:
+            if now - self._last_expire < self.expire_interval:
+                return
+            self._last_expire = now
+        for path in self._files():
+            try:
+                if now - os.path.getmtime(path) > self.ttl_seconds:
+                    self._remove(path)
+            except OSError:
+                continue
+
+    def _files(self):
+        if self.directory is None or not os.path.isdir(self.directory):
+            return []
+        return [entry.path for entry in os.scandir(self.directory)
+                if entry.is_file() and entry.name.endswith('.json')]
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,133 @@
+from typing import Any, List, Set
+
+import numpy as np
+import pandas as pd
+
+from classes.data_classes import (ColumnAnalysis, DataQualityReport, DatasetMetadata, DuplicateReport,
+                                  SamplingConfig)
+from core.EDA.duplicates import DuplicateDetector
+from core.EDA.eda_service import EDAService
+from core.EDA.sampling import SampleEstimator, WeightedSampleEstimator, draw_sample, sample_weights
+
+
+class SampledEDAService(EDAService):
+    """EDA service answering from a sample of the dataset.
+
+    ``self.df`` is the sample drawn by ``sampling`` and ``self.population``
+    the full frame. Column analyses are population estimates with
+    ``confidence_intervals`` and every estimated field listed in
+    ``approximate_statistics``; rows of a ``head_tail`` or ``stratified``
+    sample are weighted by the population rows they stand for. Metadata
+    reports the population shape and ``sampled_rows``, and missing counts
+    are scaled to the population and flagged in ``approximate_fields``.
+    Duplicates are counted exactly from fingerprints of every population
+    row, since few duplicate pairs survive sampling. ``analyze_column_exact``
+    replaces the estimate of one column with an exact analysis of the full
+    column.
+    """
+
+    def __init__(self, df: pd.DataFrame, sampling: SamplingConfig, **service_kwargs: Any):
+        super().__init__(draw_sample(df, sampling), **service_kwargs)
+        self.sampling = sampling
+        self.exact_columns: Set[Any] = set()
+        self._set_population(df)
+
+    def _set_population(self, df: pd.DataFrame) -> None:
+        self.population = df
+        self.weights = sample_weights(df, self.df, self.sampling)
+        if self.weights is None:
+            self.estimator = SampleEstimator(len(df), self.sampling.confidence)
+        else:
+            self.estimator = WeightedSampleEstimator(len(df), self.weights, self.sampling.confidence)
+
+    @property
+    def is_sampled(self) -> bool:
+        return len(self.df) < len(self.population)
+
+    def get_metadata(self) -> DatasetMetadata:
+        if self._metadata is None:
+            metadata = super().get_metadata()
+            if self.is_sampled:
+                scale = len(self.population) / len(self.df)
+                metadata.shape = self.population.shape
+                metadata.row_count = len(self.population)
+                metadata.memory_usage_mb = round(metadata.memory_usage_mb * scale, 2)
+                metadata.sampled_rows = len(self.df)
+        return self._metadata
+
+    def get_quality_report(self) -> DataQualityReport:
+        if self._quality_report is None:
+            quality = super().get_quality_report()
+            if self.is_sampled:
+                rows = len(self.population)
+                if self.weights is None:
+                    estimates = {col: count * rows / len(self.df) for col, count in quality.missing_values.items()}
+                else:
+                    weighted = self.weights @ self.df.isna().to_numpy(dtype=np.float64)
+                    estimates = {col: weighted[self.df.columns.get_loc(col)] for col in quality.missing_values}
+                quality.missing_values = {col: int(round(count)) for col, count in estimates.items()}
+                quality.missing_percentages = {col: round(count / rows * 100, 2)
+                                               for col, count in quality.missing_values.items()}
+                quality.missing_cells = sum(quality.missing_values.values())
+                quality.total_cells = self.population.shape[0] * self.population.shape[1]
+                quality.duplicate_percentage = round(quality.duplicate_rows / rows * 100, 2)
+                quality.approximate_fields = ['missing_values', 'missing_percentages', 'missing_cells']
+        return self._quality_report
+
+    def get_duplicate_report(self, top_n: int = 10, bits: int = 64,
+                             max_memory_mb: float = 256.0) -> DuplicateReport:
+        """Duplicate rows of the full population, from row fingerprints"""
+        detector = DuplicateDetector(bits=bits, max_memory_mb=max_memory_mb, track_groups=top_n > 0)
+        try:
+            return detector.update(self.population).report(top_n)
+        finally:
+            detector.close()
+
+    def analyze_column_exact(self, column: Any) -> ColumnAnalysis:
+        """Analyze ``column`` over the full dataset and cache it in place of the estimate"""
+        with self._cache_lock:
+            cached = self._column_cache.get(column)
+        if column in self.exact_columns and cached is not None:
+            self._record(hits=1)
+            return cached
+        analysis = self.get_analyzer(column).analyze(self.population[column])
+        with self._cache_lock:
+            self.exact_columns.add(column)
+            if self._column_analyses is not None:
+                self._column_cache.update((a.name, a) for a in self._column_analyses)
+                self._column_analyses = None
+            self._column_cache[column] = analysis
+        self._record(misses=1)
+        return analysis
+
+    def append(self, rows_df: pd.DataFrame) -> None:
+        """Add rows to the population and redraw the sample.
+
+        Estimates are recomputed from the new sample on next use; columns
+        escalated with ``analyze_column_exact`` stay exact.
+        """
+        if set(rows_df.columns) != set(self.population.columns) or not self.population.columns.is_unique:
+            raise ValueError("Appended rows must have the same columns as the dataset")
+        rows_df = rows_df[self.population.columns.tolist()]
+        with self._analyze_lock:
+            population = pd.concat([self.population, rows_df],
+                                   ignore_index=isinstance(self.population.index, pd.RangeIndex))
+            self.df = draw_sample(population, self.sampling)
+            self._set_population(population)
+            self.source = None
+            self.dtype_optimization = None
+            self._column_plan = None
+            self._reset_results()
+
+    def _compute_columns(self, columns: List[Any]) -> List[ColumnAnalysis]:
+        analyses = super()._compute_columns(columns)
+        if not self.is_sampled:
+            return analyses
+        results = []
+        for analysis in analyses:
+            analyzer = self.get_analyzer(analysis.name)
+            if analysis.name in self.exact_columns:
+                results.append(analyzer.analyze(self.population[analysis.name]))
+            else:
+                results.append(self.estimator.estimate(analysis, self.df[analysis.name], analyzer))
+        return results
@@ -0,0 +1,429 @@
+import math
+from statistics import NormalDist
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from classes.data_classes import ColumnAnalysis, ColumnType, SamplingConfig
+from core.Analyzers.binning import scale_payload
+from interface.Analyzer_interface import IColumnAnalyzer
+
+SAMPLING_METHODS = ('uniform', 'stratified', 'head_tail')
+
+
+def draw_sample(df: pd.DataFrame, config: SamplingConfig) -> pd.DataFrame:
+    """Rows of ``df`` chosen by ``config``, in their original order.
+
+    ``uniform`` draws ``size`` rows without replacement (what a reservoir
+    over the frame would hold); ``stratified`` allocates ``size``
+    proportionally to the values of ``stratify_by``, keeping at least one
+    row per stratum; ``head_tail`` keeps the first ``head_rows`` rows and
+    fills the rest uniformly from the remainder.
+    """
+    if config.method not in SAMPLING_METHODS:
+        raise ValueError(f"Unknown sampling method '{config.method}', use one of {SAMPLING_METHODS}")
+    n = len(df)
+    if config.size >= n:
+        return df
+    rng = np.random.default_rng(config.seed)
+
+    if config.method == 'uniform':
+        positions = rng.choice(n, size=config.size, replace=False)
+    elif config.method == 'stratified':
+        if config.stratify_by not in df.columns:
+            raise ValueError(f"Stratification column '{config.stratify_by}' not found")
+        # Ranking random keys within each stratum picks a uniform subset of it
+        groups = pd.Series(rng.random(n)).groupby(df[config.stratify_by].to_numpy(), dropna=False)
+        quota = np.maximum(1, np.round(groups.transform('size').to_numpy() * (config.size / n)))
+        positions = np.flatnonzero(groups.rank(method='first').to_numpy() <= quota)
+    else:
+        head = min(config.head_rows, config.size)
+        tail = rng.choice(n - head, size=config.size - head, replace=False) + head
+        positions = np.concatenate([np.arange(head), tail])
+    return df.iloc[np.sort(positions)]
+
+
+def sample_weights(df: pd.DataFrame, sample: pd.DataFrame, config: SamplingConfig) -> Optional[np.ndarray]:
+    """Population rows each row of ``sample`` stands for, or None when they all stand for as many.
+
+    ``uniform`` samples are self-weighting. The ``head_tail`` head is taken
+    whole, so its rows count once and each tail row stands for its share of
+    the rows after the head; ``stratified`` rows stand for their stratum
+    over its sample count, which rounding and the one-row minimum make
+    unequal. A ``head_tail`` sample that is all head has no rows standing
+    for the remainder and is scaled as uniform.
+    """
+    n, m = len(df), len(sample)
+    if config.method == 'uniform' or m == 0 or m >= n:
+        return None
+    if config.method == 'head_tail':
+        head = min(config.head_rows, config.size)
+        if head == 0 or head >= m:
+            return None
+        weights = np.ones(m)
+        weights[head:] = (n - head) / (m - head)
+        return weights
+    population = df[config.stratify_by].value_counts(dropna=False)
+    drawn = sample[config.stratify_by].value_counts(dropna=False)
+    weights = sample[config.stratify_by].map(population / drawn).to_numpy(dtype=np.float64)
+    return None if np.allclose(weights, weights[0]) else weights
+
+
+def normal_quantile(confidence: float) -> float:
+    """Two-sided z value of a confidence level"""
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def wilson_interval(successes: float, trials: int, z: float) -> Tuple[float, float]:
+    """Wilson score interval of a proportion"""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+class SampleEstimator:
+    """Turns a column analysis of a sample into population estimates.
+
+    Counts are scaled to the population and every numeric statistic gets a
+    ``confidence`` interval in ``ColumnAnalysis.confidence_intervals``:
+    normal intervals for means, standard deviations (kurtosis-adjusted),
+    skewness and kurtosis, distribution-free order-statistic intervals for
+    quantiles, Wilson intervals for shares and counts, and one-sided bounds
+    for extremes (the population minimum is at most the sample minimum).
+    Skewness and kurtosis intervals use normal-theory standard errors and
+    run narrow on heavy-tailed columns. Distinct counts
+    use the GEE estimator with its sqrt(N/m) ratio-error bound (and the
+    sample count as a floor). Intervals assume a uniform sample and include
+    the finite population correction; ``WeightedSampleEstimator`` handles
+    samples whose rows stand for unequal numbers of population rows.
+    """
+
+    def __init__(self, population_rows: int, confidence: float = 0.95):
+        self.population_rows = population_rows
+        self.confidence = confidence
+        self.z = normal_quantile(confidence)
+
+    def estimate(self, analysis: ColumnAnalysis, sample: pd.Series, analyzer: IColumnAnalyzer) -> ColumnAnalysis:
+        """Population estimate of ``analysis``, which ``analyzer`` computed on ``sample``"""
+        m, total = len(sample), self.population_rows
+        if m == 0 or m >= total:
+            return analysis
+        scale = total / m
+        intervals: Dict[str, Tuple[float, float]] = {}
+        missing_count = int(round(analysis.missing_count * scale))
+        unique_count, intervals['unique_count'] = self._distinct(sample)
+        intervals['missing_count'] = self._count_interval(analysis.missing_count, m, total)
+        intervals['missing_percentage'] = self._share_interval(analysis.missing_count, m)
+
+        stats = dict(analysis.statistics)
+        if analysis.column_type == ColumnType.NUMERIC:
+            estimated = self._numeric(stats, sample, analyzer, unique_count, missing_count, intervals)
+        elif analysis.column_type == ColumnType.DATETIME:
+            estimated = self._datetime(stats, analyzer, analysis.name, unique_count, missing_count, intervals)
+        else:
+            estimated = self._categorical(stats, sample, analyzer, analysis.name, unique_count,
+                                          missing_count, intervals)
+
+        estimated.visualization = scale_payload(analysis.visualization, scale)
+        return self._finish(estimated, intervals)
+
+    @staticmethod
+    def _finish(estimated: ColumnAnalysis, intervals: Dict[str, Tuple[float, float]]) -> ColumnAnalysis:
+        """Attach the intervals and flag every statistic as estimated"""
+        estimated.confidence_intervals = {key: (float(low), float(high)) for key, (low, high) in intervals.items()}
+        estimated.approximate_statistics = list(dict.fromkeys(
+            ['unique_count', 'missing_count', 'missing_percentage'] + list(estimated.statistics)))
+        return estimated
+
+    def _numeric(self, stats: Dict[str, Any], sample: pd.Series, analyzer: IColumnAnalyzer,
+                 unique_count: int, missing_count: int,
+                 intervals: Dict[str, Tuple[float, float]]) -> ColumnAnalysis:
+        m = len(sample)
+        values = np.sort(pd.to_numeric(sample, errors='coerce').dropna().to_numpy(dtype=np.float64))
+        k = len(values)
+        if k > 1:
+            half = self.z * stats['std'] / math.sqrt(k) * self._fpc(k)
+            intervals['mean'] = (stats['mean'] - half, stats['mean'] + half)
+            # Var(s^2) ~ sigma^4 (2 / (k - 1) + excess kurtosis / k), so heavy tails widen it
+            excess = max(float(np.nan_to_num(stats['kurtosis'])), 0.0)
+            half = self.z * stats['std'] / 2 * math.sqrt(2 / (k - 1) + excess / k) * self._fpc(k)
+            intervals['std'] = (max(0.0, stats['std'] - half), stats['std'] + half)
+            for key, p in (('q25', 0.25), ('median', 0.5), ('q75', 0.75)):
+                intervals[key] = self._quantile_interval(values, p)
+            intervals['skewness'] = self._normal_interval(stats['skewness'], math.sqrt(6 / k))
+            intervals['kurtosis'] = self._normal_interval(stats['kurtosis'], math.sqrt(24 / k))
+            intervals['min'] = (-math.inf, stats['min'])
+            intervals['max'] = (stats['max'], math.inf)
+        outliers = stats.pop('outlier_count')
+        stats.pop('outlier_percentage', None)
+        stats['outlier_count'] = int(round(outliers * self.population_rows / m))
+        intervals['outlier_count'] = self._count_interval(outliers, m, self.population_rows)
+        intervals['outlier_percentage'] = self._share_interval(outliers, m)
+        return analyzer.build_analysis(name=sample.name, stats=stats, unique_count=unique_count,
+                                       missing_count=missing_count, row_count=self.population_rows)
+
+    def _categorical(self, stats: Dict[str, Any], sample: pd.Series, analyzer: IColumnAnalyzer, name: Any,
+                     unique_count: int, missing_count: int,
+                     intervals: Dict[str, Tuple[float, float]]) -> ColumnAnalysis:
+        m, total = len(sample), self.population_rows
+        top_values = stats.get('top_values', {})
+        value_counts = pd.Series({value: int(round(count * total / m)) for value, count in top_values.items()},
+                                 dtype=np.int64)
+        estimated = analyzer.build_analysis(name=name, value_counts=value_counts, unique_count=unique_count,
+                                            mode=stats.get('mode'), missing_count=missing_count, row_count=total)
+        mode_count = next(iter(top_values.values()), 0)
+        intervals['mode_frequency'] = self._count_interval(mode_count, m, total)
+        intervals['mode_percentage'] = self._share_interval(mode_count, m)
+        low, high = intervals['unique_count']
+        intervals['cardinality_ratio'] = (low / total, high / total)
+        if 'true_count' in estimated.statistics:
+            true_count = int(top_values.get(True, 0))
+            intervals['true_count'] = self._count_interval(true_count, m, total)
+            intervals['true_percentage'] = self._share_interval(true_count, m)
+        if 'top_values_error_bound' in stats:
+            estimated.statistics['top_values_error_bound'] = int(round(stats['top_values_error_bound'] * total / m))
+        if 'avg_length' in stats:
+            lengths = sample.dropna().astype(str).str.len().to_numpy(dtype=np.float64)
+            for key in ('avg_length', 'min_length', 'max_length'):
+                estimated.statistics[key] = stats[key]
+            estimated.insights.append(f"Free text (average {stats['avg_length']:.0f} characters)")
+            if len(lengths) > 1:
+                half = self.z * lengths.std(ddof=1) / math.sqrt(len(lengths)) * self._fpc(len(lengths))
+                intervals['avg_length'] = (stats['avg_length'] - half, stats['avg_length'] + half)
+            intervals['min_length'] = (0.0, float(stats['min_length']))
+            intervals['max_length'] = (float(stats['max_length']), math.inf)
+        return estimated
+
+    def _datetime(self, stats: Dict[str, Any], analyzer: IColumnAnalyzer, name: Any, unique_count: int,
+                  missing_count: int, intervals: Dict[str, Tuple[float, float]]) -> ColumnAnalysis:
+        min_value = pd.Timestamp(stats['min_date']) if 'min_date' in stats else None
+        max_value = pd.Timestamp(stats['max_date']) if 'max_date' in stats else None
+        if min_value is not None:
+            intervals['date_range_days'] = (float(stats['date_range_days']), math.inf)
+        return analyzer.build_analysis(name=name, min_value=min_value, max_value=max_value,
+                                       unique_count=unique_count, missing_count=missing_count,
+                                       row_count=self.population_rows)
+
+    def _distinct(self, sample: pd.Series) -> Tuple[int, Tuple[float, float]]:
+        """GEE distinct estimate with the sample count as lower bound"""
+        frequencies = sample.value_counts(dropna=True)
+        distinct = len(frequencies)
+        singletons = int((frequencies == 1).sum())
+        ratio = self.population_rows / len(sample)
+        estimate = int(round(math.sqrt(ratio) * singletons + distinct - singletons))
+        if singletons == 0:
+            # Every value was seen at least twice, so unseen values are unlikely
+            return estimate, (float(distinct), float(distinct))
+        # GEE's ratio error is bounded by sqrt(N / m)
+        low = max(distinct, estimate / math.sqrt(ratio))
+        high = min(self.population_rows, estimate * math.sqrt(ratio))
+        return estimate, (float(low), float(high))
+
+    def _quantile_interval(self, ordered: np.ndarray, p: float) -> Tuple[float, float]:
+        """Distribution-free interval from order statistics around rank k·p"""
+        k = len(ordered)
+        half = self.z * math.sqrt(k * p * (1 - p)) * self._fpc(k)
+        low = int(max(0, math.floor(k * p - half) - 1))
+        high = int(min(k - 1, math.ceil(k * p + half) - 1))
+        return float(ordered[low]), float(ordered[high])
+
+    def _share_interval(self, successes: float, trials: int) -> Tuple[float, float]:
+        """Percentage interval"""
+        low, high = wilson_interval(successes, trials, self.z * self._fpc(trials))
+        return round(low * 100, 4), round(high * 100, 4)
+
+    def _count_interval(self, successes: float, trials: int, total: int) -> Tuple[float, float]:
+        low, high = wilson_interval(successes, trials, self.z * self._fpc(trials))
+        return float(math.floor(low * total)), float(math.ceil(high * total))
+
+    def _normal_interval(self, value: float, standard_error: float) -> Tuple[float, float]:
+        return value - self.z * standard_error, value + self.z * standard_error
+
+    def _fpc(self, sample_rows: int) -> float:
+        """Finite population correction"""
+        if self.population_rows <= 1:
+            return 0.0
+        return math.sqrt(max(0.0, (self.population_rows - sample_rows) / (self.population_rows - 1)))
+
+
+class WeightedSampleEstimator(SampleEstimator):
+    """Population estimates from a sample whose rows carry unequal weights.
+
+    ``weights[i]`` is the number of population rows sample row ``i`` stands
+    for (see ``sample_weights``). Counts are weighted sums, and means,
+    moments and quantiles are taken over the weighted values. Intervals use
+    Kish's effective sample size (sum w)^2 / sum w^2 in place of the sample
+    size, and the GEE distinct estimate scales each singleton by the square
+    root of its own weight, so rows of a stratum taken whole count once.
+    """
+
+    def __init__(self, population_rows: int, weights: np.ndarray, confidence: float = 0.95):
+        super().__init__(population_rows, confidence)
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+    def estimate(self, analysis: ColumnAnalysis, sample: pd.Series, analyzer: IColumnAnalyzer) -> ColumnAnalysis:
+        if len(sample) == 0 or len(sample) >= self.population_rows:
+            return analysis
+        intervals: Dict[str, Tuple[float, float]] = {}
+        missing = sample.isna().to_numpy()
+        missing_count = int(round(self.weights[missing].sum()))
+        unique_count, intervals['unique_count'] = self._distinct(sample)
+        intervals['missing_count'] = self._count_interval(*self._effective(missing), self.population_rows)
+        intervals['missing_percentage'] = self._share_interval(*self._effective(missing))
+
+        if analysis.column_type == ColumnType.NUMERIC:
+            estimated = self._numeric(analysis, sample, analyzer, unique_count, missing_count, intervals)
+        elif analysis.column_type == ColumnType.DATETIME:
+            estimated = self._datetime(dict(analysis.statistics), analyzer, analysis.name, unique_count,
+                                       missing_count, intervals)
+            estimated.visualization = self._bucket_payload(analysis.visualization, sample)
+        else:
+            estimated = self._categorical(analysis, sample, analyzer, unique_count, missing_count, intervals)
+        return self._finish(estimated, intervals)
+
+    def _numeric(self, analysis: ColumnAnalysis, sample: pd.Series, analyzer: IColumnAnalyzer,
+                 unique_count: int, missing_count: int,
+                 intervals: Dict[str, Tuple[float, float]]) -> ColumnAnalysis:
+        numbers = pd.to_numeric(sample, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(numbers)
+        order = np.argsort(numbers[present], kind='stable')
+        values, weights = numbers[present][order], self.weights[present][order]
+        stats = {key: value for key, value in analysis.statistics.items() if key != 'outlier_percentage'}
+        outside = np.zeros(len(sample), dtype=bool)
+        if len(values):
+            k = self._effective_size(weights)
+            mean = float(np.average(values, weights=weights))
+            moments = [float(np.average((values - mean) ** power, weights=weights)) for power in (2, 3, 4)]
+            stats['mean'] = mean
+            stats['std'] = math.sqrt(moments[0] * k / (k - 1)) if k > 1 else float('nan')
+            stats['skewness'] = moments[1] / moments[0] ** 1.5 if moments[0] > 0 else 0.0
+            stats['kurtosis'] = moments[2] / moments[0] ** 2 - 3 if moments[0] > 0 else 0.0
+            for key, p in (('q25', 0.25), ('median', 0.5), ('q75', 0.75)):
+                stats[key] = self._weighted_quantile(values, weights, p)
+            stats['min'], stats['max'] = float(values[0]), float(values[-1])
+            iqr = stats['q75'] - stats['q25']
+            outside[present] = ((numbers[present] < stats['q25'] - 1.5 * iqr)
+                                | (numbers[present] > stats['q75'] + 1.5 * iqr))
+            if len(values) > 1:
+                half = self.z * stats['std'] / math.sqrt(k) * self._fpc(k)
+                intervals['mean'] = (mean - half, mean + half)
+                excess = max(float(np.nan_to_num(stats['kurtosis'])), 0.0)
+                half = self.z * stats['std'] / 2 * math.sqrt(2 / (k - 1) + excess / k) * self._fpc(k)
+                intervals['std'] = (max(0.0, stats['std'] - half), stats['std'] + half)
+                for key, p in (('q25', 0.25), ('median', 0.5), ('q75', 0.75)):
+                    half = self.z * math.sqrt(p * (1 - p) / k) * self._fpc(k)
+                    intervals[key] = (self._weighted_quantile(values, weights, max(p - half, 0.0)),
+                                      self._weighted_quantile(values, weights, min(p + half, 1.0)))
+                intervals['skewness'] = self._normal_interval(stats['skewness'], math.sqrt(6 / k))
+                intervals['kurtosis'] = self._normal_interval(stats['kurtosis'], math.sqrt(24 / k))
+                intervals['min'] = (-math.inf, stats['min'])
+                intervals['max'] = (stats['max'], math.inf)
+        stats['outlier_count'] = int(round(self.weights[outside].sum()))
+        intervals['outlier_count'] = self._count_interval(*self._effective(outside), self.population_rows)
+        intervals['outlier_percentage'] = self._share_interval(*self._effective(outside))
+        estimated = analyzer.build_analysis(name=sample.name, stats=stats, unique_count=unique_count,
+                                            missing_count=missing_count, row_count=self.population_rows)
+        finite = np.isfinite(numbers)
+        estimated.visualization = self._histogram_payload(analysis.visualization, numbers[finite],
+                                                          self.weights[finite])
+        return estimated
+
+    def _categorical(self, analysis: ColumnAnalysis, sample: pd.Series, analyzer: IColumnAnalyzer,
+                     unique_count: int, missing_count: int,
+                     intervals: Dict[str, Tuple[float, float]]) -> ColumnAnalysis:
+        total = self.population_rows
+        present = sample.notna().to_numpy()
+        weighted = pd.Series(self.weights[present]).groupby(sample[present].to_numpy()).sum()
+        value_counts = np.rint(weighted.sort_values(ascending=False, kind='stable')).astype(np.int64)
+        mode = value_counts.index[0] if len(value_counts) else None
+        estimated = analyzer.build_analysis(name=analysis.name, value_counts=value_counts,
+                                            unique_count=unique_count, mode=mode, missing_count=missing_count,
+                                            row_count=total)
+        is_mode = sample.eq(mode).to_numpy(dtype=bool) if mode is not None else np.zeros(len(sample), dtype=bool)
+        intervals['mode_frequency'] = self._count_interval(*self._effective(is_mode), total)
+        intervals['mode_percentage'] = self._share_interval(*self._effective(is_mode))
+        low, high = intervals['unique_count']
+        intervals['cardinality_ratio'] = (low / total, high / total)
+        if 'true_count' in estimated.statistics:
+            is_true = sample.eq(True).to_numpy(dtype=bool)
+            intervals['true_count'] = self._count_interval(*self._effective(is_true), total)
+            intervals['true_percentage'] = self._share_interval(*self._effective(is_true))
+        non_null = int(round(self.weights[present].sum()))
+        if 'avg_length' in analysis.statistics:
+            lengths = sample[present].astype(str).str.len().to_numpy(dtype=np.float64)
+            weights = self.weights[present]
+            average = float(np.average(lengths, weights=weights))
+            estimated.statistics['avg_length'] = round(average, 2)
+            estimated.statistics['min_length'] = analysis.statistics['min_length']
+            estimated.statistics['max_length'] = analysis.statistics['max_length']
+            estimated.insights.append(f"Free text (average {average:.0f} characters)")
+            k = self._effective_size(weights)
+            if len(lengths) > 1:
+                spread = math.sqrt(np.average((lengths - average) ** 2, weights=weights) * k / (k - 1))
+                half = self.z * spread / math.sqrt(k) * self._fpc(k)
+                intervals['avg_length'] = (average - half, average + half)
+            intervals['min_length'] = (0.0, float(analysis.statistics['min_length']))
+            intervals['max_length'] = (float(analysis.statistics['max_length']), math.inf)
+            estimated.visualization = self._histogram_payload(analysis.visualization, lengths, weights)
+        elif analysis.visualization is not None:
+            estimated.visualization = analyzer.visualization_payload(value_counts, non_null)
+        return estimated
+
+    def _distinct(self, sample: pd.Series) -> Tuple[int, Tuple[float, float]]:
+        """GEE distinct estimate with each singleton scaled by the square root of its weight"""
+        present = sample.notna().to_numpy()
+        codes, _ = pd.factorize(sample[present])
+        frequencies = np.bincount(codes)
+        distinct = len(frequencies)
+        singletons = frequencies[codes] == 1
+        if not singletons.any():
+            return distinct, (float(distinct), float(distinct))
+        singleton_weights = self.weights[present][singletons]
+        estimate = int(round(np.sqrt(singleton_weights).sum() + distinct - singletons.sum()))
+        ratio = float(singleton_weights.max())
+        low = max(distinct, estimate / math.sqrt(ratio))
+        high = min(self.population_rows, estimate * math.sqrt(ratio))
+        return estimate, (float(low), float(high))
+
+    def _effective(self, mask: np.ndarray) -> Tuple[float, float]:
+        """(successes, trials) of the weighted share of ``mask`` at the effective sample size"""
+        trials = self._effective_size(self.weights)
+        return self.weights[mask].sum() / self.weights.sum() * trials, trials
+
+    @staticmethod
+    def _effective_size(weights: np.ndarray) -> float:
+        """Kish's effective sample size"""
+        return float(weights.sum() ** 2 / (weights ** 2).sum()) if len(weights) else 0.0
+
+    @staticmethod
+    def _weighted_quantile(ordered: np.ndarray, weights: np.ndarray, p: float) -> float:
+        """Quantile of sorted values, interpolating between the weight midpoints of each value"""
+        positions = (np.cumsum(weights) - weights / 2) / weights.sum()
+        return float(np.interp(p, positions, ordered))
+
+    @staticmethod
+    def _histogram_payload(payload: Optional[Dict[str, Any]], values: np.ndarray,
+                           weights: np.ndarray) -> Optional[Dict[str, Any]]:
+        """Histogram payload recounted with weights over the sample's bin edges"""
+        if payload is None or len(payload.get('edges', ())) == 0:
+            return payload
+        counts, _ = np.histogram(values, bins=payload['edges'], weights=weights)
+        return {**payload, 'counts': np.rint(counts).astype(np.int64)}
+
+    def _bucket_payload(self, payload: Optional[Dict[str, Any]], sample: pd.Series) -> Optional[Dict[str, Any]]:
+        """Time buckets recounted with weights"""
+        if payload is None or len(payload.get('buckets', ())) == 0:
+            return payload
+        present = sample.notna().to_numpy()
+        values = sample[present]
+        if getattr(values.dt, 'tz', None) is not None:
+            values = values.dt.tz_localize(None)
+        buckets = np.asarray(payload['buckets'], dtype='datetime64[ns]')
+        positions = np.searchsorted(buckets, values.to_numpy(dtype='datetime64[ns]'), side='right') - 1
+        counts = np.bincount(positions, weights=self.weights[present], minlength=len(buckets))
+        return {**payload, 'counts': np.rint(counts).astype(np.int64)}
@@ -0,0 +1,77 @@
+from functools import lru_cache
+from typing import Sequence
+
+# Rough ratio for English and identifiers when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _encoder():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding('cl100k_base')
+    except Exception:
+        # Not installed, or the encoding could not be downloaded
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Tokens in ``text``: counted with tiktoken when installed, otherwise about four characters per token"""
+    encoder = _encoder()
+    if encoder is not None:
+        return len(encoder.encode(text))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def clip_to_tokens(text: str, max_tokens: int) -> str:
+    """``text`` cut to at most ``max_tokens`` tokens, marked with an ellipsis when cut"""
+    max_tokens = max(max_tokens, 1)
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    encoder = _encoder()
+    if encoder is not None:
+        return encoder.decode(encoder.encode(text)[:max_tokens - 1]) + '…'
+    return text[:(max_tokens - 1) * CHARS_PER_TOKEN] + '…'
+
+
+def with_token_estimate(text: str) -> str:
+    """``text`` followed by its measured size, so callers can see what a result costs"""
+    return f"{text}\n[~{estimate_tokens(text)} tokens]"
+
+
+# Reserved for the paging footer and the token estimate line
+FOOTER_TOKENS = 40
+
+
+def paginate(header: str, lines: Sequence[str], offset: int = 0, page_size: int = 30,
+             max_tokens: int = 1500, noun: str = 'items') -> str:
+    """``header`` and a page of ``lines`` starting at ``offset``, within ``max_tokens``.
+
+    The page ends after ``page_size`` lines or when the next line would
+    exceed the budget (a single oversized line is clipped, so every page
+    makes progress). A header longer than half the budget is clipped to
+    it, so a page always has room for lines. A footer gives the range
+    shown and the offset of the next page, and the result ends with its
+    token estimate.
+    """
+    offset = max(int(offset or 0), 0)
+    header = clip_to_tokens(header, (max_tokens - FOOTER_TOKENS) // 2)
+    budget = max_tokens - estimate_tokens(header) - FOOTER_TOKENS
+    shown = []
+    for line in lines[offset:offset + max(page_size, 1)]:
+        cost = estimate_tokens(line) + 1
+        if cost > budget:
+            if not shown:
+                shown.append(clip_to_tokens(line, budget))
+            break
+        shown.append(line)
+        budget -= cost
+
+    end = offset + len(shown)
+    parts = [header, *shown]
+    if offset >= len(lines) and offset > 0:
+        parts.append(f"(No {noun} at offset {offset}; there are {len(lines)})")
+    elif offset > 0 or end < len(lines):
+        more = f"; call again with offset={end} for more" if end < len(lines) else ""
+        parts.append(f"(Showing {noun} {offset + 1}-{end} of {len(lines)}{more})")
+    return with_token_estimate('\n'.join(parts))
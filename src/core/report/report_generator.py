@@ -1,4 +1,4 @@
-from dataclasses import asdict
+from dataclasses import asdict, replace
 import json
 import os
 import sys
@@ -8,6 +8,29 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from EDA.eda_service import EDAService
 
 
+def format_intervals(analysis, keys=None) -> str:
+    """``key [low, high]`` for each confidence interval of a column analysis"""
+    keys = keys or list(analysis.confidence_intervals)
+    return ', '.join(f"{key} [{low:.4g}, {high:.4g}]"
+                     for key, (low, high) in analysis.confidence_intervals.items() if key in keys)
+
+
+def analysis_dict(analysis) -> dict:
+    """JSON-ready fields of a column analysis, without the chart payload"""
+    data = asdict(replace(analysis, visualization=None))
+    del data['visualization']
+    return data
+
+
+def format_memory_saving(metadata) -> str:
+    """`` (optimized from X MB)`` when dtypes were narrowed on load, else empty"""
+    before = metadata.memory_before_optimization_mb
+    if before is None:
+        return ''
+    saved = (1 - metadata.memory_usage_mb / before) * 100 if before else 0.0
+    return f" (optimized from {before:.2f} MB, {saved:.0f}% smaller)"
+
+
 class ReportBuilder:
     """Builds EDA reports in various formats"""
     
@@ -22,9 +45,12 @@ class ReportBuilder:
 ## 📊 Dataset Metadata
 
 - **Shape**: {metadata.row_count:,} rows × {metadata.column_count} columns
-- **Memory Usage**: {metadata.memory_usage_mb:.2f} MB
+- **Memory Usage**: {metadata.memory_usage_mb:.2f} MB{format_memory_saving(metadata)}
 - **Columns**: {', '.join(metadata.columns[:10])}{'...' if len(metadata.columns) > 10 else ''}
 """
+        if metadata.sampled_rows is not None:
+            section += (f"- **Sampled**: figures below are estimates from {metadata.sampled_rows:,} "
+                        f"of {metadata.row_count:,} rows\n")
         self.sections.append(section)
         return self
     
@@ -35,9 +61,11 @@ class ReportBuilder:
 ## 🔍 Data Quality Report
 
 - **Missing Values**: {quality.missing_cells:,} cells ({quality.missing_cells/quality.total_cells*100:.2f}%)
-- **Duplicate Rows**: {quality.duplicate_rows:,} ({quality.duplicate_percentage:.2f}%)
+- **Duplicate Rows**: {quality.duplicate_rows:,} ({quality.duplicate_percentage:.2f}%){' (approximate)' if 'duplicate_rows' in quality.approximate_fields else ''}
 
 """
+        if 'missing_values' in quality.approximate_fields:
+            section += "_Missing value counts are estimates._\n\n"
         if quality.missing_values:
             section += "**Columns with Missing Values:**\n"
             for col, count in list(quality.missing_values.items())[:10]:
@@ -53,18 +81,27 @@ class ReportBuilder:
         section = "\n## 📈 Column Analysis\n\n"
         
         for analysis in analyses[:10]:  # Limit for brevity
-            section += f"### {analysis.name} ({analysis.column_type.value})\n"
-            section += f"- **Unique Values**: {analysis.unique_count:,}\n"
-            section += f"- **Missing**: {analysis.missing_count:,} ({analysis.missing_percentage:.1f}%)\n"
-            
-            if analysis.insights:
-                section += f"- **Insights**: {'; '.join(analysis.insights)}\n"
-            
-            section += "\n"
+            section += self.column_block(analysis) + "\n"
         
         self.sections.append(section)
         return self
     
+    @staticmethod
+    def column_block(analysis) -> str:
+        """Markdown summary of one column analysis"""
+        block = f"### {analysis.name} ({analysis.column_type.value})\n"
+        block += f"- **Unique Values**: {analysis.unique_count:,}\n"
+        block += f"- **Missing**: {analysis.missing_count:,} ({analysis.missing_percentage:.1f}%)\n"
+        
+        if analysis.insights:
+            block += f"- **Insights**: {'; '.join(analysis.insights)}\n"
+        
+        if analysis.confidence_intervals:
+            block += f"- **Estimated** (confidence intervals): {format_intervals(analysis)}\n"
+        elif analysis.approximate_statistics:
+            block += f"- **Approximate**: {', '.join(analysis.approximate_statistics)}\n"
+        return block
+    
     def add_insights_section(self) -> 'ReportBuilder':
         """Add automated insights section"""
         insights = self.eda.generate_insights()
@@ -89,7 +126,7 @@ class ReportBuilder:
         report = {
             'metadata': asdict(self.eda.get_metadata()),
             'quality': asdict(self.eda.get_quality_report()),
-            'columns': [asdict(a) for a in self.eda.analyze_columns()],
+            'columns': [analysis_dict(a) for a in self.eda.analyze_columns()],
             'insights': self.eda.generate_insights()
         }
         return json.dumps(report, indent=2, default=str)
@@ -25,5 +25,24 @@ class IColumnAnalyzer(ABC):
     
     @abstractmethod
     def get_visualization_data(self, series: pd.Series) -> Dict[str, Any]:
-        """Get data needed for visualization"""
+        """Pre-aggregated chart payload whose size does not grow with the row count.
+
+        ``analyze`` attaches the same payload to ``ColumnAnalysis.visualization``
+        from its own pass, so callers holding an analysis need not call this.
+        Payloads by ``type``: ``numeric`` and ``text`` (string lengths) hold
+        histogram ``edges`` and ``counts`` arrays; ``datetime`` holds bucket
+        starts and ``counts`` at a day/week/month/year ``granularity``;
+        ``categorical`` holds the top ``labels`` and ``values`` plus
+        ``other_count``.
+        """
         pass
+    
+    def profile(self, series: pd.Series) -> Any:
+        """Build a mergeable partial profile (``ColumnProfile``) of the series.
+
+        The default picks the built-in accumulator for the column type
+        ``analyze`` reports; analyzers with cheaper state override it.
+        """
+        # Imported lazily: the accumulators build on the analyzers
+        from core.Analyzers.accumulators import profile_for_type
+        return profile_for_type(self.analyze(series).column_type, series)
@@ -1,41 +1,146 @@
-import pandas as pd
+import os
 
+from classes.data_classes import SamplingConfig
+from core.Analyzers.cardinality import DistinctCounter
+from core.EDA.chunked_service import ChunkedEDAService, ProfiledEDAService
+from core.EDA.column_store import DEFAULT_STORE_DIR, ColumnStoreCache
+from core.EDA.dataset_loader import detect_format, load_dataset, open_dataset
+from core.EDA.dtype_optimizer import optimize_dtypes
 from core.EDA.eda_agent import EDAAgent
 from core.EDA.eda_cmd import EDACommandLine
+from core.EDA.eda_service import EDAService
+from core.EDA.profile_cache import DEFAULT_CACHE_DIR, ProfileCache, file_fingerprint
+from core.EDA.response_cache import DEFAULT_RESPONSE_CACHE_DIR, ResponseCache
+from core.EDA.sampled_service import SampledEDAService
+from core.EDA.sampling import SAMPLING_METHODS
+from core.report.report_generator import ReportBuilder
 
 def main():
     """Main entry point"""
     import argparse
     
     parser = argparse.ArgumentParser(description='Intelligent EDA Agent with Chat Interface')
-    parser.add_argument('csv_file', help='Path to CSV file')
+    parser.add_argument('csv_file', nargs='?', help='Path to a CSV, Parquet, Feather or Arrow IPC file')
     parser.add_argument('--openai', action='store_true', help='Use OpenAI instead of Ollama')
     parser.add_argument('--auto-report', type=str, help='Generate automatic report and save to file')
     parser.add_argument('--query', type=str, help='Run single query and exit')
     parser.add_argument('--verbose', action='store_true', help='Show tool activity')
+    parser.add_argument('--workers', type=int, default=1, help='Number of workers for column analysis')
+    parser.add_argument('--parallel-backend', choices=['thread', 'process'], default='thread',
+                        help='Worker pool type used when --workers > 1')
+    parser.add_argument('--chunked', action='store_true',
+                        help='Stream the CSV in chunks instead of loading it into memory (requires --auto-report)')
+    parser.add_argument('--chunksize', type=int, default=100_000, help='Rows per chunk in --chunked mode')
+    parser.add_argument('--approx-distinct', action='store_true',
+                        help='Estimate distinct counts of high-cardinality columns with HyperLogLog and '
+                             'take categorical top values from a bounded summary')
+    parser.add_argument('--hll-precision', type=int, default=14,
+                        help='HyperLogLog precision (registers = 2^precision) for --approx-distinct')
+    parser.add_argument('--exact-distinct-limit', type=int, default=10_000,
+                        help='Columns estimated below this many distinct values are counted exactly')
+    parser.add_argument('--top-k-capacity', type=int,
+                        help='Track categorical frequencies with at most this many counters (bounded memory); '
+                             'distinct counts past that many values are estimated with HyperLogLog')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Directory of the profile cache')
+    parser.add_argument('--cache-size-mb', type=int, default=512, help='Profile cache size limit in MB')
+    parser.add_argument('--no-cache', action='store_true', help='Neither read nor write the profile cache')
+    parser.add_argument('--clear-cache', action='store_true', help='Empty the profile cache before running')
+    parser.add_argument('--store-dir', default=DEFAULT_STORE_DIR,
+                        help='Directory of memory-mapped column stores reused when the same file is reopened')
+    parser.add_argument('--store-min-mb', type=float, default=50,
+                        help='Only build a column store for files at least this large')
+    parser.add_argument('--no-store', action='store_true', help='Neither read nor write column stores')
+    parser.add_argument('--no-response-cache', action='store_true',
+                        help='Always ask the model instead of reusing answers to the same question on the same data')
+    parser.add_argument('--response-cache-dir', default=DEFAULT_RESPONSE_CACHE_DIR,
+                        help='Directory where answers are kept between runs')
+    parser.add_argument('--response-cache-ttl', type=float, default=24,
+                        help='Hours a cached answer stays valid')
+    parser.add_argument('--tool-token-budget', type=int, default=1500,
+                        help='Approximate token limit of each tool result the model reads; longer listings are paged')
+    parser.add_argument('--full-hash', action='store_true',
+                        help='Fingerprint the whole file for the cache instead of sampled blocks')
+    parser.add_argument('--optimize-dtypes', action='store_true',
+                        help='Narrow numeric dtypes and store low-cardinality strings as categories after loading')
+    parser.add_argument('--columns', help='Comma-separated columns to load (others are never read)')
+    parser.add_argument('--sample', type=int,
+                        help='Analyze a sample of this many rows; statistics become estimates with confidence intervals')
+    parser.add_argument('--sample-method', choices=SAMPLING_METHODS, default='uniform', help='How --sample draws rows')
+    parser.add_argument('--stratify-by', help='Column whose values stratify --sample-method stratified')
+    parser.add_argument('--confidence', type=float, default=0.95, help='Confidence level of sampled estimates')
     
     args = parser.parse_args()
     
+    if args.clear_cache:
+        removed = ProfileCache(args.cache_dir).clear()
+        print(f"🧹 Cleared {removed} cached profile(s) from {args.cache_dir}")
+    if not args.csv_file:
+        if not args.clear_cache:
+            parser.error('the following arguments are required: csv_file')
+        return
+    
+    fingerprint = source_fingerprint(args)
+    cache, cache_key = open_profile_cache(args, fingerprint)
+    if args.auto_report and cache is not None:
+        # A cached profile answers the report without reading the file
+        eda_service = ProfiledEDAService()
+        if cache.load_into(eda_service, cache_key):
+            print(f"\n⚡ Using cached profile for {args.csv_file}")
+            write_report(eda_service, args.auto_report)
+            return
+    
+    if args.chunked:
+        run_chunked(args, cache, cache_key)
+        return
+    
     # Load dataset
+    columns = [c.strip() for c in args.columns.split(',')] if args.columns else None
     try:
         print(f"\n📂 Loading dataset: {args.csv_file}")
-        df = pd.read_csv(args.csv_file)
+        source = open_dataset(args.csv_file)
+        df = load_with_store(args, fingerprint, source, columns)
         print(f"✅ Loaded successfully: {df.shape[0]:,} rows × {df.shape[1]} columns\n")
+        optimization = None
+        if args.optimize_dtypes:
+            df, optimization = optimize_dtypes(df)
+            print(f"🗜️  Optimized dtypes: {optimization.memory_before_mb:.2f} MB → "
+                  f"{optimization.memory_after_mb:.2f} MB\n")
     except Exception as e:
         print(f"❌ Error loading file: {e}")
         return
     
     # Initialize agent
-    agent = EDAAgent(df, use_openai=args.openai)
+    distinct_counter = DistinctCounter(args.approx_distinct, args.hll_precision, args.exact_distinct_limit)
+    service_kwargs = dict(n_workers=args.workers, parallel_backend=args.parallel_backend,
+                          distinct_counter=distinct_counter, top_k_capacity=args.top_k_capacity,
+                          dtype_optimization=optimization)
+    if args.sample:
+        sampling = SamplingConfig(method=args.sample_method, size=args.sample, stratify_by=args.stratify_by,
+                                  confidence=args.confidence)
+        eda_service = SampledEDAService(df, sampling, **service_kwargs)
+        print(f"🎲 Sampling {len(eda_service.df):,} rows ({args.sample_method}); statistics are estimates\n")
+    else:
+        eda_service = EDAService(df, source=source, **service_kwargs)
+    if cache is not None:
+        cache.load_into(eda_service, cache_key)
     
-    # Handle different modes
     if args.auto_report:
         # Generate automatic report without LLM
-        report = agent.generate_automatic_eda(save_path=args.auto_report)
-        print(report[:500] + "...\n")
-        print(f"✅ Full report saved to: {args.auto_report}")
+        print("🔄 Generating comprehensive EDA report...\n")
+        write_report(eda_service, args.auto_report)
+        if cache is not None:
+            cache.store(eda_service, cache_key)
+        return
+    
+    # The model itself is only built on the first question
+    agent = EDAAgent(df, use_openai=args.openai, eda_service=eda_service,
+                     response_cache=ResponseCache(directory=args.response_cache_dir,
+                                                  ttl_seconds=args.response_cache_ttl * 3600),
+                     cache_responses=not args.no_response_cache,
+                     dataset_fingerprint=dataset_key(args, fingerprint),
+                     tool_token_budget=args.tool_token_budget)
     
-    elif args.query:
+    if args.query:
         # Single query mode
         print(f"💬 Query: {args.query}\n")
         response = agent.chat(args.query, verbose=args.verbose)
@@ -47,5 +152,103 @@ def main():
         cli.run()
 
 
+def source_fingerprint(args):
+    """Content fingerprint of the input file, or None if it cannot be read"""
+    try:
+        return file_fingerprint(args.csv_file, full_hash=args.full_hash)
+    except OSError:
+        # Unreadable files are reported by the loader
+        return None
+
+
+def open_profile_cache(args, fingerprint):
+    """Profile cache and entry key for this run, or (None, None) with --no-cache"""
+    if args.no_cache or fingerprint is None:
+        return None, None
+    cache = ProfileCache(args.cache_dir, max_bytes=args.cache_size_mb * 1024 * 1024)
+    return cache, cache.make_key(fingerprint, analysis_settings(args))
+
+
+def analysis_settings(args):
+    """Everything besides the file that changes the analysis output"""
+    return {
+        'mode': f"chunked:{args.chunksize}" if args.chunked else 'in-memory',
+        'approx_distinct': [args.approx_distinct, args.hll_precision, args.exact_distinct_limit],
+        'top_k_capacity': args.top_k_capacity,
+        'columns': args.columns,
+        'optimize_dtypes': args.optimize_dtypes,
+        'sampling': [args.sample, args.sample_method, args.stratify_by, args.confidence] if args.sample else None,
+    }
+
+
+def dataset_key(args, fingerprint):
+    """Fingerprint of the file, analysis settings and tool budget for the response cache, or None to hash the data"""
+    if fingerprint is None:
+        return None
+    # The budget changes what the model reads, so answers under another budget may differ
+    settings = dict(analysis_settings(args), tool_token_budget=args.tool_token_budget)
+    return ProfileCache(args.cache_dir).make_key(fingerprint, settings)
+
+
+def load_with_store(args, fingerprint, source, columns):
+    """Load the dataset, reopening its column store when one was built from the same file"""
+    use_store = not args.no_store and fingerprint is not None
+    store_cache = ColumnStoreCache(args.store_dir) if use_store else None
+    store = store_cache.get(fingerprint) if store_cache is not None else None
+    if store is not None:
+        print("⚡ Reopening memory-mapped column store")
+        missing = [col for col in columns or [] if col not in store.columns]
+        if missing:
+            raise ValueError(f"Columns not found: {', '.join(missing)}")
+        return store.read(columns)
+
+    df = load_dataset(args.csv_file, columns) if source is None else source.read(columns)
+    # Partial loads are not stored: a later run may ask for other columns
+    if store_cache is not None and columns is None and \
+            os.path.getsize(args.csv_file) >= args.store_min_mb * 1024 * 1024:
+        try:
+            store_cache.put(df, fingerprint)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not build column store: {e}")
+    return df
+
+
+def write_report(eda_service, path):
+    """Build the full markdown report and save it"""
+    report = (ReportBuilder(eda_service)
+              .add_metadata_section()
+              .add_quality_section()
+              .add_column_analysis_section()
+              .add_insights_section()
+              .build_markdown())
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(report)
+    print(report[:500] + "...\n")
+    print(f"✅ Full report saved to: {path}")
+
+
+def run_chunked(args, cache=None, cache_key=None):
+    """Profile a CSV larger than memory in one streaming pass"""
+    if not args.auto_report:
+        print("❌ --chunked currently supports --auto-report only; chat needs the dataset in memory")
+        return
+    if detect_format(args.csv_file) != 'csv':
+        print("❌ --chunked streams CSV files; columnar files are read column by column without it")
+        return
+    
+    print(f"\n📂 Streaming dataset: {args.csv_file} ({args.chunksize:,} rows per chunk)")
+    eda_service = ChunkedEDAService(args.csv_file, chunksize=args.chunksize, top_k_capacity=args.top_k_capacity)
+    try:
+        metadata = eda_service.get_metadata()
+    except Exception as e:
+        print(f"❌ Error loading file: {e}")
+        return
+    print(f"✅ Profiled successfully: {metadata.row_count:,} rows × {metadata.column_count} columns\n")
+    
+    write_report(eda_service, args.auto_report)
+    if cache is not None:
+        cache.store(eda_service, cache_key)
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
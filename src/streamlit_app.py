@@ -1,8 +1,15 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
+from classes.data_classes import ColumnType
+from core.Analyzers.binning import box_summary, density_grid, finite_values, sample_points
+from core.EDA.column_store import ColumnStoreCache
+from core.EDA.dataset_loader import FORMATS, load_dataset
+from core.EDA.dtype_optimizer import optimize_dtypes
 from core.EDA.eda_agent import EDAAgent
+from core.EDA.eda_service import EDAService
+from core.EDA.response_cache import ResponseCache
+from core.report.report_generator import ReportBuilder
+import hashlib
 import time
 import os
 
@@ -234,6 +241,8 @@ if 'visualizations' not in st.session_state:
     st.session_state.visualizations = []
 if 'last_file' not in st.session_state:
     st.session_state.last_file = None
+if 'dataset_key' not in st.session_state:
+    st.session_state.dataset_key = None
 if 'processing' not in st.session_state:
     st.session_state.processing = False
 
@@ -249,25 +258,108 @@ def display_chat_message(role, content, index):
     </div>
     """, unsafe_allow_html=True)
 
+# Payload caps: figures carry aggregates, never one element per row
+DENSITY_BINS = 120
+MAX_SCATTER_POINTS = 5000
+MAX_BOX_OUTLIERS = 500
+
+
+def histogram_figure(payload, title):
+    """Bars of a column's cached visualization payload (see IColumnAnalyzer.get_visualization_data)"""
+    import plotly.graph_objects as go
+    if payload['type'] in ('numeric', 'text'):
+        edges, counts = payload['edges'], payload['counts']
+        bar = go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges), marker_color='#667eea')
+        if payload['type'] == 'text':
+            title = f"{title} (string length)"
+    elif payload['type'] == 'datetime':
+        bar = go.Bar(x=payload['buckets'], y=payload['counts'], marker_color='#667eea')
+        title = f"{title} (per {payload['granularity']})"
+    else:
+        labels = [str(label) for label in payload['labels']]
+        values = list(payload['values'])
+        if payload['other_count']:
+            labels.append("Other")
+            values.append(payload['other_count'])
+        bar = go.Bar(x=labels, y=values, marker_color='#667eea')
+    return go.Figure(bar, layout=dict(title=title, bargap=0 if payload['type'] != 'categorical' else None))
+
+
+def scatter_figure(df, x, y, title, x_range=None, y_range=None):
+    """Real points when the (zoomed) window holds few enough of them, else a 2-D density grid"""
+    import plotly.graph_objects as go
+    try:
+        xs = df[x].to_numpy(dtype=np.float64, na_value=np.nan)
+        ys = df[y].to_numpy(dtype=np.float64, na_value=np.nan)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Scatter axes must be numeric columns, got '{x}' and '{y}'") from e
+    sample_x, sample_y, total = sample_points(xs, ys, MAX_SCATTER_POINTS, x_range, y_range)
+    if total <= MAX_SCATTER_POINTS:
+        fig = go.Figure(go.Scattergl(x=sample_x, y=sample_y, mode='markers', marker=dict(color='#06b6d4', size=5)))
+    else:
+        counts, x_edges, y_edges = density_grid(xs, ys, DENSITY_BINS, x_range, y_range)
+        # Empty cells stay transparent so sparse regions read as background
+        z = np.where(counts.T > 0, counts.T, np.nan)
+        fig = go.Figure(go.Heatmap(x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2, z=z,
+                                   colorscale='Viridis', colorbar=dict(title='rows')))
+        title = f"{title} (density of {total:,} points)"
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+    return fig
+
+
+def box_figure(series, title):
+    """Box drawn from a precomputed five-number summary plus at most MAX_BOX_OUTLIERS outliers"""
+    import plotly.graph_objects as go
+    summary = box_summary(finite_values(series), MAX_BOX_OUTLIERS)
+    if summary['count'] == 0:
+        raise ValueError(f"Column '{series.name}' has no numeric values")
+    fig = go.Figure(go.Box(q1=[summary['q1']], median=[summary['median']], q3=[summary['q3']],
+                           lowerfence=[summary['lower_fence']], upperfence=[summary['upper_fence']],
+                           mean=[summary['mean']], x=[str(series.name)], name=str(series.name),
+                           marker_color='#764ba2', boxpoints=False))
+    if summary['outliers']:
+        fig.add_trace(go.Scatter(x=[str(series.name)] * len(summary['outliers']), y=summary['outliers'],
+                                 mode='markers', marker=dict(color='#764ba2', size=4), name='outliers'))
+    if summary['outlier_count'] > len(summary['outliers']):
+        title = f"{title} ({len(summary['outliers'])} most extreme of {summary['outlier_count']:,} outliers)"
+    fig.update_layout(title=title, showlegend=False)
+    return fig
+
+
+def numeric_columns():
+    """Columns routed to the numeric analyzer, the only ones a scatter axis can take"""
+    plan = st.session_state.agent.eda_service.get_column_plan()
+    return [col for col in st.session_state.df.columns if plan.column_type(col) == ColumnType.NUMERIC]
+
+
+def column_bounds(column):
+    """(min, max) of a numeric column from its cached analysis, or None"""
+    stats = st.session_state.agent.eda_service.analyze_column(column).statistics
+    low, high = stats.get('min'), stats.get('max')
+    if low is None or high is None or not np.isfinite([low, high]).all() or low >= high:
+        return None
+    return float(low), float(high)
+
+
 def create_visualization(df, viz_type, settings):
-    """Create a visualization based on type and settings"""
+    """Create a visualization based on type and settings.
+
+    Every figure is built from server-side aggregates, so its payload is
+    bounded whatever the row count.
+    """
     try:
         if viz_type == "histogram":
-            fig = px.histogram(df, x=settings['column'], 
-                              title=f'Distribution of {settings["column"]}',
-                              nbins=30,
-                              color_discrete_sequence=['#667eea'])
+            payload = st.session_state.agent.eda_service.get_visualization_data(settings['column'])
+            fig = histogram_figure(payload, f'Distribution of {settings["column"]}')
         elif viz_type == "scatter":
-            fig = px.scatter(df, x=settings['x'], y=settings['y'],
-                            title=f'{settings["x"]} vs {settings["y"]}',
-                            color_discrete_sequence=['#06b6d4'])
+            fig = scatter_figure(df, settings['x'], settings['y'], f'{settings["x"]} vs {settings["y"]}',
+                                 settings.get('x_range'), settings.get('y_range'))
         elif viz_type == "box":
-            fig = px.box(df, y=settings['column'],
-                        title=f'Box Plot of {settings["column"]}',
-                        color_discrete_sequence=['#764ba2'])
+            fig = box_figure(df[settings['column']], f'Box Plot of {settings["column"]}')
         elif viz_type == "correlation":
             numeric_cols = df.select_dtypes(include=['number']).columns
             corr_matrix = df[numeric_cols].corr()
+            import plotly.express as px
             fig = px.imshow(corr_matrix,
                            title='Correlation Heatmap',
                            color_continuous_scale='RdBu_r',
@@ -298,15 +390,118 @@ def process_user_message(user_input):
     
     # Get agent response
     try:
-        with st.spinner("🤔 Analyzing your data..."):
-            response = st.session_state.agent.chat(user_input)
-            st.session_state.messages.append({"role": "assistant", "content": response})
+        with st.status("🤔 Analyzing your data...", expanded=True) as status:
+            reply = st.empty()
+            partial = ""
+            response = "No response generated."
+            for event in st.session_state.agent.stream(user_input):
+                if event.kind == 'token':
+                    partial += event.content
+                    reply.markdown(partial + "▌")
+                elif event.kind == 'tool_call':
+                    # A new model step follows the tool; its text replaces the partial one
+                    status.update(label=f"🔧 Running {event.tool}...")
+                    partial = ""
+                    reply.empty()
+                elif event.kind in ('answer', 'error'):
+                    response = event.content
+            status.update(label="✅ Done", state="complete", expanded=False)
+        st.session_state.messages.append({"role": "assistant", "content": response})
     except Exception as e:
         error_msg = f"Sorry, I encountered an error: {str(e)}"
         st.session_state.messages.append({"role": "assistant", "content": error_msg})
     
     st.session_state.processing = False
 
+# Quick action -> (answer computed without the model, prompt sent when explanations are on)
+QUICK_ACTIONS = {
+    "📊 Overview": (lambda agent: agent.run_tool("get_dataset_overview"),
+                   "Give me a comprehensive dataset overview"),
+    "🔍 Quality Check": (lambda agent: agent.run_tool("get_data_quality"),
+                        "Perform a detailed data quality check"),
+    "💡 Insights": (lambda agent: agent.run_tool("get_automated_insights"),
+                   "Give me key insights and patterns in the data"),
+    "📈 Statistics": (lambda agent: ReportBuilder(agent.eda_service).add_column_analysis_section().build_markdown(),
+                     "Show me statistical summary"),
+}
+
+
+def run_quick_action(label):
+    """Answer a quick action from the EDA tools, or ask the model when explanations are on"""
+    compute, prompt = QUICK_ACTIONS[label]
+    if st.session_state.get('explain_quick_actions'):
+        process_user_message(prompt)
+        return
+    st.session_state.messages.append({"role": "user", "content": label})
+    try:
+        response = compute(st.session_state.agent)
+    except Exception as e:
+        response = f"Sorry, I encountered an error: {str(e)}"
+    st.session_state.messages.append({"role": "assistant", "content": response})
+
+# Uploads at least this large are kept as memory-mapped column stores
+STORE_MIN_BYTES = 50 * 1024 * 1024
+
+
+def upload_digest(uploaded_file):
+    """Content hash of an upload, computed once per uploaded file"""
+    file_id = getattr(uploaded_file, 'file_id', None) or (uploaded_file.name, uploaded_file.size)
+    if st.session_state.get('upload_id') != file_id:
+        st.session_state.upload_digest = hashlib.blake2b(uploaded_file.getvalue(), digest_size=16).hexdigest()
+        st.session_state.upload_id = file_id
+    return st.session_state.upload_digest
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_upload(digest, _uploaded_file, optimize):
+    """Frame and dtype optimization of an upload, shared by every rerun and session seeing the same bytes.
+
+    Large uploads also reopen their column store when the same bytes were loaded before.
+    """
+    df = None
+    store_cache = ColumnStoreCache() if _uploaded_file.size >= STORE_MIN_BYTES else None
+    if store_cache is not None:
+        store = store_cache.get(digest)
+        df = store.read() if store is not None else None
+    if df is None:
+        df = load_dataset(_uploaded_file)
+        if store_cache is not None:
+            try:
+                store_cache.put(df, digest)
+            except (OSError, ValueError):
+                pass
+    optimization = None
+    if optimize:
+        df, optimization = optimize_dtypes(df)
+    return df, optimization
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def eda_service_for(digest, optimize, _df, _optimization):
+    """EDA service of a loaded upload; its analysis caches outlive reruns"""
+    return EDAService(_df, dtype_optimization=_optimization)
+
+
+@st.cache_resource(show_spinner=False)
+def response_cache():
+    """Agent answers shared by every session; keys include the upload digest, so datasets never mix"""
+    return ResponseCache()
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def header_metrics(digest, optimize, _eda_service):
+    """Rows, columns, missing cells and memory from the service's cached metadata and quality report"""
+    metadata = _eda_service.get_metadata()
+    quality = _eda_service.get_quality_report()
+    return {
+        'rows': metadata.row_count,
+        'columns': metadata.column_count,
+        'missing': int(quality.missing_cells),
+        'memory_mb': metadata.memory_usage_mb,
+        'memory_before_mb': metadata.memory_before_optimization_mb,
+    }
+
+
 def main():
     # Sidebar
     with st.sidebar:
@@ -316,26 +511,38 @@ def main():
         # File Upload Section
         st.markdown("<div class='section-header'>📁 Data Upload</div>", unsafe_allow_html=True)
         uploaded_file = st.file_uploader(
-            "Upload CSV File",
-            type="csv",
-            help="Upload your CSV file to begin analysis",
+            "Upload Data File",
+            type=[extension.lstrip('.') for extension in FORMATS],
+            help="Upload a CSV, Parquet, Feather or Arrow file to begin analysis",
             label_visibility="collapsed"
         )
         
+        optimize = st.checkbox("Optimize memory on load", value=False,
+                               help="Narrow numeric dtypes and store low-cardinality text as categories; "
+                                    "analysis results are unchanged")
+        
         if uploaded_file:
-            if st.session_state.df is None or uploaded_file.name != getattr(st.session_state.last_file, 'name', None):
-                try:
-                    with st.spinner("Loading dataset..."):
-                        st.session_state.df = pd.read_csv(uploaded_file)
-                        st.session_state.agent = EDAAgent(st.session_state.df)
-                        st.session_state.last_file = uploaded_file
-                        st.session_state.messages = []
-                        st.session_state.visualizations = []
+            try:
+                digest = upload_digest(uploaded_file)
+                with st.spinner("Loading dataset..."):
+                    df, optimization = load_upload(digest, uploaded_file, optimize)
+                    eda_service = eda_service_for(digest, optimize, df, optimization)
+                if st.session_state.get('dataset_key') != (digest, optimize):
+                    # New content: the agent (and its chat memory) belongs to this session only
+                    st.session_state.df = df
+                    st.session_state.agent = EDAAgent(df, eda_service=eda_service,
+                                                      response_cache=response_cache(),
+                                                      dataset_fingerprint=f"{digest}:{optimize}")
+                    st.session_state.dataset_key = (digest, optimize)
+                    st.session_state.last_file = uploaded_file
+                    st.session_state.messages = []
+                    st.session_state.visualizations = []
                     st.success(f"✅ Loaded {uploaded_file.name}")
-                except Exception as e:
-                    st.error(f"Error loading file: {str(e)}")
-                    st.session_state.df = None
-                    return
+            except Exception as e:
+                st.error(f"Error loading file: {str(e)}")
+                st.session_state.df = None
+                st.session_state.dataset_key = None
+                return
                 
         if st.session_state.df is not None:
             st.markdown("---")
@@ -343,24 +550,14 @@ def main():
             # Quick Actions
             st.markdown("<div class='section-header'>⚡ Quick Actions</div>", unsafe_allow_html=True)
             
+            st.toggle("🧠 Explain with AI", key="explain_quick_actions",
+                      help="Off: results are computed instantly from the data. On: the AI model interprets them.")
             col1, col2 = st.columns(2)
-            with col1:
-                if st.button("📊 Overview"):
-                    process_user_message("Give me a comprehensive dataset overview")
-                    st.rerun()
-                
-                if st.button("🔍 Quality Check"):
-                    process_user_message("Perform a detailed data quality check")
-                    st.rerun()
-            
-            with col2:
-                if st.button("💡 Insights"):
-                    process_user_message("Give me key insights and patterns in the data")
-                    st.rerun()
-                
-                if st.button("📈 Statistics"):
-                    process_user_message("Show me statistical summary")
-                    st.rerun()
+            for i, label in enumerate(QUICK_ACTIONS):
+                with (col1 if i % 2 == 0 else col2):
+                    if st.button(label):
+                        run_quick_action(label)
+                        st.rerun()
             
             st.markdown("---")
             
@@ -380,11 +577,23 @@ def main():
                         st.session_state.visualizations.append(fig)
                         st.rerun()
             
+            elif viz_type == "scatter" and not numeric_columns():
+                st.info("Scatter plots need at least one numeric column")
+            
             elif viz_type == "scatter":
-                col1 = st.selectbox("X-axis", st.session_state.df.columns, key="x_axis")
-                col2 = st.selectbox("Y-axis", st.session_state.df.columns, key="y_axis")
+                col1 = st.selectbox("X-axis", numeric_columns(), key="x_axis")
+                col2 = st.selectbox("Y-axis", numeric_columns(), key="y_axis")
+                settings = {"x": col1, "y": col2}
+                with st.expander("🔍 Zoom"):
+                    st.caption(f"Windows with at most {MAX_SCATTER_POINTS:,} rows are drawn as points")
+                    for axis, column in (("x", col1), ("y", col2)):
+                        bounds = column_bounds(column)
+                        if bounds is not None:
+                            chosen = st.slider(f"{column} range", bounds[0], bounds[1], bounds, key=f"zoom_{axis}")
+                            if chosen != bounds:
+                                settings[f"{axis}_range"] = chosen
                 if st.button("🎨 Generate", key="gen_viz_2"):
-                    fig = create_visualization(st.session_state.df, viz_type, {"x": col1, "y": col2})
+                    fig = create_visualization(st.session_state.df, viz_type, settings)
                     if fig:
                         st.session_state.visualizations.append(fig)
                         st.rerun()
@@ -438,7 +647,7 @@ def main():
                         border: 1px solid #374151;'>
                 <h3 style='color: #f3f4f6; text-align: center;'>🚀 Get Started</h3>
                 <ul style='color: #d1d5db; line-height: 2; font-size: 1.05rem;'>
-                    <li>📁 Upload your CSV file using the sidebar</li>
+                    <li>📁 Upload your CSV, Parquet or Feather file using the sidebar</li>
                     <li>⚡ Use quick actions for instant insights</li>
                     <li>💬 Ask questions in natural language</li>
                     <li>📊 Generate interactive visualizations</li>
@@ -450,16 +659,17 @@ def main():
         # Dataset metrics at the top
         st.markdown("<div style='margin-bottom: 1rem;'>", unsafe_allow_html=True)
         col1, col2, col3, col4 = st.columns(4)
+        metrics = header_metrics(*st.session_state.dataset_key, st.session_state.agent.eda_service)
         with col1:
-            st.metric("📊 Rows", f"{st.session_state.df.shape[0]:,}")
+            st.metric("📊 Rows", f"{metrics['rows']:,}")
         with col2:
-            st.metric("📋 Columns", st.session_state.df.shape[1])
+            st.metric("📋 Columns", metrics['columns'])
         with col3:
-            missing = st.session_state.df.isna().sum().sum()
-            st.metric("⚠️ Missing Values", f"{missing:,}")
+            st.metric("⚠️ Missing Values", f"{metrics['missing']:,}")
         with col4:
-            memory = st.session_state.df.memory_usage(deep=True).sum() / 1024 / 1024
-            st.metric("💾 Memory", f"{memory:.1f} MB")
+            before = metrics['memory_before_mb']
+            saved = None if before is None else f"-{before - metrics['memory_mb']:.1f} MB"
+            st.metric("💾 Memory", f"{metrics['memory_mb']:.1f} MB", delta=saved, delta_color="inverse")
         st.markdown("</div>", unsafe_allow_html=True)
         
         st.markdown("---")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the application packages the way main.py does, from src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from core.Analyzers.cardinality import DistinctCounter
+from core.Analyzers.categorical_analyzer import CategoricalAnalyzer
+
+
+def zipf_column(rows=20_000, cardinality=5_000):
+    rng = np.random.default_rng(7)
+    return pd.Series(np.array([f"v{i}" for i in rng.zipf(1.3, size=rows) % cardinality], dtype=object),
+                     name='code')
+
+
+def test_approximate_mode_takes_mode_and_top_values_from_the_summary(monkeypatch):
+    series = zipf_column()
+    analyzer = CategoricalAnalyzer(DistinctCounter(approximate=True, exact_limit=100))
+
+    def no_full_tables(*args, **kwargs):
+        raise AssertionError("full value counts built in approximate mode")
+
+    monkeypatch.setattr(pd.Series, 'mode', no_full_tables)
+    analysis = analyzer.analyze(series)
+    exact = series.value_counts()
+    assert analysis.statistics['mode'] == exact.index[0]
+    assert list(analysis.statistics['top_values'])[:3] == list(exact.index[:3])
+    assert 'top_values' in analysis.approximate_statistics
+
+
+def test_exact_mode_is_unchanged():
+    series = pd.Series(['b', 'a', 'a', 'c', None], name='letter')
+    analysis = CategoricalAnalyzer().analyze(series)
+    assert analysis.statistics['mode'] == 'a'
+    assert analysis.statistics['top_values'] == {'a': 2, 'b': 1, 'c': 1}
+    assert analysis.approximate_statistics == []
+
+
+def test_top_k_mode_never_counts_distinct_values_exactly(monkeypatch):
+    series = zipf_column()
+    expected = series.nunique()
+
+    def unbounded(*args, **kwargs):
+        raise AssertionError("nunique builds a hash table of every value")
+
+    monkeypatch.setattr(pd.Series, 'nunique', unbounded)
+    analyzer = CategoricalAnalyzer(DistinctCounter(exact_limit=100), top_k_capacity=50)
+    analysis = analyzer.analyze(series)
+    assert 'unique_count' in analysis.approximate_statistics
+    assert abs(analysis.unique_count - expected) / expected < 0.05
+
+    small = pd.Series(['x', 'y', 'x', None], name='small')
+    analysis = CategoricalAnalyzer(top_k_capacity=50).analyze(small)
+    assert analysis.unique_count == 2
+    assert analysis.approximate_statistics == []
@@ -0,0 +1,73 @@
+import pandas as pd
+
+from classes.data_classes import ColumnType
+from core.EDA.chunked_service import ChunkedEDAService
+from core.EDA.dataset_profile import DatasetProfile
+from core.EDA.eda_service import EDAService
+
+
+def write_csv(tmp_path, text):
+    path = tmp_path / 'data.csv'
+    path.write_text(text)
+    return str(path)
+
+
+def test_column_empty_in_first_chunk_is_typed_by_later_values(tmp_path):
+    rows = ['id,city,score'] + [f'{i},,' for i in range(4)] + [f'{i},Oslo,{i}.5' for i in range(4, 8)]
+    service = ChunkedEDAService(write_csv(tmp_path, '\n'.join(rows) + '\n'), chunksize=4)
+
+    by_name = {analysis.name: analysis for analysis in service.analyze_columns()}
+    assert by_name['city'].column_type == ColumnType.CATEGORICAL
+    assert by_name['city'].missing_count == 4
+    assert by_name['city'].unique_count == 1
+    assert by_name['score'].column_type == ColumnType.NUMERIC
+    assert by_name['score'].statistics['min'] == 4.5
+    assert list(service.get_correlation_matrix().columns) == ['id', 'score']
+
+
+def test_column_that_stays_empty_reads_as_numeric(tmp_path):
+    service = ChunkedEDAService(write_csv(tmp_path, 'a,b\n1,\n2,\n3,\n'), chunksize=2)
+    analysis = service.analyze_column('b')
+    assert analysis.column_type == ColumnType.NUMERIC
+    assert analysis.missing_count == 3
+
+
+def test_merge_types_an_empty_partition_from_the_other():
+    empty = DatasetProfile.from_frame(pd.DataFrame({'x': [1, 2], 'tag': [None, None]}))
+    typed = DatasetProfile.from_frame(pd.DataFrame({'x': [3, 4], 'tag': ['a', 'b']}))
+
+    merged = DatasetProfile.from_json(empty.to_json()).merge(typed)
+    tag = merged.column_profiles['tag'].to_analysis()
+    assert tag.column_type == ColumnType.CATEGORICAL
+    assert (tag.missing_count, tag.unique_count) == (2, 2)
+    assert DatasetProfile.from_json(typed.to_json()).merge(empty).column_profiles['tag'].row_count == 4
+
+
+def test_mixed_type_column_matches_a_full_load(tmp_path):
+    values = [1, 2, 3, 'x', 'y', 'z', 4, 'w']
+    path = write_csv(tmp_path, 'a,b\n' + '\n'.join(f'{v},{i}' for i, v in enumerate(values)) + '\n')
+    chunked = ChunkedEDAService(path, chunksize=3)
+    full = EDAService(pd.read_csv(path))
+
+    for service in (chunked, full):
+        analysis = service.analyze_column('a')
+        assert analysis.column_type == ColumnType.CATEGORICAL
+        assert (analysis.missing_count, analysis.unique_count) == (0, 8)
+        assert service.get_quality_report().missing_values == {}
+    assert chunked.get_correlation_matrix() is None
+    assert chunked.get_metadata().dtypes == full.get_metadata().dtypes
+
+
+def test_numeric_profile_keeps_strings_out_of_missing_values():
+    profile = DatasetProfile.from_frame(pd.DataFrame({'a': [1.0, None, 3.0]}))
+    profile.update(pd.DataFrame({'a': ['x', '4', None]}))
+
+    assert profile.mixed_columns() == ['a']
+    assert profile.quality_report().missing_values == {'a': 2}
+
+
+def test_exact_analysis_is_served_from_the_profile(tmp_path):
+    service = ChunkedEDAService(write_csv(tmp_path, 'a,b\n1,x\n2,y\n3,x\n'), chunksize=2)
+
+    assert service.analyze_column_exact('a') == service.analyze_column('a')
+    assert [analysis.name for analysis in service.analyze_columns(exact=True)] == ['a', 'b']
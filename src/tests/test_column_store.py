@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from core.EDA.column_store import ColumnStore
+from core.EDA.eda_service import EDAService
+
+
+def mixed_frame(rows=2_000):
+    rng = np.random.default_rng(7)
+    words = np.array([f"{'lorem ipsum dolor sit amet ' * 2}{i}" for i in range(rows)], dtype=object)
+    return pd.DataFrame({'x': rng.normal(size=rows),
+                         'city': rng.choice(['Oslo', 'Rome', None], size=rows),
+                         'note': words[rng.permutation(rows)]})
+
+
+def test_category_routed_columns_stay_encoded(tmp_path):
+    df = mixed_frame()
+    read = ColumnStore.write(df, str(tmp_path / 'store')).read()
+    assert isinstance(read['city'].dtype, pd.CategoricalDtype)
+    assert read['note'].dtype == object
+    for expected, actual in zip(EDAService(df).analyze_columns(), EDAService(read).analyze_columns()):
+        assert repr(expected) == repr(actual)
+
+
+def test_edits_do_not_reach_the_files(tmp_path):
+    store = ColumnStore.write(mixed_frame(), str(tmp_path / 'store'))
+    read = store.read()
+    original = read.loc[0, 'x']
+    read.loc[0, 'x'] = 5.0
+    assert read.loc[0, 'x'] == 5.0
+    assert ColumnStore.open(store.directory).read().loc[0, 'x'] == original
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.Analyzers.correlation_engine import CorrelationEngine
+
+
+def frame(missing):
+    rng = np.random.default_rng(11)
+    base = rng.normal(size=(400, 1))
+    values = base + rng.normal(scale=[0.1, 0.5, 1, 2, 4, 8, 0.2], size=(400, 7))
+    df = pd.DataFrame(values, columns=list('abcdefg'))
+    df['constant'] = 1.0
+    if missing:
+        df.loc[rng.random(400) < 0.2, 'b'] = np.nan
+        df.loc[rng.random(400) < 0.1, 'e'] = np.inf
+    return df
+
+
+@pytest.mark.parametrize('missing', [False, True])
+@pytest.mark.parametrize('block_columns', [1, 3, 512])
+def test_pearson_matches_pandas(missing, block_columns):
+    df = frame(missing)
+    expected = df.replace([np.inf, -np.inf], np.nan).corr()
+    result = CorrelationEngine(block_columns=block_columns).matrix(df)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), atol=1e-12)
+
+
+@pytest.mark.parametrize('block_columns', [2, 512])
+def test_high_pairs_match_the_matrix(block_columns):
+    df = frame(True)
+    engine = CorrelationEngine(block_columns=block_columns)
+    pairs = engine.high_pairs(df, threshold=0.5)
+    matrix = engine.matrix(df)
+    assert pairs
+    for left, right, value in pairs:
+        assert value == round(float(matrix.loc[left, right]), 3)
+    assert {(a, b) for a, b, _ in pairs} == {(a, b) for i, a in enumerate(df.columns) for b in df.columns[i + 1:]
+                                             if abs(matrix.loc[a, b]) > 0.5}
+
+
+def test_spearman_without_missing_matches_pandas():
+    df = frame(False)
+    result = CorrelationEngine('spearman', block_columns=3).matrix(df)
+    np.testing.assert_allclose(result.to_numpy(), df.corr('spearman').to_numpy(), atol=1e-12)
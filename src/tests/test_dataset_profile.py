@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from classes.data_classes import ColumnAnalysis, ColumnType
+from core.Analyzers.accumulators import CategoricalAccumulator
+from core.EDA.dataset_profile import DatasetProfile
+from interface.Analyzer_interface import IColumnAnalyzer
+
+
+def test_duplicates_across_shards_are_exact():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({'a': rng.integers(0, 50, size=2000), 'b': rng.choice(['x', 'y'], size=2000)})
+    shards = [df.iloc[i:i + 500] for i in range(0, len(df), 500)]
+
+    reducer = DatasetProfile()
+    for shard in shards:
+        reducer.merge(DatasetProfile.from_json(DatasetProfile.from_frame(shard).to_json()))
+
+    report = reducer.quality_report()
+    assert report.duplicate_rows == int(df.duplicated().sum())
+    assert report.approximate_fields == []
+
+
+def test_profiles_without_fingerprints_estimate_duplicates():
+    df = pd.DataFrame({'a': [1, 1, 2, 3]})
+    profile = DatasetProfile.from_json(DatasetProfile.from_frame(df, keep_row_hashes=False).to_json())
+    assert 'duplicate_rows' in profile.quality_report().approximate_fields
+
+
+class LegacyAnalyzer(IColumnAnalyzer):
+    """Third-party analyzer written before ``profile`` existed"""
+
+    def can_analyze(self, series):
+        return True
+
+    def analyze(self, series):
+        return ColumnAnalysis(name=series.name, column_type=ColumnType.TEXT, unique_count=series.nunique(),
+                              missing_count=int(series.isna().sum()), missing_percentage=0.0,
+                              statistics={}, insights=[])
+
+    def get_visualization_data(self, series):
+        return {}
+
+
+def test_analyzers_without_profile_get_a_default():
+    profile = LegacyAnalyzer().profile(pd.Series(['a', 'b', 'b'], name='note'))
+    assert isinstance(profile, CategoricalAccumulator)
+    assert profile.column_type == ColumnType.TEXT
+    assert profile.row_count == 3
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from core.EDA.duplicates import DuplicateDetector
+from core.EDA.eda_service import EDAService
+
+
+def duplicate_rows(df):
+    return DuplicateDetector().update(df).report(top_n=0).duplicate_rows
+
+
+def test_matches_duplicated_on_typed_columns():
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({'a': rng.integers(0, 5, size=500), 'b': rng.choice(['x', 'y', None], size=500),
+                       'c': rng.choice([0.5, np.nan, 0.0, -0.0], size=500), 'd': rng.random(500) < 0.5})
+    assert duplicate_rows(df) == int(df.duplicated().sum())
+
+
+def test_signed_zeros_are_equal():
+    assert duplicate_rows(pd.DataFrame({'a': [0.0, -0.0]})) == 1
+
+
+def test_object_columns_hash_by_type_and_value():
+    frames = [
+        pd.DataFrame({'a': pd.Series([1, '1'], dtype=object)}),
+        pd.DataFrame({'a': pd.Series([None, np.nan], dtype=object)}),
+        pd.DataFrame({'a': pd.Series([1, 1.0, True, 'x', 'x', np.nan, np.nan], dtype=object)}),
+        pd.DataFrame({'a': pd.Series(['1', 2.5, None], dtype=object), 'b': ['k', 'k', 'k']}),
+    ]
+    for frame in frames:
+        assert duplicate_rows(frame) == int(frame.duplicated().sum())
+
+    # A string column hashes the same whether or not its chunk also holds nulls
+    detector = DuplicateDetector().update(pd.DataFrame({'a': ['x', 'y']}))
+    detector.update(pd.DataFrame({'a': pd.Series(['x', None], dtype=object)}))
+    assert detector.report(top_n=0).duplicate_rows == 1
+
+
+def test_quality_report_of_an_empty_frame():
+    quality = EDAService(pd.DataFrame({'a': pd.Series([], dtype=float)})).get_quality_report()
+    assert quality.duplicate_rows == 0
+    assert quality.duplicate_percentage == 0.0
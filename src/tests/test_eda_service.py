@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.EDA.eda_service import EDAService
+
+
+def numeric_frame(rows, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'small': rng.integers(0, 10, size=rows), 'wide': rng.normal(size=rows),
+                         'label': rng.choice(['a', 'b', 'c'], size=rows)})
+
+
+def test_append_serves_numeric_columns_from_running_state(monkeypatch):
+    first, second = numeric_frame(3000, 0), numeric_frame(3000, 1)
+    service = EDAService(first)
+    service.analyze_columns()
+
+    concat = pd.concat
+    copied_rows = []
+
+    def counting_concat(frames, *args, **kwargs):
+        frames = list(frames)
+        copied_rows.append(sum(len(frame) for frame in frames))
+        return concat(frames, *args, **kwargs)
+
+    monkeypatch.setattr(pd, 'concat', counting_concat)
+    service.append(second)
+    # Only single-row heads are concatenated, to check the resulting dtypes
+    assert max(copied_rows, default=0) <= 2
+
+    def recompute(columns):
+        raise AssertionError(f"recomputed {columns}")
+
+    monkeypatch.setattr(service, '_compute_columns', recompute)
+    analyses = {analysis.name: analysis for analysis in service.analyze_columns()}
+    full = EDAService(pd.concat([first, second], ignore_index=True))
+
+    small = analyses['small']
+    assert small.unique_count == 10
+    assert small.statistics['mean'] == pytest.approx(full.analyze_column('small').statistics['mean'])
+    # Past the sketch size the quantiles are estimates; the distinct count is still exact
+    assert 'median' in small.approximate_statistics
+    assert 'unique_count' not in small.approximate_statistics
+    assert 'unique_count' in analyses['wide'].approximate_statistics
+    assert analyses['label'].approximate_statistics == []
+    assert service.get_metadata().row_count == 6000
+
+
+def test_exact_request_recomputes_only_estimated_columns():
+    first, second = numeric_frame(3000, 0), numeric_frame(3000, 1)
+    service = EDAService(first)
+    service.analyze_columns()
+    service.append(second)
+
+    exact = service.analyze_column('wide', exact=True)
+    full = EDAService(pd.concat([first, second], ignore_index=True)).analyze_column('wide')
+    assert exact.approximate_statistics == []
+    assert exact.unique_count == full.unique_count
+    assert exact.statistics['median'] == full.statistics['median']
+    assert len(service.df) == 6000
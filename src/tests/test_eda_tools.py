@@ -0,0 +1,54 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from core.EDA.eda_service import EDAService
+from core.EDA.eda_tools import EDATools
+from core.EDA.token_budget import estimate_tokens
+
+BUDGET = 800
+
+
+def wide_tools():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f"c{i}": rng.normal(size=200) for i in range(80)})
+    df['note'] = [('lorem ipsum ' * 40) + str(i) for i in range(200)]
+    tools = EDATools.create_tools(EDAService(df), max_tokens=BUDGET)
+    return df, {tool.name: tool for tool in tools}
+
+
+def test_every_tool_result_fits_the_budget():
+    df, tools = wide_tools()
+    calls = [('get_dataset_overview', {}), ('get_data_quality', {}), ('get_automated_insights', {}),
+             ('get_correlations', {'threshold': '0.0'}), ('analyze_column', {'column_name': 'note'}),
+             ('analyze_column_exact', {'column_name': 'note'}), ('generate_full_report', {}),
+             ('generate_full_report', {'format_type': 'json'}),
+             ('compare_columns', {'columns': ','.join(df.columns)})]
+    for name, args in calls:
+        result = tools[name].invoke(args)
+        assert estimate_tokens(result) <= BUDGET, name
+        assert result.rstrip().endswith('tokens]'), name
+
+
+def test_full_report_pages_through_every_column():
+    df, tools = wide_tools()
+    offset, seen = 0, []
+    while True:
+        page = tools['generate_full_report'].invoke({'offset': offset})
+        seen += [line[4:].split(' ')[0] for line in page.splitlines() if line.startswith('### ')]
+        if 'call again with offset=' not in page:
+            break
+        offset = int(page.split('call again with offset=')[1].split(' ')[0])
+    assert seen == [str(col) for col in df.columns]
+
+
+def test_quick_commands_run_without_langchain(monkeypatch):
+    from core.EDA.eda_agent import EDAAgent
+
+    df, _ = wide_tools()
+    # A None entry makes any import of the module fail
+    monkeypatch.setitem(sys.modules, 'langchain_core.tools', None)
+    agent = EDAAgent(df, cache_responses=False, tool_token_budget=BUDGET)
+    assert agent.run_tool('get_dataset_overview').startswith('Dataset Overview:')
+    assert agent.run_tool('get_correlations', threshold='0.0', offset=5).rstrip().endswith('tokens]')
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from core.Analyzers.factory_analyzer import AnalyzerFactory
+from core.EDA.parallel_analysis import ParallelColumnAnalyzer, analyze_frame
+
+
+def sample_frame():
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        'amount': rng.normal(size=300),
+        'city': rng.choice(['Oslo', 'Rome', None], size=300),
+        'flag': rng.random(300) < 0.5,
+        'level': pd.Categorical(rng.choice(['low', 'high'], size=300)),
+        'count': pd.array(rng.integers(0, 9, size=300), dtype='Int64'),
+    })
+
+
+def test_process_backend_matches_sequential():
+    df = sample_frame()
+    expected = analyze_frame(df, df.columns, AnalyzerFactory())
+    results = ParallelColumnAnalyzer(n_workers=2, backend='process', vectorized=False).analyze(df)
+    assert [a.name for a in results] == list(df.columns)
+    for analysis, reference in zip(results, expected):
+        assert analysis.unique_count == reference.unique_count
+        assert analysis.missing_count == reference.missing_count
+        assert analysis.statistics == reference.statistics
+
+
+def test_object_columns_are_not_exported():
+    df = sample_frame()
+    exported = []
+    analyzer = ParallelColumnAnalyzer(n_workers=2, backend='process')
+    run_processes = analyzer._run_processes
+
+    def record(frame, batches, plan=None, workers=None):
+        exported.extend(col for batch in batches for col in batch)
+        return run_processes(frame, batches, plan, workers)
+
+    analyzer._run_processes = record
+    results = analyzer.analyze(df)
+    assert 'city' not in exported
+    assert [a.name for a in results] == list(df.columns)
+
+
+def test_thread_and_process_pools_share_the_worker_budget():
+    df = sample_frame()
+    local, shared = ['city'], [col for col in df.columns if col != 'city']
+    for n_workers in (2, 3, 8):
+        threads, processes = ParallelColumnAnalyzer(n_workers=n_workers, backend='process')._split_workers(
+            df, local, shared)
+        assert threads >= 1 and processes >= 1
+        assert threads + processes == n_workers
+    analyzer = ParallelColumnAnalyzer(n_workers=1, backend='process', vectorized=False)
+    assert [a.name for a in analyzer.analyze(df)] == list(df.columns)
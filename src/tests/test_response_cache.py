@@ -0,0 +1,31 @@
+import threading
+
+from core.EDA.response_cache import ResponseCache
+
+
+def test_concurrent_use_keeps_the_lru_bounded():
+    cache = ResponseCache(max_entries=50)
+
+    def work(worker):
+        for i in range(2_000):
+            key = f"{worker}-{i % 80}"
+            if cache.get(key) is None:
+                cache.put(key, 'answer')
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache._memory) == 50
+    assert cache.stats['hits'] + cache.stats['misses'] == 8 * 2_000
+
+
+def test_expired_files_are_swept_at_most_once_per_interval(tmp_path, monkeypatch):
+    cache = ResponseCache(directory=str(tmp_path), ttl_seconds=0, expire_interval=3600)
+    scans = []
+    original = cache._files
+    monkeypatch.setattr(cache, '_files', lambda: scans.append(1) or original())
+    for i in range(10):
+        cache.put(f"key-{i}", 'answer')
+    assert len(scans) == 1
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from classes.data_classes import SamplingConfig
+from core.EDA.sampled_service import SampledEDAService
+from core.EDA.sampling import WeightedSampleEstimator
+
+
+def skewed_head_frame(rows=20_000, head=2_000):
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({'x': np.r_[np.full(head, 100.0), rng.normal(0, 1, rows - head)],
+                         'c': np.r_[np.full(head, 'head', dtype=object), rng.choice(['a', 'b'], rows - head)]})
+
+
+def test_head_tail_weights_each_stratum():
+    df = skewed_head_frame()
+    service = SampledEDAService(df, SamplingConfig(method='head_tail', size=3_000, head_rows=2_000))
+    assert isinstance(service.estimator, WeightedSampleEstimator)
+    analysis = service.analyze_column('x')
+    low, high = analysis.confidence_intervals['mean']
+    assert low <= df['x'].mean() <= high
+    # An unweighted estimate would put the head at two thirds of the rows
+    assert service.analyze_column('c').statistics['top_values']['head'] == 2_000
+
+
+def test_duplicates_are_counted_over_the_population():
+    df = skewed_head_frame()
+    df = pd.concat([df, df.iloc[2_000:2_500]], ignore_index=True)
+    service = SampledEDAService(df, SamplingConfig(size=1_000))
+    quality = service.get_quality_report()
+    assert quality.duplicate_rows == int(df.duplicated().sum())
+    assert 'duplicate_rows' not in quality.approximate_fields
+
+
+def test_append_grows_the_population_and_redraws():
+    df = skewed_head_frame()
+    service = SampledEDAService(df, SamplingConfig(size=1_000))
+    service.analyze_column('x')
+    service.append(df.iloc[:500])
+    assert service.get_metadata().row_count == len(df) + 500
+    assert len(service.df) == 1_000
+    assert service.get_quality_report().duplicate_rows >= 500
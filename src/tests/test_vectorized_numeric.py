@@ -0,0 +1,65 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.Analyzers.numerical_analyzer import NumericAnalyzer
+from core.Analyzers.vectorized_numeric import VectorizedNumericEngine
+
+
+def assert_same_analysis(batched, reference):
+    assert batched.name == reference.name
+    assert batched.column_type == reference.column_type
+    assert batched.unique_count == reference.unique_count
+    assert batched.missing_count == reference.missing_count
+    assert batched.insights == reference.insights
+    assert batched.statistics.keys() == reference.statistics.keys()
+    for key, expected in reference.statistics.items():
+        actual = batched.statistics[key]
+        if isinstance(expected, float) and math.isnan(expected):
+            assert math.isnan(actual), key
+        else:
+            assert actual == pytest.approx(expected, rel=1e-9, abs=1e-12), key
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(size=500)
+    values[::7] = np.nan
+    return pd.DataFrame({
+        'float': values,
+        'int': rng.integers(-50, 50, size=500),
+        'nullable': pd.array(rng.integers(0, 5, size=500), dtype='Int64'),
+        'float32': rng.normal(size=500).astype(np.float32),
+        'constant': np.full(500, 3.0),
+        'all_missing': np.full(500, np.nan),
+        'with_inf': np.where(np.arange(500) % 50 == 0, np.inf, rng.normal(size=500)),
+    })
+
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')
+def test_matches_numeric_analyzer(frame):
+    batched = VectorizedNumericEngine().analyze(frame)
+    for analysis, col in zip(batched, frame.columns):
+        assert_same_analysis(analysis, NumericAnalyzer().analyze(frame[col]))
+
+
+def test_small_blocks_match_one_block(frame):
+    one_block = VectorizedNumericEngine().analyze(frame)
+    many_blocks = VectorizedNumericEngine(max_block_mb=0.01).analyze(frame)
+    for analysis, reference in zip(many_blocks, one_block):
+        assert_same_analysis(analysis, reference)
+
+
+def test_integers_beyond_float64_precision_stay_distinct():
+    df = pd.DataFrame({'small': [1, 2, 3, 4],
+                       'wide': [2 ** 53, 2 ** 53 + 1, 2 ** 53 + 2, 5],
+                       'unsigned': np.array([2 ** 63, 2 ** 63 + 1, 1, 1], dtype=np.uint64)})
+    batched = VectorizedNumericEngine().analyze(df)
+    assert [a.name for a in batched] == ['small', 'wide', 'unsigned']
+    assert batched[1].unique_count == 4
+    assert batched[2].unique_count == 3
+    for analysis, col in zip(batched, df.columns):
+        assert_same_analysis(analysis, NumericAnalyzer().analyze(df[col]))